@@ -0,0 +1,112 @@
+from django.db import connections, router, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import IntegerField
+
+from .cache import invalidate_notes_on_commit
+from .models import Note
+from .serializers import NoteSerializer, NoteUpdateSerializer
+
+# Bounds the work of one request; lookups and writes are batched by the
+# backend's bulk_batch_size(), so no statement outgrows SQLite's 999 parameters
+MAX_ITEMS = 10000
+
+
+def check_items(items):
+    """items if it is a list of at most MAX_ITEMS, else ValidationError."""
+    if not isinstance(items, list):
+        raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+    if len(items) > MAX_ITEMS:
+        raise ValidationError({'non_field_errors': [f'At most {MAX_ITEMS} items are allowed.']})
+    return items
+
+
+def bulk_create_notes(items):
+    """
+    Create a note per item with one INSERT per batch.
+
+    Nothing is written unless every item is valid; otherwise ValidationError
+    carries a list with the errors of each item, in request order.
+    """
+    serializer = NoteSerializer(data=check_items(items), many=True)
+    serializer.is_valid(raise_exception=True)
+    with transaction.atomic():
+        notes = Note.objects.bulk_create(Note(**data) for data in serializer.validated_data)
+        # bulk_create() sends no post_save
+        invalidate_notes_on_commit()
+    return notes
+
+
+def bulk_update_notes(items):
+    """
+    Apply each {'id': ..., 'body': ...} item to its note, in request order.
+
+    The notes are loaded with one query and written with bulk_update(); as with
+    bulk_create_notes(), any invalid item, unknown or repeated id leaves every
+    note unchanged and raises ValidationError with per-item errors.
+    """
+    serializer = NoteUpdateSerializer(data=check_items(items), many=True)
+    serializer.is_valid(raise_exception=True)
+    items = serializer.validated_data
+    with transaction.atomic():
+        notes = Note.objects.in_bulk([item['id'] for item in items])
+        errors, seen = [], set()
+        for item in items:
+            if item['id'] not in notes:
+                errors.append({'id': ['Note not found.']})
+            elif item['id'] in seen:
+                errors.append({'id': ['Note is updated more than once.']})
+            else:
+                errors.append({})
+            seen.add(item['id'])
+        if any(errors):
+            raise ValidationError(errors)
+
+        # bulk_update() leaves auto_now fields alone, so updated is set here
+        updated = timezone.now()
+        for item in items:
+            note = notes[item['id']]
+            for field, value in item.items():
+                setattr(note, field, value)
+            note.updated = updated
+        fields = {field for item in items for field in item if field != 'id'}
+        Note.objects.bulk_update(notes.values(), [*sorted(fields), 'updated'])
+        invalidate_notes_on_commit()
+    return [notes[item['id']] for item in items]
+
+
+def bulk_delete_notes(ids):
+    """
+    Delete the notes with the given ids with one DELETE statement per batch.
+
+    Ids of notes that do not exist are ignored, so a repeated sync deletes
+    nothing new. Returns how many notes were deleted.
+    """
+    field = IntegerField()
+    pks, errors = [], []
+    for pk in check_items(ids):
+        try:
+            pks.append(field.run_validation(pk))
+            errors.append([])
+        except ValidationError as exc:
+            errors.append(exc.detail)
+    if any(errors):
+        raise ValidationError(errors)
+    if not pks:
+        return 0
+    # QuerySet.delete() would SELECT every note first to send post_delete for
+    # each one, invalidating the cache once per note; nothing references notes,
+    # so no cascade is skipped by deleting them directly
+    connection = connections[router.db_for_write(Note)]
+    table = connection.ops.quote_name(Note._meta.db_table)
+    column = connection.ops.quote_name(Note._meta.pk.column)
+    batch_size = connection.ops.bulk_batch_size([Note._meta.pk.name], pks)
+    deleted = 0
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            for start in range(0, len(pks), batch_size):
+                batch = pks[start:start + batch_size]
+                cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({", ".join(["%s"] * len(batch))})', batch)
+                deleted += cursor.rowcount
+        invalidate_notes_on_commit()
+    return deleted
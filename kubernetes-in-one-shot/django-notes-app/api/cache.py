@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Every cached response is keyed under the current notes version. Bumping the
+# version on any write orphans all earlier entries at once, the list pages
+# included, and the backend's own expiry or eviction reclaims them.
+VERSION_KEY = 'notes:version'
+
+
+def notes_version():
+    """Current notes version, starting one if the backend has none."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so a version lost to eviction or a restart
+        # never comes back as a number that still has entries stored under it
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_notes():
+    """Make every cached notes response stale."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_notes_on_commit():
+    """Invalidate now, and again when the current transaction commits."""
+    # Until a transaction commits, a reader can still cache the old rows under
+    # the version this bumps; the second bump retires whatever it stored
+    invalidate_notes()
+    transaction.on_commit(invalidate_notes)
+
+
+def cached_response_data(name, build):
+    """
+    Data for the response called name, from the cache or from build().
+
+    The version is read before build() queries the database, so data built
+    while a write is in flight is stored under the version that write retires.
+    """
+    key = f'notes:{notes_version()}:{name}'
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.NOTES_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,68 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import cached_response_data, invalidate_notes
+from .models import Note
+
+
+def make_etag(*parts):
+    """Strong ETag from the values that identify one representation."""
+    return quote_etag(hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest())
+
+
+def list_etag(page_key):
+    """
+    ETag of a list response from the count and latest update of all notes.
+
+    Any create, update or delete changes one of the two, and both come from one
+    aggregate over the table (cached with the responses), so a poll that
+    matches never loads or serializes a note.
+    """
+    state = cached_response_data('list:state', lambda: Note.objects.aggregate(count=Count('id'), updated=Max('updated')))
+    return make_etag('notes', page_key, state['count'], state['updated'] and state['updated'].isoformat())
+
+
+def note_etag(pk, updated):
+    return make_etag('note', pk, updated.isoformat())
+
+
+def etag_matches(header, etag, weak=False):
+    """Whether an If-Match (strong) or If-None-Match (weak=True) header lists etag."""
+    tags = parse_etags(header)
+    if tags == ['*']:
+        return True
+    if weak:
+        tags = [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+    return etag in tags
+
+
+def not_modified(request, etag):
+    """A 304 response if the request's If-None-Match already names etag, else None."""
+    header = request.headers.get('If-None-Match')
+    if header is not None and etag_matches(header, etag, weak=True):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+def update_if_unchanged(note, validated_data):
+    """
+    Write validated_data to note only if its row is still at note.updated.
+
+    The check and the write are one UPDATE, so a concurrent update between
+    reading the note and writing it makes this return False instead of being
+    overwritten.
+    """
+    updated = timezone.now()
+    if not Note.objects.filter(pk=note.pk, updated=note.updated).update(updated=updated, **validated_data):
+        return False
+    for field, value in validated_data.items():
+        setattr(note, field, value)
+    note.updated = updated
+    # QuerySet.update() sends no post_save
+    invalidate_notes()
+    return True
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.5 on 2026-10-18 22:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['-created', '-id'], name='api_note_created_id_idx'),
+        ),
+    ]
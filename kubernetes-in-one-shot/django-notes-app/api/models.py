@@ -6,5 +6,12 @@ class Note(models.Model):
     body = models.TextField(null=True, blank=True)
     updated = models.DateTimeField(auto_now=True)
     created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks notes newest first by (created, id)
+            models.Index(fields=['-created', '-id'], name='api_note_created_id_idx'),
+        ]
+
     def __str__(self):
         return self.body[0:69]
\ No newline at end of file
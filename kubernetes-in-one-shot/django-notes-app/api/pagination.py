@@ -0,0 +1,114 @@
+import base64
+import json
+
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Note
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Newest first; id breaks ties between notes created at the same instant
+ORDERING = ('-created', '-id')
+
+
+def encode_cursor(note):
+    """Opaque cursor pointing just past a note in ORDERING."""
+    raw = json.dumps([note.created.isoformat(), note.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(created, id) of the note a cursor points past; raises ValidationError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created, pk = json.loads(raw)
+        created = parse_datetime(created)
+        if created is None or not isinstance(pk, int):
+            raise ValueError(cursor)
+    except (TypeError, ValueError):
+        raise ValidationError({'cursor': 'Invalid cursor.'})
+    return created, pk
+
+
+def parse_limit(value):
+    """Page size from the limit query parameter, capped at MAX_LIMIT."""
+    if value is None:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValidationError({'limit': 'A positive integer is required.'})
+    if limit < 1:
+        raise ValidationError({'limit': 'A positive integer is required.'})
+    return min(limit, MAX_LIMIT)
+
+
+def page_queryset(queryset, position, limit):
+    """Up to limit notes in ORDERING, starting just past position ((created, id), or None for the first page)."""
+    if position is not None:
+        created, pk = position
+        # A row-value comparison lets the database seek straight to the cursor in
+        # api_note_created_id_idx, even when many notes share a timestamp; the
+        # equivalent OR of field lookups scans every tied row before it. The ORM
+        # cannot express one, so it is RawSQL, with the table and column names
+        # taken from the model so a rename cannot silently break paging
+        connection = connections[queryset.db]
+        created_field = Note._meta.get_field('created')
+        columns = ', '.join(
+            f'{connection.ops.quote_name(Note._meta.db_table)}.{connection.ops.quote_name(field.column)}'
+            for field in (created_field, Note._meta.pk)
+        )
+        created = created_field.get_db_prep_value(created, connection)
+        queryset = queryset.filter(RawSQL(f'({columns}) < (%s, %s)', [created, pk], output_field=BooleanField()))
+    return queryset.order_by(*ORDERING)[:limit]
+
+
+class KeysetPagination:
+    """
+    Cursor pagination on (created, id), newest first.
+
+    Each page is a range scan on api_note_created_id_idx that starts right
+    after the previous page's last note, so a page costs the same however far
+    into the table it is, unlike OFFSET which reads and skips every earlier row.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.limit = parse_limit(request.query_params.get('limit'))
+        cursor = request.query_params.get('cursor')
+        self.position = decode_cursor(cursor) if cursor else None
+        self.next_cursor = None
+
+    def paginate_queryset(self, queryset):
+        page = list(page_queryset(queryset, self.position, self.limit + 1))
+        if len(page) > self.limit:
+            page = page[:self.limit]
+            self.next_cursor = encode_cursor(page[-1])
+        return page
+
+    def page_key(self):
+        """Names the requested page, however its cursor was spelled."""
+        if self.position is None:
+            return str(self.limit)
+        created, pk = self.position
+        return f'{self.limit}:{created.isoformat()}:{pk}'
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'limit', self.limit)
+        return replace_query_param(url, 'cursor', self.next_cursor)
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'cursor': self.next_cursor,
+            'results': data,
+        }
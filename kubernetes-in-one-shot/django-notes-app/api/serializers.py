@@ -1,7 +1,11 @@
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import IntegerField, ModelSerializer
 from .models import Note
 
 class NoteSerializer(ModelSerializer):
     class Meta:
         model = Note
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class NoteUpdateSerializer(NoteSerializer):
+    # Bulk updates name the note they change in each item
+    id = IntegerField()
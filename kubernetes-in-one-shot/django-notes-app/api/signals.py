@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_notes_on_commit
+from .models import Note
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def note_changed(sender, **kwargs):
+    # Saves from the admin or the shell retire cached responses too
+    invalidate_notes_on_commit()
@@ -1,3 +1,241 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .cache import invalidate_notes, notes_version
+from .etags import update_if_unchanged
+from .models import Note
+from .pagination import page_queryset
+from .serializers import NoteSerializer
+
+
+class NotesPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        notes = Note.objects.bulk_create(Note(body=f'note {index}') for index in range(23))
+        # Several notes share a timestamp, so pages must break ties on id
+        base = timezone.now()
+        for index, note in enumerate(notes):
+            Note.objects.filter(pk=note.pk).update(created=base - timedelta(seconds=index // 5))
+        self.expected = list(Note.objects.order_by('-created', '-id').values_list('id', flat=True))
+
+    def test_list_without_parameters_is_an_array(self):
+        response = self.client.get('/api/notes/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([note['id'] for note in response.json()], self.expected)
+
+    def test_pages_cover_every_note_once(self):
+        seen = []
+        url = '/api/notes/?limit=4'
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page['results']), 4)
+            seen.extend(note['id'] for note in page['results'])
+            url = page['next']
+        self.assertEqual(seen, self.expected)
+
+        first = self.client.get('/api/notes/', {'limit': 10}).json()
+        second = self.client.get('/api/notes/', {'limit': 10, 'cursor': first['cursor']}).json()
+        self.assertEqual([note['id'] for note in second['results']], self.expected[10:20])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'limit': 0}, {'limit': 'ten'}, {'cursor': 'not-a-cursor'}, {'cursor': 'W10'}):
+            response = self.client.get('/api/notes/', params)
+            self.assertEqual(response.status_code, 400, params)
+
+    def test_pages_are_index_range_scans(self):
+        plan = page_queryset(Note.objects.all(), (timezone.now(), 10), 51).explain()
+        self.assertIn('api_note_created_id_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class NotesCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.note = Note.objects.create(body='first')
+
+    def assertCachedRead(self, url):
+        first = self.client.get(url).json()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).json(), first)
+        return first
+
+    def test_reads_are_served_from_the_cache(self):
+        self.assertCachedRead('/api/notes/')
+        self.assertCachedRead(f'/api/notes/{self.note.id}/')
+        self.assertCachedRead('/api/notes/?limit=1')
+        # The next link is built per request, not cached with the page
+        Note.objects.create(body='second')
+        page = self.client.get('/api/notes/?limit=1', HTTP_HOST='other.example').json()
+        self.assertTrue(page['next'].startswith('http://other.example/'))
+
+    def test_writes_invalidate_cached_reads(self):
+        self.assertCachedRead('/api/notes/')
+        self.assertCachedRead(f'/api/notes/{self.note.id}/')
+        self.assertCachedRead('/api/notes/?limit=5')
+
+        created = self.client.post('/api/notes/create/', {'body': 'second'}).json()
+        self.assertEqual([note['id'] for note in self.client.get('/api/notes/').json()],
+                         [created['id'], self.note.id])
+        self.assertEqual(len(self.client.get('/api/notes/?limit=5').json()['results']), 2)
+
+        self.client.put(f'/api/notes/{self.note.id}/update/', {'body': 'edited'})
+        self.assertEqual(self.client.get(f'/api/notes/{self.note.id}/').json()['body'], 'edited')
+
+        self.client.delete(f'/api/notes/{created["id"]}/delete/')
+        self.assertEqual([note['id'] for note in self.client.get('/api/notes/').json()], [self.note.id])
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_dummy_backend_disables_caching(self):
+        self.client.get('/api/notes/')
+        # The ETag aggregate and the notes themselves
+        with self.assertNumQueries(2):
+            self.client.get('/api/notes/')
+
+
+class NotesETagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.note = Note.objects.create(body='first')
+        self.url = f'/api/notes/{self.note.id}/'
+
+    def assertNotModified(self, url, etag, header=None):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=header or etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_matching_tags_are_not_modified(self):
+        for url in ('/api/notes/', '/api/notes/?limit=5', self.url):
+            etag = self.client.get(url)['ETag']
+            self.assertTrue(etag.startswith('"'))
+            self.assertNotModified(url, etag)
+            self.assertNotModified(url, etag, f'W/"other", W/{etag}')
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+        self.assertNotEqual(self.client.get('/api/notes/')['ETag'], self.client.get('/api/notes/?limit=5')['ETag'])
+
+    def test_conditional_get_skips_the_serializer(self):
+        etag = self.client.get('/api/notes/')['ETag']
+        cache.clear()
+        # One aggregate query for the tag, and no notes loaded
+        with self.assertNumQueries(1), mock.patch.object(NoteSerializer, 'to_representation') as serialize:
+            self.assertNotModified('/api/notes/', etag)
+        serialize.assert_not_called()
+
+    def test_writes_change_the_tags(self):
+        list_etag = self.client.get('/api/notes/')['ETag']
+        note_etag = self.client.get(self.url)['ETag']
+
+        response = self.client.put(f'{self.url}update/', {'body': 'edited'})
+        self.assertNotEqual(response['ETag'], note_etag)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=note_etag).status_code, 200)
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+
+        other = Note.objects.create(body='second')
+        tags = {list_etag}
+        for write in (lambda: Note.objects.filter(pk=other.pk).update(body='x'), lambda: other.delete()):
+            invalidate_notes()
+            write()
+            tags.add(self.client.get('/api/notes/')['ETag'])
+        self.assertEqual(len(tags), 3)
+
+    def test_if_match_prevents_lost_updates(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.put(f'{self.url}update/', {'body': 'mine'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # A second writer still holding the old tag is refused
+        response = self.client.put(f'{self.url}update/', {'body': 'theirs'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.get(self.url).json()['body'], 'mine')
+
+        self.assertEqual(self.client.put(f'{self.url}update/', {'body': 'any'}, HTTP_IF_MATCH='*').status_code, 200)
+
+    def test_if_match_write_is_conditional(self):
+        note = Note.objects.get(pk=self.note.pk)
+        Note.objects.filter(pk=note.pk).update(body='concurrent', updated=timezone.now())
+        self.assertFalse(update_if_unchanged(note, {'body': 'stale'}))
+        self.assertEqual(Note.objects.get(pk=note.pk).body, 'concurrent')
+
+
+class NotesBulkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.notes = Note.objects.bulk_create(Note(body=f'note {index}') for index in range(3))
+
+    def bodies(self):
+        return [note['body'] for note in self.client.get('/api/notes/').json()]
+
+    def test_bulk_create(self):
+        self.bodies()
+        # One INSERT, inside the savepoint the test's transaction turns atomic() into
+        with self.assertNumQueries(3):
+            response = self.client.post('/api/notes/bulk/create/', [{'body': 'a'}, {'body': 'b'}], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([note['body'] for note in response.json()], ['a', 'b'])
+        self.assertTrue(all(note['id'] for note in response.json()))
+        self.assertEqual(sorted(self.bodies()), ['a', 'b', 'note 0', 'note 1', 'note 2'])
+
+    def test_bulk_update(self):
+        self.bodies()
+        items = [{'id': self.notes[2].id, 'body': 'two'}, {'id': self.notes[0].id, 'body': 'zero'}]
+        # One query to load the notes and one to write them, inside a savepoint
+        with self.assertNumQueries(4):
+            response = self.client.put('/api/notes/bulk/update/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([note['body'] for note in response.json()], ['two', 'zero'])
+        self.assertEqual(sorted(self.bodies()), ['note 1', 'two', 'zero'])
+        self.assertGreater(Note.objects.get(pk=self.notes[0].id).updated, self.notes[0].updated)
+
+    def test_bulk_delete(self):
+        self.bodies()
+        ids = [self.notes[0].id, self.notes[1].id, 12345]
+        version = notes_version()
+        # One DELETE inside a savepoint, without loading the notes, and one cache invalidation
+        with self.assertNumQueries(3):
+            response = self.client.delete('/api/notes/bulk/delete/', ids, format='json')
+        self.assertEqual(notes_version(), version + 1)
+        self.assertEqual(response.json(), {'deleted': 2})
+        self.assertEqual(self.bodies(), ['note 2'])
+
+    def test_bulk_delete_is_batched(self):
+        missing = max(note.id for note in self.notes) + 1
+        ids = [self.notes[0].id, *range(missing, missing + 1100), self.notes[2].id]
+        version = notes_version()
+        # 1102 ids take three DELETEs of at most 500, so none exceeds SQLite's 999 parameters
+        with self.assertNumQueries(5):
+            response = self.client.delete('/api/notes/bulk/delete/', ids, format='json')
+        self.assertEqual(notes_version(), version + 1)
+        self.assertEqual(response.json(), {'deleted': 2})
+        self.assertEqual(self.bodies(), ['note 1'])
+
+    def test_invalid_items_are_reported_and_nothing_is_written(self):
+        response = self.client.post('/api/notes/bulk/create/', [{'body': 'ok'}, 'text'], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()[0], {})
+        self.assertIn('non_field_errors', response.json()[1])
+
+        items = [{'id': self.notes[0].id, 'body': 'x'}, {'id': 12345, 'body': 'y'},
+                 {'id': self.notes[0].id, 'body': 'z'}, {'body': 'no id'}]
+        response = self.client.put('/api/notes/bulk/update/', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.json()[3]), ['id'])
+        # Lookups only run once every item is well formed
+        response = self.client.put('/api/notes/bulk/update/', items[:3], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([list(errors) for errors in response.json()], [[], ['id'], ['id']])
+
+        response = self.client.delete('/api/notes/bulk/delete/', [self.notes[0].id, 'x'], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()[0], [])
+
+        response = self.client.post('/api/notes/bulk/create/', {'body': 'not a list'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(sorted(self.bodies()), ['note 0', 'note 1', 'note 2'])
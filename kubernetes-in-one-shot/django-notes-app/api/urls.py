@@ -4,6 +4,9 @@ from .views import *
 urlpatterns = [
     path('', getRoutes, name="routes"),
     path('notes/', getNotes, name="notes"),
+    path('notes/bulk/create/', bulkCreateNotes, name="bulk-create-notes"),
+    path('notes/bulk/update/', bulkUpdateNotes, name="bulk-update-notes"),
+    path('notes/bulk/delete/', bulkDeleteNotes, name="bulk-delete-notes"),
     path('notes/<str:pk>/update/', updateNote, name="update-note"),
     path('notes/<str:pk>/delete/', deleteNote, name="delete-note"),
     path('notes/create/', createNote, name="create-note"),
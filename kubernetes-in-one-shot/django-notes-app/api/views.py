@@ -1,8 +1,13 @@
 from django.shortcuts import render
+from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from .serializers import NoteSerializer
 from .models import Note
+from .bulk import bulk_create_notes, bulk_delete_notes, bulk_update_notes
+from .cache import cached_response_data
+from .etags import etag_matches, list_etag, not_modified, note_etag, update_if_unchanged
+from .pagination import ORDERING, KeysetPagination
 
 # Create your views here.
 
@@ -15,6 +20,12 @@ def getRoutes(request):
             'body': None,
             'description': 'Returns an array of notes'
         },
+        {
+            'Endpoint': '/notes/?limit=50&cursor=',
+            'method': 'GET',
+            'body': None,
+            'description': 'Returns a page of notes, newest first, with the cursor of the next page'
+        },
         {
             'Endpoint': '/notes/id',
             'method': 'GET',
@@ -39,28 +50,83 @@ def getRoutes(request):
             'body': None,
             'description': 'Deletes and exiting note'
         },
+        {
+            'Endpoint': '/notes/bulk/create/',
+            'method': 'POST',
+            'body': [{'body': ""}],
+            'description': 'Creates a note for each object in the array, or none if any is invalid'
+        },
+        {
+            'Endpoint': '/notes/bulk/update/',
+            'method': 'PUT',
+            'body': [{'id': 0, 'body': ""}],
+            'description': 'Updates the note with each id, or none if any is invalid'
+        },
+        {
+            'Endpoint': '/notes/bulk/delete/',
+            'method': 'DELETE',
+            'body': [0],
+            'description': 'Deletes the notes with the ids in the array'
+        },
     ]
     return Response(routes)
 
 @api_view(['GET'])
 def getNotes(request):
-    notes = Note.objects.all().order_by('-created')
-    serializer = NoteSerializer(notes, many=True)
-    return Response(serializer.data)
+    # Without limit or cursor, keep returning the plain array the frontend expects
+    if 'limit' not in request.query_params and 'cursor' not in request.query_params:
+        etag = list_etag('list')
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        def build():
+            notes = Note.objects.all().order_by(*ORDERING)
+            return NoteSerializer(notes, many=True).data
+        return Response(cached_response_data('list', build), headers={'ETag': etag})
+    paginator = KeysetPagination(request)
+    etag = list_etag(f'list:{paginator.page_key()}')
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    def build_page():
+        notes = paginator.paginate_queryset(Note.objects.all())
+        return {'cursor': paginator.next_cursor, 'results': NoteSerializer(notes, many=True).data}
+    # The next link depends on the request's host, so only the page itself is cached
+    page = cached_response_data(f'list:{paginator.page_key()}', build_page)
+    paginator.next_cursor = page['cursor']
+    return Response(paginator.get_paginated_data(page['results']), headers={'ETag': etag})
 
 @api_view(['GET'])
 def getNote(request, pk):
-    note = Note.objects.get(id=pk)
-    serializer = NoteSerializer(note, many=False)
-    return Response(serializer.data)
+    updated = cached_response_data(f'note:{pk}:updated',
+                                   lambda: Note.objects.values_list('updated', flat=True).get(id=pk))
+    etag = note_etag(pk, updated)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    def build():
+        note = Note.objects.get(id=pk)
+        return NoteSerializer(note, many=False).data
+    return Response(cached_response_data(f'note:{pk}', build), headers={'ETag': etag})
 
 @api_view(['PUT'])
 def updateNote(request, pk):
     note = Note.objects.get(id=pk)
+    # If-Match is checked against the note already loaded for the update, and
+    # the write itself only applies while the row is unchanged
+    if_match = request.headers.get('If-Match')
+    if if_match is not None and not etag_matches(if_match, note_etag(note.pk, note.updated)):
+        return Response(status=status.HTTP_412_PRECONDITION_FAILED)
     serializer = NoteSerializer(instance=note, data=request.data)
     if serializer.is_valid():
-        serializer.save()
-    return Response(serializer.data)
+        if if_match is None:
+            serializer.save()
+        elif not update_if_unchanged(note, serializer.validated_data):
+            return Response(status=status.HTTP_412_PRECONDITION_FAILED)
+    return Response(serializer.data, headers={'ETag': note_etag(note.pk, note.updated)})
 
 @api_view(['DELETE'])
 def deleteNote(request, pk):
@@ -75,4 +141,21 @@ def createNote(request):
         body=data['body']
     )
     serializer = NoteSerializer(note, many=False)
-    return Response(serializer.data)
\ No newline at end of file
+    return Response(serializer.data, headers={'ETag': note_etag(note.pk, note.updated)})
+
+@api_view(['POST'])
+def bulkCreateNotes(request):
+    notes = bulk_create_notes(request.data)
+    serializer = NoteSerializer(notes, many=True)
+    return Response(serializer.data)
+
+@api_view(['PUT'])
+def bulkUpdateNotes(request):
+    notes = bulk_update_notes(request.data)
+    serializer = NoteSerializer(notes, many=True)
+    return Response(serializer.data)
+
+@api_view(['DELETE'])
+def bulkDeleteNotes(request):
+    deleted = bulk_delete_notes(request.data)
+    return Response({'deleted': deleted})
\ No newline at end of file
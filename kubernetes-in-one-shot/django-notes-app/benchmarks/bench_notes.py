@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the notes API
+
+Each run creates a throwaway test database (in memory for SQLite), so the
+project database is never touched, and drives the API through the Django test
+client.
+
+Usage:
+    python benchmarks/bench_notes.py pagination [--notes 500000] [--limit 50]
+    python benchmarks/bench_notes.py cache [--notes 1000] [--seconds 2]
+    python benchmarks/bench_notes.py etag [--notes 1000] [--seconds 2]
+    python benchmarks/bench_notes.py bulk [--notes 10000]
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notesapp.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from api.models import Note  # noqa: E402
+from api.pagination import ORDERING, decode_cursor, encode_cursor, page_queryset  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    """Create the test database with all migrations applied, and drop it afterwards"""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_notes(count, batch_size=5000):
+    """Insert count notes with distinct creation times"""
+    Note.objects.bulk_create((Note(body=f'Note {index}: ' + 'lorem ipsum ' * 8) for index in range(count)),
+                             batch_size=batch_size)
+
+
+def time_calls(func, repeat):
+    """Latency percentiles of repeated calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'p50_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, math.ceil(0.95 * len(timings)) - 1)], 3),
+    }
+
+
+def requests_per_second(func, seconds):
+    """How many times func completes per second, over about seconds"""
+    func()
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def bench_pagination(args):
+    """Latency of a keyset page at increasing depth, against OFFSET paging to the same depth"""
+    client = APIClient()
+    seed_notes(args.notes)
+    ordered = Note.objects.order_by(*ORDERING)
+    pages = [page for page in (1, 10, 100, 1000, 10000) if (page - 1) * args.limit < args.notes]
+    print(f'{args.notes} notes, {args.limit} per page')
+    for page in pages:
+        depth = (page - 1) * args.limit
+        params = {'limit': args.limit}
+        if depth:
+            params['cursor'] = encode_cursor(ordered[depth - 1])
+
+        def keyset():
+            response = client.get('/api/notes/', params)
+            assert response.status_code == 200 and len(response.data['results']) <= args.limit
+
+        def keyset_query():
+            position = decode_cursor(params['cursor']) if depth else None
+            list(page_queryset(Note.objects.all(), position, args.limit + 1))
+
+        def offset_query():
+            list(ordered[depth:depth + args.limit + 1])
+
+        request = time_calls(keyset, args.repeat)
+        query = time_calls(keyset_query, args.repeat)
+        offset = time_calls(offset_query, args.repeat)
+        print(f'page {page:>6}   request p50 {request["p50_ms"]:>7.2f} ms  p95 {request["p95_ms"]:>7.2f} ms'
+              f'   keyset query p50 {query["p50_ms"]:>7.2f} ms   OFFSET query p50 {offset["p50_ms"]:>7.2f} ms')
+
+
+CACHE_BACKENDS = {
+    'none': 'django.core.cache.backends.dummy.DummyCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+
+
+def bench_cache(args):
+    """Read throughput of the notes endpoints without and with the response cache"""
+    client = APIClient()
+    seed_notes(args.notes)
+    note = Note.objects.order_by('id').first()
+    endpoints = {
+        'list': '/api/notes/',
+        f'page of {args.limit}': f'/api/notes/?limit={args.limit}',
+        'note': f'/api/notes/{note.id}/',
+    }
+    print(f'{args.notes} notes, reads per second')
+    for name, url in endpoints.items():
+        def read():
+            response = client.get(url)
+            assert response.status_code == 200
+
+        rates = {}
+        for backend, path in CACHE_BACKENDS.items():
+            with override_settings(CACHES={'default': {'BACKEND': path}}):
+                cache.clear()
+                rates[backend] = requests_per_second(read, args.seconds)
+        print(f'{name:<14} no cache {rates["none"]:>9.0f}   locmem {rates["locmem"]:>9.0f}'
+              f'   x{rates["locmem"] / rates["none"]:.1f}')
+
+
+def bench_etag(args):
+    """Polling the list with and without If-None-Match, with the response cache off and on"""
+    client = APIClient()
+    seed_notes(args.notes)
+    print(f'{args.notes} notes, polls of /api/notes/ per second')
+    for backend, path in CACHE_BACKENDS.items():
+        with override_settings(CACHES={'default': {'BACKEND': path}}):
+            cache.clear()
+            full = client.get('/api/notes/')
+            etag = full['ETag']
+
+            def poll():
+                assert client.get('/api/notes/').status_code == 200
+
+            def conditional_poll():
+                assert client.get('/api/notes/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+            rates = [requests_per_second(poll, args.seconds), requests_per_second(conditional_poll, args.seconds)]
+        print(f'cache {backend:<7} full {rates[0]:>8.0f} ({len(full.content)} bytes)'
+              f'   If-None-Match {rates[1]:>8.0f} (0 bytes)   x{rates[1] / rates[0]:.1f}')
+
+
+def per_note_phases(client, bodies):
+    """Seconds to create, update and delete the notes with one request per note"""
+    phases = {}
+    start = time.perf_counter()
+    ids = [client.post('/api/notes/create/', {'body': body}, format='json').json()['id'] for body in bodies]
+    phases['create'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for pk in ids:
+        client.put(f'/api/notes/{pk}/update/', {'body': 'edited'}, format='json')
+    phases['update'] = time.perf_counter() - start
+    start = time.perf_counter()
+    for pk in ids:
+        client.delete(f'/api/notes/{pk}/delete/')
+    phases['delete'] = time.perf_counter() - start
+    return phases
+
+
+def bulk_phases(client, bodies):
+    """Seconds to create, update and delete the notes with one bulk request each"""
+    phases = {}
+    start = time.perf_counter()
+    response = client.post('/api/notes/bulk/create/', [{'body': body} for body in bodies], format='json')
+    ids = [note['id'] for note in response.json()]
+    phases['create'] = time.perf_counter() - start
+    start = time.perf_counter()
+    client.put('/api/notes/bulk/update/', [{'id': pk, 'body': 'edited'} for pk in ids], format='json')
+    phases['update'] = time.perf_counter() - start
+    start = time.perf_counter()
+    client.delete('/api/notes/bulk/delete/', ids, format='json')
+    phases['delete'] = time.perf_counter() - start
+    return phases
+
+
+def bench_bulk(args):
+    """Importing, updating and deleting notes one request per note against the bulk endpoints"""
+    client = APIClient()
+    bodies = [f'Imported note {index}: ' + 'lorem ipsum ' * 8 for index in range(args.notes)]
+    print(f'{args.notes} notes, seconds per phase')
+    for name, run in (('per note', per_note_phases), ('bulk', bulk_phases)):
+        phases = run(client, bodies)
+        assert not Note.objects.exists()
+        print(f'{name:<9} ' + '   '.join(f'{phase} {seconds:>7.2f}' for phase, seconds in phases.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the notes API on a throwaway database')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pagination = commands.add_parser('pagination', help='Keyset page latency at increasing depth')
+    pagination.add_argument('--notes', type=int, default=500000, help='Notes in the table (default: 500000)')
+    pagination.add_argument('--limit', type=int, default=50, help='Page size (default: 50)')
+    pagination.add_argument('--repeat', type=int, default=50, help='Requests per page (default: 50)')
+    pagination.set_defaults(func=bench_pagination)
+
+    cache_parser = commands.add_parser('cache', help='Read throughput with and without the response cache')
+    cache_parser.add_argument('--notes', type=int, default=1000, help='Notes in the table (default: 1000)')
+    cache_parser.add_argument('--limit', type=int, default=50, help='Page size (default: 50)')
+    cache_parser.add_argument('--seconds', type=float, default=2, help='Seconds per measurement (default: 2)')
+    cache_parser.set_defaults(func=bench_cache)
+
+    etag = commands.add_parser('etag', help='List polls with and without If-None-Match')
+    etag.add_argument('--notes', type=int, default=1000, help='Notes in the table (default: 1000)')
+    etag.add_argument('--seconds', type=float, default=2, help='Seconds per measurement (default: 2)')
+    etag.set_defaults(func=bench_etag)
+
+    bulk = commands.add_parser('bulk', help='Per-note requests against the bulk endpoints')
+    bulk.add_argument('--notes', type=int, default=10000, help='Notes to import (default: 10000)')
+    bulk.set_defaults(func=bench_bulk)
+
+    args = parser.parse_args()
+    with test_database():
+        args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -95,6 +97,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+#
+# Notes responses are cached per process by default. Run several workers
+# against a shared backend (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# and CACHE_LOCATION=redis://127.0.0.1:6379) so a write retires every worker's copy.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'notes'),
+    }
+}
+
+# Seconds a cached notes response is kept; writes retire them sooner
+NOTES_CACHE_TIMEOUT = int(os.environ.get('NOTES_CACHE_TIMEOUT', 300))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -144,4 +164,8 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-CORS_ORIGIN_ALLOW_ALL = True
\ No newline at end of file
+CORS_ORIGIN_ALLOW_ALL = True
+
+# Let cross-origin clients read note ETags and send them back as preconditions
+CORS_EXPOSE_HEADERS = ['ETag']
+CORS_ALLOW_HEADERS = list(default_headers) + ['if-match', 'if-none-match']
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Shared HTTP client for the Content Extraction API
+
+The command-line tools share one pooled requests.Session, so repeated calls
+reuse keep-alive connections, and transient failures (429 and 5xx responses,
+dropped connections) are retried with exponential backoff. AsyncContentClient
+offers the same on httpx for callers that run many requests concurrently.
+With local=True, content is extracted in-process instead, without a server,
+and with a ContentCache, results are kept on disk for later runs.
+"""
+import asyncio
+import threading
+from typing import Dict, Iterable, List, Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from content_cache import ContentCache
+
+DEFAULT_API_URL = "http://localhost:8000"
+# Responses worth retrying: rate limiting and server-side failures
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+POOL_SIZE = 10
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+TIMEOUT = 30
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size: int = POOL_SIZE, retries: int = RETRIES,
+                   backoff_factor: float = BACKOFF_FACTOR) -> requests.Session:
+    """
+    Create a session with a connection pool and retries
+
+    Args:
+        pool_size: Keep-alive connections kept per host
+        retries: Retries for connection errors and RETRY_STATUSES responses
+        backoff_factor: Base of the exponential backoff between retries, in seconds
+
+    Returns:
+        requests.Session: Session that asks for gzip-compressed responses
+    """
+    retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                  allowed_methods=frozenset(["GET", "POST"]), respect_retry_after_header=True,
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the process-wide session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def content_payload(url: str, language: Optional[str] = None, format_text: bool = True) -> Dict:
+    """Request body for the /content endpoint"""
+    return {"url": url, "language": language, "format_text": format_text}
+
+
+def parse_content_response(status_code: int, text: str, data: Optional[Dict]) -> Union[Dict, str]:
+    """Extracted content on success, or an error message"""
+    if status_code == 200:
+        if data["status"] == "success":
+            return data
+        return f"Error: {data['message']}"
+    return f"Error: {status_code} - {text}"
+
+
+def extract_content_local(url: str, language: Optional[str] = None, format_text: bool = True) -> Union[Dict, str]:
+    """
+    Extract content in this process with the services behind /content
+
+    Skips the HTTP round trip, JSON encoding and response validation, with the
+    same results as extract_content: the URL is validated and normalized like
+    the API does, and errors become the same messages.
+    """
+    from pydantic import HttpUrl, TypeAdapter, ValidationError
+
+    from app.content_service import ContentService
+
+    try:
+        url = str(TypeAdapter(HttpUrl).validate_python(url))
+    except ValidationError as e:
+        return f"Error: 422 - {e.errors()[0]['msg']}"
+    try:
+        data = ContentService.get_content(url, language, format_text)
+    except Exception as e:
+        return f"Error: 500 - {str(e)}"
+    return parse_content_response(200, "", ContentService.as_response(data))
+
+
+def extract_content(url: str, language: Optional[str] = None, format_text: bool = True,
+                    api_url: str = DEFAULT_API_URL, session: Optional[requests.Session] = None,
+                    local: bool = False, cache: Optional[ContentCache] = None,
+                    refresh: bool = False) -> Union[Dict, str]:
+    """
+    Extract content from a URL (YouTube video or web page)
+
+    Args:
+        url: URL to extract content from
+        language: Preferred language code (optional, for YouTube)
+        format_text: Whether to return formatted text (for YouTube)
+        api_url: API server URL
+        session: Session to send the request on (default: the shared session)
+        local: Extract in this process instead of calling the API server
+        cache: Cache to answer from and to store successful results in (optional)
+        refresh: Extract again even if the cache has the content, and update it
+        
+    Returns:
+        Extracted content or error message
+    """
+    if cache is not None and not refresh:
+        data = cache.get(url, language, format_text)
+        if data is not None:
+            return data
+    if local:
+        result = extract_content_local(url, language, format_text)
+    else:
+        result = extract_content_remote(url, language, format_text, api_url, session)
+    if cache is not None and isinstance(result, dict):
+        cache.put(url, language, format_text, result)
+    return result
+
+
+def extract_content_remote(url: str, language: Optional[str] = None, format_text: bool = True,
+                           api_url: str = DEFAULT_API_URL,
+                           session: Optional[requests.Session] = None) -> Union[Dict, str]:
+    """Extract content through the API server's /content endpoint"""
+    session = session or get_session()
+    try:
+        response = session.post(f"{api_url}/content", json=content_payload(url, language, format_text),
+                                timeout=TIMEOUT)
+        data = response.json() if response.status_code == 200 else None
+        return parse_content_response(response.status_code, response.text, data)
+    except requests.exceptions.RequestException as e:
+        return f"Connection error: {str(e)}"
+
+
+class AsyncContentClient:
+    """
+    Asynchronous client on a pooled httpx.AsyncClient
+
+    Usage:
+        async with AsyncContentClient(max_connections=50) as client:
+            results = await client.extract_many(urls, concurrency=50)
+    """
+
+    def __init__(self, api_url: str = DEFAULT_API_URL, max_connections: int = 100, retries: int = RETRIES,
+                 backoff_factor: float = BACKOFF_FACTOR, timeout: float = TIMEOUT, transport=None):
+        self.api_url = api_url
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client = httpx.AsyncClient(limits=limits, timeout=timeout, transport=transport,
+                                         headers={"Accept-Encoding": "gzip, deflate"})
+
+    async def __aenter__(self) -> "AsyncContentClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * (2 ** attempt)
+
+    async def post(self, path: str, payload: Dict):
+        """POST JSON, retrying connection errors and RETRY_STATUSES responses with backoff"""
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self._client.post(f"{self.api_url}{path}", json=payload)
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, None))
+                continue
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+
+    async def extract_content(self, url: str, language: Optional[str] = None,
+                              format_text: bool = True) -> Union[Dict, str]:
+        """Extract content from a URL; same results as extract_content"""
+        try:
+            response = await self.post("/content", content_payload(url, language, format_text))
+            data = response.json() if response.status_code == 200 else None
+            return parse_content_response(response.status_code, response.text, data)
+        except httpx.HTTPError as e:
+            return f"Connection error: {str(e)}"
+
+    async def extract_many(self, urls: Iterable[str], concurrency: int = 20, language: Optional[str] = None,
+                           format_text: bool = True) -> List[Union[Dict, str]]:
+        """Extract content from many URLs with at most concurrency requests in flight, in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(url: str):
+            async with semaphore:
+                return await self.extract_content(url, language, format_text)
+
+        return await asyncio.gather(*(one(url) for url in urls))
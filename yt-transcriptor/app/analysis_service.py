@@ -0,0 +1,192 @@
+"""
+Analysis Service
+Runs sentiment and quote analysis on a pool of warm SentimentAnalyzer workers
+"""
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sentiment_analyzer import get_analyzer
+
+# Plain text, or a transcript as compact (text, start) segments
+Source = Union[str, List[Tuple[str, float]]]
+
+
+def _warm() -> None:
+    """Pool task: load the analyzer, returning nothing (an analyzer cannot be pickled back)"""
+    get_analyzer()
+
+
+def _run_top_quotes(text: Source, top_n: int, sentiment_type: str, video_id: Optional[str] = None) -> List[Dict]:
+    """Pool task: top quotes of one polarity"""
+    if isinstance(text, str):
+        return get_analyzer().get_top_quotes(text, top_n, sentiment_type)
+    return get_analyzer().get_top_quotes_from_segments(text, top_n, sentiment_type, video_id)
+
+
+def _run_analyze(text: Source, top_n: int, video_id: Optional[str] = None) -> Dict[str, List[Dict]]:
+    """Pool task: top quotes of both polarities"""
+    if isinstance(text, str):
+        top_positive, top_negative = get_analyzer().get_top_sentiments(text, top_n)
+    else:
+        top_positive, top_negative = get_analyzer().get_top_sentiments_from_segments(text, top_n, video_id)
+    return {"top_positive": top_positive, "top_negative": top_negative}
+
+
+def _run_timeline(segments: List[Tuple[str, float]], window_seconds: float,
+                  step_seconds: Optional[float]) -> Dict:
+    """Pool task: windowed sentiment timeline of a transcript"""
+    return get_analyzer().sentiment_timeline(segments, window_seconds, step_seconds)
+
+
+class AnalysisService:
+    """Service for running sentiment analysis off the event loop with cached results"""
+
+    _executor: Optional[Executor] = None
+    _cache: "OrderedDict[str, Any]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def worker_count() -> int:
+        """Number of analyzer processes (ANALYZER_WORKERS, 0 runs analysis in a thread)"""
+        return int(os.getenv("ANALYZER_WORKERS", min(4, os.cpu_count() or 1)))
+
+    @staticmethod
+    def cache_size() -> int:
+        """Maximum number of cached analysis results (ANALYSIS_CACHE_SIZE)"""
+        return int(os.getenv("ANALYSIS_CACHE_SIZE", 256))
+
+    @staticmethod
+    def get_executor() -> Executor:
+        """
+        Get the analyzer pool, starting it on first use
+
+        Returns:
+            Executor: Process pool whose workers each hold a loaded analyzer
+        """
+        with AnalysisService._lock:
+            if AnalysisService._executor is None:
+                workers = AnalysisService.worker_count()
+                if workers > 0:
+                    AnalysisService._executor = ProcessPoolExecutor(max_workers=workers, initializer=get_analyzer)
+                else:
+                    AnalysisService._executor = ThreadPoolExecutor(max_workers=1, initializer=get_analyzer)
+            return AnalysisService._executor
+
+    @staticmethod
+    def start() -> List[Future]:
+        """
+        Start the pool and load the lexicon in every worker ahead of the first request
+
+        Returns:
+            List[Future]: One warm-up task per worker, each resolving to None
+        """
+        executor = AnalysisService.get_executor()
+        return [executor.submit(_warm) for _ in range(max(AnalysisService.worker_count(), 1))]
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stop the analyzer pool"""
+        with AnalysisService._lock:
+            if AnalysisService._executor is not None:
+                AnalysisService._executor.shutdown(wait=False, cancel_futures=True)
+                AnalysisService._executor = None
+
+    @staticmethod
+    def cache_key(text: Source, *params: Any) -> str:
+        """
+        Build a cache key from the content hash and analysis parameters
+
+        Args:
+            text: Analyzed text or transcript segments
+            params: Operation name and its parameters
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha256()
+        if isinstance(text, str):
+            digest.update(text.encode("utf-8"))
+        else:
+            digest.update(b"segments")
+            for segment_text, start in text:
+                digest.update(f"\0{start!r}\t{segment_text}".encode("utf-8"))
+        digest = digest.hexdigest()
+        return ":".join([digest, *(str(p) for p in params)])
+
+    @staticmethod
+    async def _cached(key: str, func, *args) -> Tuple[Any, bool]:
+        with AnalysisService._lock:
+            if key in AnalysisService._cache:
+                AnalysisService._cache.move_to_end(key)
+                return AnalysisService._cache[key], True
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(AnalysisService.get_executor(), func, *args)
+
+        with AnalysisService._lock:
+            AnalysisService._cache[key] = result
+            while len(AnalysisService._cache) > AnalysisService.cache_size():
+                AnalysisService._cache.popitem(last=False)
+        return result, False
+
+    @staticmethod
+    async def top_quotes(text: Source, top_n: int = 5, sentiment_type: str = 'positive',
+                         video_id: Optional[str] = None) -> Tuple[List[Dict], bool]:
+        """
+        Extract top quotes from text on the analyzer pool
+
+        Args:
+            text: Text to analyze (timestamps are stripped), or (text, start) transcript segments
+            top_n: Number of top quotes to return
+            sentiment_type: 'positive' or 'negative'
+            video_id: YouTube video ID for deep links to quotes from segments
+
+        Returns:
+            Tuple of (quotes, whether the result came from the cache)
+        """
+        key = AnalysisService.cache_key(text, "quotes", top_n, sentiment_type, video_id)
+        return await AnalysisService._cached(key, _run_top_quotes, text, top_n, sentiment_type, video_id)
+
+    @staticmethod
+    async def analyze(text: Source, top_n: int = 5, video_id: Optional[str] = None) -> Tuple[Dict[str, List[Dict]], bool]:
+        """
+        Extract top positive and negative quotes from text on the analyzer pool
+
+        Args:
+            text: Text to analyze (timestamps are stripped), or (text, start) transcript segments
+            top_n: Number of quotes of each polarity
+            video_id: YouTube video ID for deep links to quotes from segments
+
+        Returns:
+            Tuple of ({"top_positive", "top_negative"}, whether the result came from the cache)
+        """
+        key = AnalysisService.cache_key(text, "analyze", top_n, video_id)
+        return await AnalysisService._cached(key, _run_analyze, text, top_n, video_id)
+
+    @staticmethod
+    async def timeline(segments: List[Tuple[str, float]], window_seconds: float = 60.0,
+                       step_seconds: Optional[float] = None) -> Tuple[Dict, bool]:
+        """
+        Compute a windowed sentiment timeline of a transcript on the analyzer pool
+
+        Args:
+            segments: Compact (text, start) transcript segments
+            window_seconds: Width of each window in seconds
+            step_seconds: Distance between window starts (default: window_seconds)
+
+        Returns:
+            Tuple of (timeline, whether the result came from the cache)
+        """
+        key = AnalysisService.cache_key(segments, "timeline", window_seconds, step_seconds)
+        return await AnalysisService._cached(key, _run_timeline, segments, window_seconds, step_seconds)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Remove all cached analysis results"""
+        with AnalysisService._lock:
+            AnalysisService._cache.clear()
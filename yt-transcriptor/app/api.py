@@ -1,20 +1,60 @@
 """
 FastAPI application for content extraction (YouTube transcripts and web page content)
 """
-from fastapi import FastAPI, HTTPException, Query
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel, HttpUrl, Field
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Literal, Optional, Tuple, Union, Any
 import re
 
+from app.analysis_service import AnalysisService, Source
+from app.content_service import ContentService
+from app.profiling import (PROFILE_HEADER, TOKEN_HEADER, ProfilingConfig, RequestProfiler,
+                           profile_store, pstats_text, should_profile)
 from app.transcript_service import TranscriptService
 from app.web_content_service import WebContentService
+from sentiment_analyzer import compact_segments
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the sentiment analyzer pool on startup and stop it on shutdown"""
+    AnalysisService.start()
+    yield
+    AnalysisService.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Content Extraction API",
     description="API for extracting transcripts from YouTube videos and content from web pages",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan
 )
+# Transcripts and article text compress well; clients send Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profile sampled requests and requests carrying the debug header (opt-in)"""
+    if request.url.path.startswith("/debug/") or not should_profile(
+            request.headers.get(PROFILE_HEADER), request.headers.get(TOKEN_HEADER)):
+        return await call_next(request)
+    
+    profiler = RequestProfiler.try_start(ProfilingConfig.mode())
+    if profiler is None:
+        # Another request is being profiled
+        return await call_next(request)
+    
+    try:
+        response = await call_next(request)
+    finally:
+        captured = profiler.stop()
+    
+    profile_store.resize(ProfilingConfig.buffer_size())
+    profile_id = profile_store.add(request.method, request.url.path, response.status_code, profiler, captured)
+    response.headers["X-Profile-Id"] = profile_id
+    return response
 
 # Define request and response models
 class TranscriptRequest(BaseModel):
@@ -43,6 +83,8 @@ class WebContentResponse(BaseModel):
     publish_date: Optional[str] = None
     top_image: Optional[str] = None
     method: Optional[str] = None
+    fingerprint: Optional[str] = None
+    duplicate_of: Optional[str] = None
     message: Optional[str] = None
 
 class ContentRequest(BaseModel):
@@ -55,7 +97,7 @@ class ContentResponse(BaseModel):
     url: str
     content_type: str
     title: Optional[str] = None
-    text: Optional[str] = None
+    text: Optional[Union[List[Dict], str]] = None
     video_id: Optional[str] = None
     language: Optional[str] = None
     summary: Optional[str] = None
@@ -64,6 +106,55 @@ class ContentResponse(BaseModel):
     publish_date: Optional[str] = None
     top_image: Optional[str] = None
     method: Optional[str] = None
+    fingerprint: Optional[str] = None
+    duplicate_of: Optional[str] = None
+    message: Optional[str] = None
+
+class AnalysisRequest(BaseModel):
+    url: Optional[HttpUrl] = None
+    text: Optional[str] = Field(default=None, description="Text to analyze instead of fetching a URL")
+    language: Optional[str] = None
+    top_n: int = Field(default=5, ge=1, le=100, description="Number of top quotes to return")
+
+class AnalysisResponse(BaseModel):
+    status: str
+    url: Optional[str] = None
+    content_type: Optional[str] = None
+    title: Optional[str] = None
+    video_id: Optional[str] = None
+    top_positive: Optional[List[Dict]] = None
+    top_negative: Optional[List[Dict]] = None
+    cached: bool = False
+    message: Optional[str] = None
+
+class QuotesRequest(AnalysisRequest):
+    sentiment_type: Literal['positive', 'negative'] = 'positive'
+
+class TimelineRequest(BaseModel):
+    url: HttpUrl
+    language: Optional[str] = None
+    window_seconds: float = Field(default=60.0, ge=1, description="Width of each window in seconds")
+    step_seconds: Optional[float] = Field(default=None, ge=1, description="Distance between windows (default: window_seconds)")
+
+class TimelineResponse(BaseModel):
+    status: str
+    url: Optional[str] = None
+    content_type: Optional[str] = None
+    title: Optional[str] = None
+    video_id: Optional[str] = None
+    timeline: Optional[Dict[str, Any]] = None
+    cached: bool = False
+    message: Optional[str] = None
+
+class QuotesResponse(BaseModel):
+    status: str
+    url: Optional[str] = None
+    content_type: Optional[str] = None
+    title: Optional[str] = None
+    video_id: Optional[str] = None
+    sentiment_type: Optional[str] = None
+    quotes: Optional[List[Dict]] = None
+    cached: bool = False
     message: Optional[str] = None
 
 @app.get("/", tags=["Root"])
@@ -75,7 +166,10 @@ async def root():
         "endpoints": {
             "/transcript": "Extract transcript from YouTube video URL",
             "/webpage": "Extract content from web page URL",
-            "/content": "Universal endpoint - automatically detects content type"
+            "/content": "Universal endpoint - automatically detects content type",
+            "/analyze": "Top positive and negative quotes from a URL or text",
+            "/quotes": "Top positive or negative quotes from a URL or text",
+            "/timeline": "Windowed sentiment over the course of a YouTube video"
         }
     }
 
@@ -180,57 +274,7 @@ async def get_content(request: ContentRequest):
     - **language**: Optional language code for YouTube transcripts
     - **format_text**: Whether to format transcript text (for YouTube only)
     """
-    url = str(request.url)
-    
-    # Check if it's a YouTube URL
-    video_id = TranscriptService.extract_video_id(url)
-    
-    if video_id:
-        # It's a YouTube URL
-        result = TranscriptService.get_transcript(video_id, request.language)
-        
-        if result["status"] == "error":
-            return {
-                "status": "error",
-                "url": url,
-                "content_type": "youtube",
-                "video_id": video_id,
-                "message": result["message"]
-            }
-        
-        # Format transcript if requested
-        transcript_data = result["transcript"]
-        if request.format_text:
-            text = TranscriptService.format_transcript(transcript_data)
-        else:
-            text = transcript_data
-        
-        return {
-            "status": "success",
-            "url": url,
-            "content_type": "youtube",
-            "video_id": video_id,
-            "language": result.get("language"),
-            "text": text
-        }
-    else:
-        # It's a web page URL
-        result = WebContentService.extract_content(url)
-        
-        if result["status"] == "error":
-            return {
-                "status": "error",
-                "url": url,
-                "content_type": "webpage",
-                "message": result["message"]
-            }
-        
-        return {
-            "status": "success",
-            "url": url,
-            "content_type": "webpage",
-            **{k: v for k, v in result.items() if k != "status"}
-        }
+    return ContentService.get_content(str(request.url), request.language, request.format_text)
 
 @app.get("/content", response_model=ContentResponse, tags=["Universal"])
 async def get_content_get(
@@ -248,3 +292,189 @@ async def get_content_get(
     # Create a request object and reuse the POST endpoint logic
     request = ContentRequest(url=url, language=language, format_text=format_text)
     return await get_content(request)
+
+
+async def get_analysis_source(request: AnalysisRequest) -> Tuple[Dict, Optional[Source]]:
+    """
+    Resolve the text to analyze for an analysis request
+    
+    YouTube transcripts are analyzed from their raw segments, so quotes keep
+    their start times instead of being parsed back out of rendered text.
+    
+    Returns:
+        Tuple of (source fields for the response, text, segments or None on error)
+    """
+    if request.text is not None:
+        return {"status": "success"}, request.text
+    if request.url is None:
+        raise HTTPException(status_code=400, detail="Either url or text is required")
+    
+    # The analyses never read the summary or keywords, so skip summarizing
+    content = ContentService.get_content(str(request.url), request.language, format_text=False, enrich=False)
+    source = {
+        "status": content["status"],
+        "url": content["url"],
+        "content_type": content["content_type"],
+        "title": content.get("title"),
+        "video_id": content.get("video_id"),
+    }
+    if content["status"] == "error":
+        source["message"] = content["message"]
+        return source, None
+    if content["content_type"] == "youtube":
+        return source, compact_segments(content["text"])
+    return source, content.get("text") or ""
+
+@app.post("/analyze", response_model=AnalysisResponse, tags=["Analysis"])
+async def analyze(request: AnalysisRequest):
+    """
+    Top positive and negative quotes from a URL or text
+    
+    - **url**: URL (YouTube video or web page) to fetch and analyze
+    - **text**: Text to analyze instead of a URL
+    - **language**: Optional language code for YouTube transcripts
+    - **top_n**: Number of quotes of each polarity (default: 5)
+    """
+    source, text = await get_analysis_source(request)
+    if text is None:
+        return source
+    
+    result, cached = await AnalysisService.analyze(text, request.top_n, source.get("video_id"))
+    return {**source, **result, "cached": cached}
+
+@app.get("/analyze", response_model=AnalysisResponse, tags=["Analysis"])
+async def analyze_get(
+    url: str = Query(..., description="URL (YouTube video or web page)"),
+    language: Optional[str] = Query(None, description="Language code for YouTube transcripts"),
+    top_n: int = Query(5, ge=1, le=100, description="Number of quotes of each polarity")
+):
+    """
+    Top positive and negative quotes from a URL (GET method)
+    
+    - **url**: URL (YouTube video or web page)
+    - **language**: Optional language code for YouTube transcripts
+    - **top_n**: Number of quotes of each polarity (default: 5)
+    """
+    request = AnalysisRequest(url=url, language=language, top_n=top_n)
+    return await analyze(request)
+
+@app.post("/quotes", response_model=QuotesResponse, tags=["Analysis"])
+async def get_quotes(request: QuotesRequest):
+    """
+    Top positive or negative quotes from a URL or text
+    
+    - **url**: URL (YouTube video or web page) to fetch and analyze
+    - **text**: Text to analyze instead of a URL
+    - **language**: Optional language code for YouTube transcripts
+    - **top_n**: Number of quotes to return (default: 5)
+    - **sentiment_type**: 'positive' or 'negative' (default: positive)
+    """
+    source, text = await get_analysis_source(request)
+    if text is None:
+        return source
+    
+    quotes, cached = await AnalysisService.top_quotes(text, request.top_n, request.sentiment_type,
+                                                      source.get("video_id"))
+    return {**source, "sentiment_type": request.sentiment_type, "quotes": quotes, "cached": cached}
+
+@app.get("/quotes", response_model=QuotesResponse, tags=["Analysis"])
+async def get_quotes_get(
+    url: str = Query(..., description="URL (YouTube video or web page)"),
+    language: Optional[str] = Query(None, description="Language code for YouTube transcripts"),
+    top_n: int = Query(5, ge=1, le=100, description="Number of quotes to return"),
+    sentiment_type: Literal['positive', 'negative'] = Query('positive', description="'positive' or 'negative'")
+):
+    """
+    Top positive or negative quotes from a URL (GET method)
+    
+    - **url**: URL (YouTube video or web page)
+    - **language**: Optional language code for YouTube transcripts
+    - **top_n**: Number of quotes to return (default: 5)
+    - **sentiment_type**: 'positive' or 'negative' (default: positive)
+    """
+    request = QuotesRequest(url=url, language=language, top_n=top_n, sentiment_type=sentiment_type)
+    return await get_quotes(request)
+
+@app.post("/timeline", response_model=TimelineResponse, tags=["Analysis"])
+async def get_timeline(request: TimelineRequest):
+    """
+    Sentiment over the course of a YouTube video
+    
+    The timeline is returned as parallel arrays: window "start" (seconds), sentence
+    "count", and "mean", "min" and "max" compound scores (null for empty windows).
+    
+    - **url**: YouTube video URL
+    - **language**: Optional language code for YouTube transcripts
+    - **window_seconds**: Width of each window in seconds (default: 60)
+    - **step_seconds**: Distance between window starts (default: window_seconds)
+    """
+    source, segments = await get_analysis_source(AnalysisRequest(url=request.url, language=request.language))
+    if segments is None:
+        return source
+    if source["content_type"] != "youtube":
+        return {**source, "status": "error", "message": "A sentiment timeline needs a YouTube transcript"}
+    
+    timeline, cached = await AnalysisService.timeline(segments, request.window_seconds, request.step_seconds)
+    return {**source, "timeline": timeline, "cached": cached}
+
+@app.get("/timeline", response_model=TimelineResponse, tags=["Analysis"])
+async def get_timeline_get(
+    url: str = Query(..., description="YouTube video URL"),
+    language: Optional[str] = Query(None, description="Language code for YouTube transcripts"),
+    window_seconds: float = Query(60.0, ge=1, description="Width of each window in seconds"),
+    step_seconds: Optional[float] = Query(None, ge=1, description="Distance between window starts")
+):
+    """
+    Sentiment over the course of a YouTube video (GET method)
+    
+    - **url**: YouTube video URL
+    - **language**: Optional language code for YouTube transcripts
+    - **window_seconds**: Width of each window in seconds (default: 60)
+    - **step_seconds**: Distance between window starts (default: window_seconds)
+    """
+    request = TimelineRequest(url=url, language=language, window_seconds=window_seconds, step_seconds=step_seconds)
+    return await get_timeline(request)
+
+def require_profiling_token(token: Optional[str]) -> None:
+    """Hide the profiling endpoints unless profiling is enabled and the token matches"""
+    if not ProfilingConfig.enabled():
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not ProfilingConfig.authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@app.get("/debug/profiles", tags=["Debug"])
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """
+    List stored request profiles, newest first (requires X-Profile-Token)
+    """
+    require_profiling_token(x_profile_token)
+    return {"profiles": profile_store.list()}
+
+@app.get("/debug/profiles/{profile_id}", tags=["Debug"])
+async def download_profile(
+    profile_id: str,
+    format: Optional[Literal['pstats', 'text', 'collapsed']] = Query(None, description="Download format (default: as captured)"),
+    x_profile_token: Optional[str] = Header(None)
+):
+    """
+    Download a stored request profile (requires X-Profile-Token)
+    
+    - **pstats**: binary file for `python -m pstats`, snakeviz and similar tools (cProfile mode)
+    - **text**: pstats report sorted by cumulative time (cProfile mode)
+    - **collapsed**: collapsed stacks for flamegraph.pl or speedscope (sample mode)
+    """
+    require_profiling_token(x_profile_token)
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    requested = format or profile["format"]
+    if profile["format"] == "pstats" and requested == "pstats":
+        return Response(profile["data"], media_type="application/octet-stream",
+                        headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'})
+    if profile["format"] == "pstats" and requested == "text":
+        return Response(pstats_text(profile["data"]), media_type="text/plain")
+    if profile["format"] == "collapsed" and requested == "collapsed":
+        return Response(profile["data"], media_type="text/plain",
+                        headers={"Content-Disposition": f'attachment; filename="{profile_id}.collapsed"'})
+    raise HTTPException(status_code=400, detail=f"Profile was captured as {profile['format']}")
@@ -0,0 +1,159 @@
+"""
+Content Fingerprinting
+Near-duplicate detection for extracted text using SimHash and a banded LSH index
+"""
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+FINGERPRINT_BITS = 64
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _shingles(text: str, size: int = 3) -> Iterator[str]:
+    """Yield overlapping word shingles of the lowercased text"""
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        if words:
+            yield " ".join(words)
+        return
+    yield from map(" ".join, zip(*(words[i:] for i in range(size))))
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint of a text
+
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of words per shingle
+
+    Returns:
+        int: 64-bit fingerprint (0 for empty text)
+    """
+    # Repeated shingles are counted first so each distinct one is hashed once
+    weights = Counter(_shingles(text, shingle_size))
+    if not weights:
+        return 0
+
+    digests = b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in weights)
+    # One row of 64 bits per distinct feature, least significant bit first
+    features = np.frombuffer(digests, dtype=">u8").astype("<u8")
+    bits = np.unpackbits(features.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    counts = np.fromiter(weights.values(), dtype=np.int64, count=len(weights))
+    # Each feature adds its count to the bits it sets and subtracts it from the others
+    totals = 2 * (counts @ bits) - counts.sum()
+    return int(np.packbits(totals > 0, bitorder="little").view("<u8")[0])
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    Bounded LSH index of recent SimHash fingerprints
+
+    Fingerprints are split into ``bands`` equal bit ranges and each band value is
+    used as a bucket key. Two fingerprints within ``max_distance`` bits of each
+    other always share at least one band when ``max_distance < bands``, so a
+    lookup only inspects the handful of entries in the matching buckets. The
+    index keeps at most ``max_entries`` keys and evicts the least recently added.
+    """
+
+    def __init__(self, max_entries: int = 10000, bands: int = 4, max_distance: int = 3):
+        if FINGERPRINT_BITS % bands != 0:
+            raise ValueError("bands must evenly divide the fingerprint size")
+        if max_distance >= bands:
+            raise ValueError("max_distance must be smaller than the number of bands")
+        self.max_entries = max_entries
+        self.bands = bands
+        self.max_distance = max_distance
+        self._band_bits = FINGERPRINT_BITS // bands
+        self._band_mask = (1 << self._band_bits) - 1
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """Bucket keys for each band of a fingerprint"""
+        return [
+            (band, fingerprint >> (band * self._band_bits) & self._band_mask)
+            for band in range(self.bands)
+        ]
+
+    def _find(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[str]:
+        best_key = None
+        best_distance = self.max_distance + 1
+        for band_key in self._band_keys(fingerprint):
+            for key in self._buckets.get(band_key, ()):
+                if key == exclude:
+                    continue
+                distance = hamming_distance(fingerprint, self._entries[key])
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+        return best_key
+
+    def _remove(self, key: str) -> None:
+        fingerprint = self._entries.pop(key)
+        for band_key in self._band_keys(fingerprint):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """
+        Look up the closest indexed key for a fingerprint
+
+        Args:
+            fingerprint: SimHash fingerprint
+
+        Returns:
+            str: Key of the nearest duplicate, None if there is none
+        """
+        with self._lock:
+            return self._find(fingerprint)
+
+    def add(self, key: str, fingerprint: int) -> Optional[str]:
+        """
+        Index a fingerprint and report which earlier key it duplicates
+
+        Args:
+            key: Identifier of the content (usually its URL)
+            fingerprint: SimHash fingerprint
+
+        Returns:
+            str: Key of the original content if this is a near-duplicate, None otherwise
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            duplicate_of = self._find(fingerprint, exclude=key)
+            if duplicate_of is not None:
+                # Keep pointing at the original rather than indexing copies
+                return duplicate_of
+
+            self._entries[key] = fingerprint
+            for band_key in self._band_keys(fingerprint):
+                self._buckets.setdefault(band_key, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+            return duplicate_of
+
+    def clear(self) -> None:
+        """Remove all fingerprints from the index"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
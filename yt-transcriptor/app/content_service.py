@@ -0,0 +1,96 @@
+"""
+Content Service
+Universal content extraction shared by the /content endpoint and the clients' local mode
+"""
+from typing import Dict, Optional
+
+from app.summary_service import SummaryService
+from app.transcript_service import TranscriptService
+from app.web_content_service import WebContentService
+
+
+# Fields of the /content response, in order (ContentResponse in app.api)
+RESPONSE_FIELDS = ("status", "url", "content_type", "title", "text", "video_id", "language", "summary",
+                   "keywords", "authors", "publish_date", "top_image", "method", "fingerprint",
+                   "duplicate_of", "message")
+
+
+class ContentService:
+    """Service for extracting content from any URL (YouTube video or web page)"""
+
+    @staticmethod
+    def as_response(data: Dict) -> Dict:
+        """Shape a get_content result like the /content JSON response, with every field present"""
+        return {field: data.get(field) for field in RESPONSE_FIELDS}
+
+    @staticmethod
+    def get_content(url: str, language: Optional[str] = None, format_text: bool = True,
+                    enrich: bool = True) -> Dict:
+        """
+        Detect the content type of a URL and extract accordingly
+
+        Args:
+            url: URL (YouTube video or web page)
+            language: Optional language code for YouTube transcripts
+            format_text: Whether to format transcript text (for YouTube only)
+            enrich: Whether to add a summary and keywords to YouTube transcripts
+
+        Returns:
+            Dict: The /content response, with "status" "success" or "error"
+        """
+        # Check if it's a YouTube URL
+        video_id = TranscriptService.extract_video_id(url)
+
+        if video_id:
+            # It's a YouTube URL
+            result = TranscriptService.get_transcript(video_id, language)
+
+            if result["status"] == "error":
+                return {
+                    "status": "error",
+                    "url": url,
+                    "content_type": "youtube",
+                    "video_id": video_id,
+                    "message": result["message"]
+                }
+
+            # Format transcript if requested
+            transcript_data = result["transcript"]
+            if format_text:
+                text = TranscriptService.format_transcript(transcript_data)
+            else:
+                text = transcript_data
+
+            response = {
+                "status": "success",
+                "url": url,
+                "content_type": "youtube",
+                "video_id": video_id,
+                "language": result.get("language"),
+                "text": text
+            }
+
+            if not enrich:
+                return response
+
+            # Summarize the spoken text without timestamps
+            plain_text = " ".join(item.get("text", "") for item in transcript_data)
+            return SummaryService.enrich(response, text=plain_text)
+        else:
+            # It's a web page URL
+            result = WebContentService.extract_content(url)
+
+            if result["status"] == "error":
+                return {
+                    "status": "error",
+                    "url": url,
+                    "content_type": "webpage",
+                    "message": result["message"]
+                }
+
+            return {
+                "status": "success",
+                "url": url,
+                "content_type": "webpage",
+                **{k: v for k, v in result.items() if k != "status"}
+            }
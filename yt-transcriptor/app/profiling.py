@@ -0,0 +1,286 @@
+"""
+On-demand Request Profiling
+Opt-in, token-guarded profiling of API requests with a bounded in-memory store
+"""
+import asyncio
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+PROFILE_HEADER = "X-Profile"
+TOKEN_HEADER = "X-Profile-Token"
+
+# The profiler of the request whose code is running; tasks the request starts inherit it
+_request_profiler: ContextVar[Optional["RequestProfiler"]] = ContextVar("request_profiler", default=None)
+
+
+class ProfilingConfig:
+    """Profiling settings read from environment variables"""
+
+    @staticmethod
+    def token() -> Optional[str]:
+        """Shared secret required for profiling (PROFILING_TOKEN); profiling is off without it"""
+        return os.getenv("PROFILING_TOKEN") or None
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether profiling is switched on (PROFILING_ENABLED) and guarded by a token"""
+        return os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes") \
+            and ProfilingConfig.token() is not None
+
+    @staticmethod
+    def sample_rate() -> float:
+        """Fraction of all requests to profile (PROFILING_SAMPLE_RATE, default 0)"""
+        return float(os.getenv("PROFILING_SAMPLE_RATE", 0.0))
+
+    @staticmethod
+    def mode() -> str:
+        """'cprofile' for deterministic pstats or 'sample' for collapsed stacks (PROFILING_MODE)"""
+        return os.getenv("PROFILING_MODE", "cprofile")
+
+    @staticmethod
+    def sample_interval() -> float:
+        """Seconds between stack samples in 'sample' mode (PROFILING_SAMPLE_INTERVAL_MS, default 5)"""
+        return float(os.getenv("PROFILING_SAMPLE_INTERVAL_MS", 5)) / 1000.0
+
+    @staticmethod
+    def buffer_size() -> int:
+        """Number of profiles kept in memory (PROFILING_BUFFER_SIZE, default 20)"""
+        return int(os.getenv("PROFILING_BUFFER_SIZE", 20))
+
+    @staticmethod
+    def authorized(token: Optional[str]) -> bool:
+        """Check a client-supplied token in constant time"""
+        expected = ProfilingConfig.token()
+        return expected is not None and token is not None and hmac.compare_digest(token, expected)
+
+
+class StackSampler:
+    """Samples the call stack of one thread from a background thread"""
+
+    def __init__(self, thread_id: int, interval: float, include: Optional[Callable[[], bool]] = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.include = include
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if self.include is not None and not self.include():
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format used by flamegraph.pl and speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    """Make tasks started by a profiled request part of that request's profile"""
+    previous = loop.get_task_factory()
+    if getattr(previous, "request_profiling", False):
+        return
+
+    def factory(loop, coro, **kwargs):
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        profiler = context.get(_request_profiler) if context is not None else _request_profiler.get()
+        if profiler is not None:
+            profiler.tasks.add(task)
+        return task
+
+    factory.request_profiling = True
+    loop.set_task_factory(factory)
+
+
+class RequestProfiler:
+    """
+    Profiles one request with cProfile or the stack sampler
+
+    Profiling runs on the event loop thread, which keeps serving other requests
+    while this one awaits. Only this request's code is charged: cProfile runs on
+    a clock that stands still while other requests' code runs, and their
+    functions are dropped from the stats; the sampler only records stacks while
+    one of this request's tasks is running. Work the request hands to other
+    threads or processes is not captured.
+    """
+
+    # cProfile allows a single active profiler, so only one request is profiled at a time
+    _active = threading.Lock()
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._token = None
+        self._clock = 0.0
+        self._last = 0.0
+        self.tasks: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+        self.started = 0.0
+        self.duration = 0.0
+
+    @classmethod
+    def try_start(cls, mode: str) -> Optional["RequestProfiler"]:
+        """Start profiling the calling task unless another request is already being profiled"""
+        if not cls._active.acquire(blocking=False):
+            return None
+        profiler = cls(mode)
+        profiler.started = time.perf_counter()
+        profiler._token = _request_profiler.set(profiler)
+        if mode == "sample":
+            loop = asyncio.get_running_loop()
+            _install_task_factory(loop)
+            profiler.tasks.add(asyncio.current_task())
+            profiler._sampler = StackSampler(threading.get_ident(), ProfilingConfig.sample_interval(),
+                                             include=lambda: asyncio.current_task(loop) in profiler.tasks)
+            profiler._sampler.start()
+        else:
+            profiler._last = time.perf_counter()
+            profiler._profile = cProfile.Profile(profiler._request_clock)
+            profiler._profile.enable()
+        return profiler
+
+    def _request_clock(self) -> float:
+        """A perf_counter that only advances while this request's code runs"""
+        now = time.perf_counter()
+        if _request_profiler.get() is self:
+            self._clock += now - self._last
+        self._last = now
+        return self._clock
+
+    def _request_stats(self) -> Dict:
+        """pstats data without the functions that only ran for other requests"""
+        stats = pstats.Stats(self._profile).stats
+        kept = {func for func, (_, _, _, cumulative, _) in stats.items() if cumulative > 0}
+        return {
+            func: (cc, nc, tt, ct, {caller: timing for caller, timing in callers.items() if caller in kept})
+            for func, (cc, nc, tt, ct, callers) in stats.items() if func in kept
+        }
+
+    def stop(self) -> Dict:
+        """Stop profiling and return the captured data"""
+        try:
+            if self._sampler is not None:
+                self._sampler.stop()
+                data = {"format": "collapsed", "data": self._sampler.collapsed().encode("utf-8")}
+            else:
+                self._profile.disable()
+                data = {"format": "pstats", "data": marshal.dumps(self._request_stats())}
+            self.duration = time.perf_counter() - self.started
+            return data
+        finally:
+            _request_profiler.reset(self._token)
+            RequestProfiler._active.release()
+
+
+class ProfileStore:
+    """Ring buffer of recent request profiles"""
+
+    def __init__(self, size: int = 20):
+        self._profiles: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def resize(self, size: int) -> None:
+        """Change the capacity, keeping the most recent profiles"""
+        with self._lock:
+            if size != self._profiles.maxlen:
+                self._profiles = deque(self._profiles, maxlen=size)
+
+    def add(self, method: str, path: str, status_code: int, profiler: RequestProfiler, captured: Dict) -> str:
+        """
+        Store a finished profile
+
+        Returns:
+            str: Profile ID
+        """
+        profile_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._profiles.append({
+                "id": profile_id,
+                "method": method,
+                "path": path,
+                "status_code": status_code,
+                "duration_ms": round(profiler.duration * 1000, 3),
+                "created": datetime.now(timezone.utc).isoformat(),
+                "format": captured["format"],
+                "data": captured["data"],
+            })
+        return profile_id
+
+    def list(self) -> List[Dict]:
+        """Metadata of stored profiles, newest first"""
+        with self._lock:
+            return [{k: v for k, v in p.items() if k != "data"} for p in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Look up a stored profile by ID"""
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+
+    def clear(self) -> None:
+        """Remove all stored profiles"""
+        with self._lock:
+            self._profiles.clear()
+
+
+def should_profile(profile_header: Optional[str], token: Optional[str]) -> bool:
+    """
+    Decide whether to profile a request
+
+    A request is profiled when it carries the debug header with a valid token, or
+    when it falls in the configured sample fraction.
+    """
+    if not ProfilingConfig.enabled():
+        return False
+    if profile_header and ProfilingConfig.authorized(token):
+        return True
+    rate = ProfilingConfig.sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+def pstats_text(data: bytes, limit: int = 50) -> str:
+    """Render marshalled pstats data as a report sorted by cumulative time"""
+    stats = pstats.Stats()
+    stats.stats = marshal.loads(data)
+    stats.get_top_level_stats()
+    stats.stream = io.StringIO()
+    stats.sort_stats("cumulative").print_stats(limit)
+    return stats.stream.getvalue()
+
+
+profile_store = ProfileStore(ProfilingConfig.buffer_size())
@@ -0,0 +1,235 @@
+"""
+Summary Service
+Fast keyword extraction and extractive summaries for any extracted text
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_TIMESTAMP = re.compile(r'\[\d+:\d+(?::\d+)?\]')
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z'\-]*|\d+|[.,;:!?()\"]")
+_WORD = re.compile(r"[a-z][a-z'\-]*")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't did didn't do does doesn't doing
+don't down during each even few for from further get gets got had hadn't has hasn't have haven't
+having he he'd he'll he's her here here's hers herself him himself his how how's however i i'd i'll
+i'm i've if in into is isn't it it's its itself just know let's like lot me more most much must
+mustn't my myself no nor not now of off on once one only or other ought our ours ourselves out over
+own really right said same say says shan't she she'd she'll she's should shouldn't so some such than
+that that's the their theirs them themselves then there there's these they they'd they'll they're
+they've thing things think this those through to too um uh under until up upon us very want was
+wasn't way we we'd we'll we're we've well were weren't what what's when when's where where's which
+while who who's whom why why's will with won't would wouldn't yeah yes you you'd you'll you're
+you've your yours yourself yourselves going gonna just actually okay oh
+""".split())
+
+# Sentences longer than this many words (typical of unpunctuated auto-captions)
+# are cut into windows so TextRank still has units to choose from
+MAX_SENTENCE_WORDS = 40
+
+
+class SummaryService:
+    """Service for extracting keywords and extractive summaries from text"""
+
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        """
+        Split text into sentences, windowing very long unpunctuated runs
+
+        Args:
+            text: Plain text or formatted transcript
+
+        Returns:
+            List of sentences
+        """
+        text = _TIMESTAMP.sub(' ', text)
+        sentences = []
+        for raw in _SENTENCE_BOUNDARY.split(text):
+            words = raw.split()
+            if not words:
+                continue
+            for start in range(0, len(words), MAX_SENTENCE_WORDS):
+                sentences.append(' '.join(words[start:start + MAX_SENTENCE_WORDS]))
+        return sentences
+
+    @staticmethod
+    def extract_keywords(text: str, top_n: int = 10) -> List[str]:
+        """
+        Extract keywords and key phrases using RAKE scoring
+
+        Candidate phrases are runs of up to three content words between stopwords
+        and punctuation. Each word scores degree / frequency, and a phrase scores
+        the sum of its words.
+
+        Args:
+            text: Text to extract keywords from
+            top_n: Maximum number of keywords to return
+
+        Returns:
+            List of keywords, best first
+        """
+        text = _TIMESTAMP.sub(' ', text)
+        phrases = []
+        current = []
+        for token in _TOKEN.findall(text.lower()):
+            if not _WORD.fullmatch(token) or token in STOPWORDS or len(token) < 3:
+                if current:
+                    phrases.append(current)
+                    current = []
+            else:
+                current.append(token)
+        if current:
+            phrases.append(current)
+        # Runs longer than three words are rarely meaningful phrases; score their words individually
+        phrases = [phrase for run in phrases
+                   for phrase in ([run] if len(run) <= 3 else [[word] for word in run])]
+        if not phrases:
+            return []
+
+        vocabulary: Dict[str, int] = {}
+        word_ids = []
+        phrase_ids = []
+        phrase_lengths = []
+        for index, phrase in enumerate(phrases):
+            for word in phrase:
+                word_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+                phrase_ids.append(index)
+            phrase_lengths.append(len(phrase))
+
+        word_ids = np.asarray(word_ids, dtype=np.int64)
+        phrase_ids = np.asarray(phrase_ids, dtype=np.int64)
+        lengths = np.asarray(phrase_lengths, dtype=np.float64)
+
+        frequency = np.bincount(word_ids, minlength=len(vocabulary)).astype(np.float64)
+        degree = np.bincount(word_ids, weights=lengths[phrase_ids], minlength=len(vocabulary))
+        word_scores = degree / frequency
+        phrase_scores = np.bincount(phrase_ids, weights=word_scores[word_ids], minlength=len(phrases))
+
+        keywords = []
+        seen = set()
+        for index in np.argsort(-phrase_scores, kind='stable'):
+            phrase = ' '.join(phrases[index])
+            if phrase not in seen:
+                seen.add(phrase)
+                keywords.append(phrase)
+                if len(keywords) == top_n:
+                    break
+        return keywords
+
+    @staticmethod
+    def sentence_term_matrix(sentences: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the L2-normalized TF-IDF sentence-term matrix in coordinate form
+
+        Only terms that occur in two or more sentences are kept, since the others
+        never contribute to the similarity between different sentences.
+
+        Args:
+            sentences: List of sentences
+
+        Returns:
+            Tuple of (rows, cols, values) arrays describing the non-zero entries
+        """
+        n = len(sentences)
+        vocabulary: Dict[str, int] = {}
+        rows = []
+        cols = []
+        for row, sentence in enumerate(sentences):
+            for word in _WORD.findall(sentence.lower()):
+                if word not in STOPWORDS:
+                    rows.append(row)
+                    cols.append(vocabulary.setdefault(word, len(vocabulary)))
+        if not rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float64)
+
+        # Collapse repeated (sentence, term) pairs into term frequencies
+        vocab_size = len(vocabulary)
+        keys, tf = np.unique(np.asarray(rows, dtype=np.int64) * vocab_size + np.asarray(cols, dtype=np.int64),
+                             return_counts=True)
+        rows = keys // vocab_size
+        cols = keys % vocab_size
+
+        df = np.bincount(cols, minlength=vocab_size)
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+        values = tf * idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n))
+        values = values / norms[rows]
+
+        shared = df[cols] >= 2
+        return rows[shared], cols[shared], values[shared]
+
+    @staticmethod
+    def summarize(text: str, max_sentences: int = 5, damping: float = 0.85,
+                  iterations: int = 50, tolerance: float = 1e-6) -> str:
+        """
+        Build an extractive summary by ranking sentences with TextRank
+
+        Sentence similarity is the cosine of TF-IDF vectors. The similarity matrix
+        S = M M^T is never materialized: each power iteration computes S x as
+        M (M^T x) on the sparse sentence-term matrix M, so memory stays linear in
+        the text length.
+
+        Args:
+            text: Text to summarize
+            max_sentences: Maximum number of sentences in the summary
+            damping: PageRank damping factor
+            iterations: Maximum number of power iterations
+            tolerance: Convergence threshold on the score vector
+
+        Returns:
+            str: Selected sentences in document order, one per line
+        """
+        sentences = SummaryService.split_sentences(text)
+        n = len(sentences)
+        if n <= max_sentences:
+            return '\n'.join(sentences)
+
+        rows, cols, values = SummaryService.sentence_term_matrix(sentences)
+        num_terms = int(cols.max()) + 1 if cols.size else 0
+        self_similarity = np.bincount(rows, weights=values * values, minlength=n)
+
+        def similarity_dot(x: np.ndarray) -> np.ndarray:
+            term_totals = np.bincount(cols, weights=values * x[rows], minlength=num_terms)
+            return np.bincount(rows, weights=values * term_totals[cols], minlength=n) - self_similarity * x
+
+        out_weight = similarity_dot(np.ones(n))
+        out_weight[out_weight <= 0] = 1.0
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(iterations):
+            updated = (1.0 - damping) / n + damping * similarity_dot(scores / out_weight)
+            converged = np.abs(updated - scores).sum() < tolerance
+            scores = updated
+            if converged:
+                break
+
+        chosen = np.sort(np.argsort(-scores, kind='stable')[:max_sentences])
+        return '\n'.join(sentences[i] for i in chosen)
+
+    @staticmethod
+    def enrich(result: Dict, text: Optional[str] = None, max_sentences: int = 5, top_n: int = 10) -> Dict:
+        """
+        Fill in missing summary and keywords on an extraction result
+
+        Args:
+            result: Extraction result
+            text: Text to analyze (default: result["text"])
+            max_sentences: Maximum number of summary sentences
+            top_n: Maximum number of keywords
+
+        Returns:
+            Dict: The result with "summary" and "keywords" set
+        """
+        text = text if text is not None else result.get("text")
+        if not text:
+            return result
+        if not result.get("summary"):
+            result["summary"] = SummaryService.summarize(text, max_sentences)
+        if not result.get("keywords"):
+            result["keywords"] = SummaryService.extract_keywords(text, top_n)
+        return result
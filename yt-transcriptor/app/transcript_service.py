@@ -3,7 +3,7 @@ YouTube Transcript Service
 Handles the extraction of transcripts from YouTube videos
 """
 import re
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 
@@ -103,8 +103,19 @@ class TranscriptService:
         Returns:
             str: Formatted transcript text
         """
-        formatted_text = ""
+        return "".join(TranscriptService.iter_format_transcript(transcript_data))
+    
+    @staticmethod
+    def iter_format_transcript(transcript_data: Iterable[Dict]) -> Iterator[str]:
+        """
+        Format transcript data one "[MM:SS] text" line at a time, for streaming output
         
+        Args:
+            transcript_data: Transcript segments
+            
+        Yields:
+            str: Formatted line, ending with a newline
+        """
         for item in transcript_data:
             text = item.get('text', '')
             start_time = item.get('start', 0)
@@ -114,6 +125,4 @@ class TranscriptService:
             seconds = int(start_time % 60)
             timestamp = f"[{minutes:02d}:{seconds:02d}]"
             
-            formatted_text += f"{timestamp} {text}\n"
-        
-        return formatted_text
+            yield f"{timestamp} {text}\n"
@@ -10,10 +10,16 @@ from newspaper import Article
 import trafilatura
 from urllib.parse import urlparse
 
+from app.content_fingerprint import SimHashIndex, simhash
+from app.summary_service import SummaryService
+
 
 class WebContentService:
     """Service for extracting and processing text content from web pages"""
     
+    # Fingerprints of recently extracted pages, used to flag syndicated copies
+    fingerprint_index = SimHashIndex()
+    
     @staticmethod
     def is_valid_url(url: str) -> bool:
         """
@@ -72,6 +78,46 @@ class WebContentService:
         except Exception:
             return None
     
+    @staticmethod
+    def register_fingerprint(url: str, result: Dict) -> Dict:
+        """
+        Fingerprint an extraction result and record it in the duplicate index
+        
+        Args:
+            url: URL the content was extracted from
+            result: Successful extraction result
+            
+        Returns:
+            Dict: The result with "fingerprint" and "duplicate_of" added
+        """
+        text = result.get("text")
+        if not text:
+            return result
+        
+        fingerprint = simhash(text)
+        result["fingerprint"] = f"{fingerprint:016x}"
+        result["duplicate_of"] = WebContentService.fingerprint_index.add(url, fingerprint)
+        return result
+    
+    @staticmethod
+    def finalize_result(url: str, result: Dict) -> Dict:
+        """
+        Fingerprint a successful result and enrich it with summary and keywords
+        
+        Enrichment is skipped for near-duplicates of pages already extracted.
+        
+        Args:
+            url: URL the content was extracted from
+            result: Successful extraction result
+            
+        Returns:
+            Dict: The finalized result
+        """
+        WebContentService.register_fingerprint(url, result)
+        if result.get("duplicate_of") is None:
+            SummaryService.enrich(result)
+        return result
+    
     @staticmethod
     def extract_with_newspaper(url: str) -> Dict:
         """
@@ -87,14 +133,11 @@ class WebContentService:
             article = Article(url)
             article.download()
             article.parse()
-            article.nlp()  # Run NLP to extract keywords and summary
             
             return {
                 "status": "success",
                 "title": article.title,
                 "text": article.text,
-                "summary": article.summary,
-                "keywords": article.keywords,
                 "authors": article.authors,
                 "publish_date": article.publish_date.isoformat() if article.publish_date else None,
                 "top_image": article.top_image,
@@ -227,22 +270,22 @@ class WebContentService:
         # Try with trafilatura first (usually best for articles)
         trafilatura_result = WebContentService.extract_with_trafilatura(url)
         if trafilatura_result["status"] == "success" and trafilatura_result.get("text") and len(trafilatura_result["text"]) > 200:
-            return trafilatura_result
+            return WebContentService.finalize_result(url, trafilatura_result)
             
         # Try with newspaper3k next
         newspaper_result = WebContentService.extract_with_newspaper(url)
         if newspaper_result["status"] == "success" and newspaper_result.get("text") and len(newspaper_result["text"]) > 200:
-            return newspaper_result
+            return WebContentService.finalize_result(url, newspaper_result)
             
         # Fall back to BeautifulSoup
         bs_result = WebContentService.extract_with_beautifulsoup(url)
         if bs_result["status"] == "success" and bs_result.get("text"):
-            return bs_result
+            return WebContentService.finalize_result(url, bs_result)
             
         # If all methods failed, return the best result we have
         for result in [trafilatura_result, newspaper_result, bs_result]:
             if result["status"] == "success" and result.get("text"):
-                return result
+                return WebContentService.finalize_result(url, result)
                 
         # If everything failed, return error
         return {
@@ -0,0 +1,332 @@
+"""
+Batch VADER scoring for large numbers of sentences
+
+BatchSentimentScorer reproduces SentimentIntensityAnalyzer.polarity_scores, rule
+for rule, but tokenizes a whole batch of sentences at once and evaluates the
+lexicon, booster, capitalization, negation, "least", idiom and "but" rules as
+NumPy array operations over every token in the batch.
+"""
+import string
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from nltk.sentiment.vader import VaderConstants
+
+_PUNCTUATION = string.punctuation
+_PUNCTUATION_SET = frozenset(_PUNCTUATION)
+
+
+def normalize_token(token: str, punc_list: frozenset) -> str:
+    """
+    Strip leading or trailing punctuation from a token the way VADER's SentiText does
+
+    A token keeps its punctuation unless it is a word of two or more characters
+    with a single PUNC_LIST entry (e.g. "!", "??", "?!?") glued to one side only.
+
+    Returns:
+        str: Normalized token, or "" for tokens VADER drops (one character or less)
+    """
+    if len(token) <= 1:
+        return ""
+    core = token.strip(_PUNCTUATION)
+    if core == token or len(core) <= 1 or any(c in _PUNCTUATION_SET for c in core):
+        return token
+    lead = len(token) - len(token.lstrip(_PUNCTUATION))
+    trail = len(token) - len(token.rstrip(_PUNCTUATION))
+    if lead and not trail and token[:lead] in punc_list:
+        return core
+    if trail and not lead and token[-trail:] in punc_list:
+        return core
+    return token
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """Round with Python's round(), which np.round does not match on every halfway case"""
+    return np.array([round(value, digits) for value in values.tolist()], dtype=np.float64)
+
+
+def _back(values: np.ndarray, k: int, fill=0) -> np.ndarray:
+    """values[t - k] at every position t, padded with fill"""
+    shifted = np.full_like(values, fill)
+    shifted[k:] = values[:-k]
+    return shifted
+
+
+def _ahead(values: np.ndarray, k: int, fill=0) -> np.ndarray:
+    """values[t + k] at every position t, padded with fill"""
+    shifted = np.full_like(values, fill)
+    shifted[:-k] = values[k:]
+    return shifted
+
+
+class BatchSentimentScorer:
+    """
+    Vectorized, VADER-compatible polarity scores for batches of sentences
+
+    Compound scores are the same as SentimentIntensityAnalyzer.polarity_scores
+    for the same lexicon; only the order of evaluation differs.
+    """
+
+    def __init__(self, lexicon: Dict[str, float], constants: VaderConstants = None):
+        self.lexicon = lexicon
+        self.constants = constants if constants is not None else VaderConstants()
+        self.punc_list = frozenset(self.constants.PUNC_LIST)
+
+        # Idioms and multi-word boosters are matched on exact (case-sensitive) word
+        # sequences; their words get small ids so n-grams can be encoded as integers
+        phrases = list(self.constants.SPECIAL_CASE_IDIOMS) + \
+            [phrase for phrase in self.constants.BOOSTER_DICT if ' ' in phrase]
+        self._phrase_words: Dict[str, int] = {}
+        for phrase in phrases:
+            for word in phrase.split():
+                self._phrase_words.setdefault(word, len(self._phrase_words) + 1)
+        base = self._base = len(self._phrase_words) + 1
+        self._idioms2 = np.full(base ** 2, np.nan)
+        self._idioms3 = np.full(base ** 3, np.nan)
+        self._boosters2 = np.zeros(base ** 2, dtype=bool)
+        for phrase, value in self.constants.SPECIAL_CASE_IDIOMS.items():
+            code = self._encode(phrase.split())
+            (self._idioms2 if len(phrase.split()) == 2 else self._idioms3)[code] = value
+        for phrase in self.constants.BOOSTER_DICT:
+            if len(phrase.split()) == 2:
+                self._boosters2[self._encode(phrase.split())] = True
+
+    def _encode(self, words: List[str]) -> int:
+        code = 0
+        for word in words:
+            code = code * self._base + self._phrase_words[word]
+        return code
+
+    def tokenize(self, sentences: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Tokenize a batch of sentences into one flat array of token ids
+
+        Each distinct raw token is normalized once, so the per-token cost is a
+        single dictionary lookup made from C.
+
+        Args:
+            sentences: Sentences to tokenize
+
+        Returns:
+            Tuple of (token ids, sentence index of each token, vocabulary)
+        """
+        # Every step here runs in C: unseen tokens get the next id from the
+        # defaultdict's factory, which is evaluated before the key is inserted
+        raw_ids: Dict[str, int] = defaultdict()
+        raw_ids.default_factory = raw_ids.__len__
+        split = list(map(str.split, sentences))
+        lengths = np.fromiter(map(len, split), dtype=np.int64, count=len(split))
+        flat = np.fromiter(map(raw_ids.__getitem__, chain.from_iterable(split)),
+                           dtype=np.int64, count=int(lengths.sum()))
+
+        # Map raw tokens to normalized tokens; dropped tokens map to -1
+        vocabulary: List[str] = []
+        vocabulary_ids: Dict[str, int] = {}
+        raw_to_token = np.empty(len(raw_ids), dtype=np.int64)
+        for raw, raw_id in raw_ids.items():
+            token = normalize_token(raw, self.punc_list)
+            if token:
+                raw_to_token[raw_id] = vocabulary_ids.setdefault(token, len(vocabulary_ids))
+                if raw_to_token[raw_id] == len(vocabulary):
+                    vocabulary.append(token)
+            else:
+                raw_to_token[raw_id] = -1
+
+        token_ids = raw_to_token[flat]
+        sentence_ids = np.repeat(np.arange(len(sentences), dtype=np.int64), lengths)
+        kept = token_ids >= 0
+        return token_ids[kept], sentence_ids[kept], vocabulary
+
+    def _token_table(self, vocabulary: List[str]) -> Dict[str, np.ndarray]:
+        """Per-token properties used by the VADER rules, indexed by token id"""
+        lexicon = self.lexicon
+        boosters = self.constants.BOOSTER_DICT
+        negate = self.constants.NEGATE
+        lower = [token.lower() for token in vocabulary]
+        return {
+            "in_lexicon": np.array([word in lexicon for word in lower], dtype=bool),
+            "valence": np.array([lexicon.get(word, 0.0) for word in lower], dtype=np.float64),
+            "upper": np.array([token.isupper() for token in vocabulary], dtype=bool),
+            "is_booster": np.array([word in boosters for word in lower], dtype=bool),
+            "booster": np.array([boosters.get(word, 0.0) for word in lower], dtype=np.float64),
+            "negated": np.array([word in negate or "n't" in word for word in lower], dtype=bool),
+            "kind": np.array([word == "kind" for word in lower], dtype=bool),
+            "of": np.array([word == "of" for word in lower], dtype=bool),
+            "least": np.array([word == "least" for word in lower], dtype=bool),
+            "at_or_very": np.array([word in ("at", "very") for word in lower], dtype=bool),
+            "but": np.array([word == "but" for word in lower], dtype=bool),
+            "never": np.array([token == "never" for token in vocabulary], dtype=bool),
+            "so_or_this": np.array([token in ("so", "this") for token in vocabulary], dtype=bool),
+            "phrase_word": np.array([self._phrase_words.get(token, 0) for token in vocabulary], dtype=np.int64),
+        }
+
+    def token_valences(self, token_ids: np.ndarray, sentence_ids: np.ndarray,
+                       vocabulary: List[str], num_sentences: int) -> np.ndarray:
+        """
+        Compute the valence of every token, as VADER's sentiment list, in one pass
+
+        Args:
+            token_ids: Flat token ids from tokenize
+            sentence_ids: Sentence index of each token
+            vocabulary: Token strings indexed by id
+            num_sentences: Number of sentences in the batch
+
+        Returns:
+            np.ndarray: Valence per token
+        """
+        c = self.constants
+        table = self._token_table(vocabulary)
+        at = {name: values[token_ids] for name, values in table.items()}
+
+        lengths = np.bincount(sentence_ids, minlength=num_sentences)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        pos = np.arange(len(token_ids)) - starts[sentence_ids]
+        n = lengths[sentence_ids]
+
+        caps = np.bincount(sentence_ids, weights=at["upper"], minlength=num_sentences)
+        cap_diff = ((caps > 0) & (caps < lengths))[sentence_ids]
+
+        # Boosters and "kind of" carry no valence of their own
+        skipped = at["is_booster"] | (at["kind"] & _ahead(at["of"], 1, False) & (pos < n - 1))
+        active = at["in_lexicon"] & ~skipped
+
+        v = at["valence"].copy()
+        v = np.where(at["upper"] & cap_diff, np.where(v > 0, v + c.C_INCR, v - c.C_INCR), v)
+
+        for start_i, scale in ((0, 1.0), (1, 0.95), (2, 0.9)):
+            k = start_i + 1
+            applies = (pos > start_i) & ~_back(at["in_lexicon"], k, True)
+
+            # scalar_inc_dec on the preceding word, using the valence so far
+            s = _back(at["booster"], k)
+            s = np.where(v < 0, -s, s)
+            capped = _back(at["is_booster"], k, False) & _back(at["upper"], k, False) & cap_diff
+            s = np.where(capped, np.where(v > 0, s + c.C_INCR, s - c.C_INCR), s)
+            if start_i:
+                s = np.where(s != 0, s * scale, s)
+            v = np.where(applies, v + s, v)
+
+            # _never_check
+            negated = _back(at["negated"], k, False)
+            if start_i == 0:
+                v = np.where(applies & negated, v * c.N_SCALAR, v)
+            elif start_i == 1:
+                never_so = _back(at["never"], 2, False) & _back(at["so_or_this"], 1, False)
+                v = np.where(applies & never_so, v * 1.5, np.where(applies & negated, v * c.N_SCALAR, v))
+            else:
+                never_so = (_back(at["never"], 3, False) & _back(at["so_or_this"], 2, False)) | \
+                    _back(at["so_or_this"], 1, False)
+                v = np.where(applies & never_so, v * 1.25, np.where(applies & negated, v * c.N_SCALAR, v))
+                v = self._idioms_check(v, applies, at["phrase_word"], pos, n)
+
+        # _least_check
+        least = (pos > 0) & ~_back(at["in_lexicon"], 1, True) & _back(at["least"], 1, False)
+        v = np.where(least & ((pos == 1) | ~_back(at["at_or_very"], 2, False)), v * c.N_SCALAR, v)
+
+        v = np.where(active, v, 0.0)
+
+        # polarity_scores evaluates every occurrence of a token at its first position
+        first_keys = sentence_ids * max(len(vocabulary), 1) + token_ids
+        _, first, inverse = np.unique(first_keys, return_index=True, return_inverse=True)
+        v = v[first[inverse.ravel()]]
+
+        # _but_check: damp sentiment before the first "but", boost it after
+        but_pos = np.full(num_sentences, np.iinfo(np.int64).max)
+        np.minimum.at(but_pos, sentence_ids[at["but"]], pos[at["but"]])
+        but_pos = but_pos[sentence_ids]
+        has_but = but_pos != np.iinfo(np.int64).max
+        return np.where(has_but & (pos < but_pos), v * 0.5, np.where(has_but & (pos > but_pos), v * 1.5, v))
+
+    def _idioms_check(self, v: np.ndarray, applies: np.ndarray, words: np.ndarray,
+                      pos: np.ndarray, n: np.ndarray) -> np.ndarray:
+        """Vectorized _idioms_check for the tokens where it applies"""
+        base = self._base
+        w3, w2, w1 = _back(words, 3), _back(words, 2), _back(words, 1)
+        w_1, w_2 = _ahead(words, 1), _ahead(words, 2)
+        threetwo = w3 * base + w2
+        twoone = w2 * base + w1
+
+        # The first matching sequence wins, so apply them from last to first
+        for values, code in ((self._idioms2, threetwo),
+                             (self._idioms3, threetwo * base + w1),
+                             (self._idioms2, twoone),
+                             (self._idioms3, twoone * base + words),
+                             (self._idioms2, w1 * base + words)):
+            idiom = values[code]
+            v = np.where(applies & ~np.isnan(idiom), idiom, v)
+
+        zeroone = words * base + w_1
+        idiom = self._idioms2[zeroone]
+        v = np.where(applies & (pos < n - 1) & ~np.isnan(idiom), idiom, v)
+        idiom = self._idioms3[zeroone * base + w_2]
+        v = np.where(applies & (pos < n - 2) & ~np.isnan(idiom), idiom, v)
+
+        boosted = self._boosters2[threetwo] | self._boosters2[twoone]
+        return np.where(applies & boosted, v + self.constants.B_DECR, v)
+
+    def _score(self, sentences: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Token valences with their sentence ids, plus each sentence's punctuation amplifier and sum"""
+        count = len(sentences)
+        token_ids, sentence_ids, vocabulary = self.tokenize(sentences)
+        v = self.token_valences(token_ids, sentence_ids, vocabulary, count)
+
+        # _punctuation_emphasis
+        exclamations = np.array([sentence.count("!") for sentence in sentences], dtype=np.float64)
+        questions = np.array([sentence.count("?") for sentence in sentences], dtype=np.float64)
+        amplifier = np.minimum(exclamations, 4) * 0.292 + \
+            np.where(questions > 1, np.where(questions <= 3, questions * 0.18, 0.96), 0.0)
+
+        sum_s = np.bincount(sentence_ids, weights=v, minlength=count)
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        return v, sentence_ids, amplifier, sum_s
+
+    def polarity_scores(self, sentences: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Score a batch of sentences
+
+        Args:
+            sentences: Sentences to score
+
+        Returns:
+            Dict of "neg", "neu", "pos" and "compound" arrays with one entry per
+            sentence, rounded like polarity_scores
+        """
+        count = len(sentences)
+        v, sentence_ids, amplifier, sum_s = self._score(sentences)
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+        # _sift_sentiment_scores
+        pos_sum = np.bincount(sentence_ids, weights=np.where(v > 0, v + 1, 0.0), minlength=count)
+        neg_sum = np.bincount(sentence_ids, weights=np.where(v < 0, v - 1, 0.0), minlength=count)
+        neu_count = np.bincount(sentence_ids, weights=(v == 0).astype(np.float64), minlength=count)
+        more_positive = pos_sum > np.abs(neg_sum)
+        more_negative = pos_sum < np.abs(neg_sum)
+        pos_sum = np.where(more_positive, pos_sum + amplifier, pos_sum)
+        neg_sum = np.where(more_negative, neg_sum - amplifier, neg_sum)
+
+        # Sentences without tokens score 0 everywhere
+        total = pos_sum + np.abs(neg_sum) + neu_count
+        total[total == 0] = 1.0
+        return {
+            "neg": _round(np.abs(neg_sum / total), 3),
+            "neu": _round(np.abs(neu_count / total), 3),
+            "pos": _round(np.abs(pos_sum / total), 3),
+            "compound": _round(compound, 4),
+        }
+
+    def compound_scores(self, sentences: Sequence[str]) -> List[float]:
+        """
+        Compound score of every sentence, rounded exactly as polarity_scores rounds it
+
+        Args:
+            sentences: Sentences to score
+
+        Returns:
+            List of compound scores in sentence order
+        """
+        if not sentences:
+            return []
+        _, _, _, sum_s = self._score(sentences)
+        return _round(sum_s / np.sqrt(sum_s * sum_s + 15), 4).tolist()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark repeated get_top_quotes calls with a fresh analyzer per call versus the shared one
+
+"before" mirrors the old client code: every call constructs SentimentAnalyzer with
+NLTK's SentimentIntensityAnalyzer, which re-reads and parses the lexicon file.
+"after" reuses get_analyzer(), whose lexicon is loaded once from the precompiled file.
+
+Usage:
+    python -m benchmarks.bench_analyzer_reuse [--calls 50] [-o results.json]
+"""
+import argparse
+
+from nltk.sentiment import SentimentIntensityAnalyzer
+
+from benchmarks.harness import measure, write_results
+from benchmarks.stubs import make_segments
+from app.transcript_service import TranscriptService
+from batch_sentiment import BatchSentimentScorer
+from sentiment_analyzer import LEXICON_PATH, SentimentAnalyzer, get_analyzer, load_lexicon
+
+
+def nltk_analyzer() -> SentimentAnalyzer:
+    """SentimentAnalyzer built the old way, from NLTK's lexicon text file"""
+    analyzer = SentimentAnalyzer.__new__(SentimentAnalyzer)
+    analyzer.sia = SentimentIntensityAnalyzer()
+    analyzer.scorer = BatchSentimentScorer(analyzer.sia.lexicon, analyzer.sia.constants)
+    return analyzer
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark analyzer reuse and the precompiled lexicon")
+    parser.add_argument("--calls", type=int, default=50, help="get_top_quotes calls per run (default: 50)")
+    parser.add_argument("--segments", type=int, default=50, help="Transcript segments per call (default: 50)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (default: 3)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    transcript = TranscriptService.format_transcript(make_segments(args.segments))
+    
+    def before():
+        for _ in range(args.calls):
+            nltk_analyzer().get_top_quotes(transcript, 5, 'positive')
+    
+    def after():
+        for _ in range(args.calls):
+            get_analyzer().get_top_quotes(transcript, 5, 'positive')
+    
+    results = {
+        "lexicon_load": {
+            "nltk_text": measure(lambda: SentimentIntensityAnalyzer(), args.repeat * 5, trace=False),
+            "precompiled": measure(lambda: load_lexicon(LEXICON_PATH), args.repeat * 5, trace=False),
+        },
+        "calls": args.calls,
+        "before": measure(before, args.repeat, trace=False),
+        "after": measure(after, args.repeat, trace=False),
+    }
+    
+    load = results["lexicon_load"]
+    print(f"lexicon load   nltk text {load['nltk_text']['p50_ms']:.2f} ms   precompiled {load['precompiled']['p50_ms']:.2f} ms")
+    print(f"{args.calls} get_top_quotes calls   before {results['before']['p50_ms']:.1f} ms   "
+          f"after {results['after']['p50_ms']:.1f} ms   "
+          f"speedup {results['before']['p50_ms'] / max(results['after']['p50_ms'], 1e-9):.1f}x")
+    
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
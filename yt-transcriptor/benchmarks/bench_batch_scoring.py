@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch VADER scoring against polarity_scores called once per sentence
+
+Sentences are generated from the lexicon with boosters, negations, capitals and
+punctuation mixed in, so every scoring rule is exercised.
+
+Usage:
+    python -m benchmarks.bench_batch_scoring [--sentences 100000] [-o results.json]
+"""
+import argparse
+import random
+from typing import List
+
+from benchmarks.harness import measure, write_results
+from sentiment_analyzer import get_analyzer
+
+FILLERS = ("the a movie it was is and I we this so but never not least at very kind of sort "
+           "just enough isn't don't really extremely barely kinda").split()
+
+
+def make_sentences(count: int, seed: int = 5) -> List[str]:
+    """Synthetic sentences of 5-25 tokens, about a third of them lexicon words"""
+    rng = random.Random(seed)
+    words = sorted(w for w in get_analyzer().sia.lexicon if w.isalpha())
+    sentences = []
+    for _ in range(count):
+        tokens = []
+        for _ in range(rng.randint(5, 25)):
+            token = rng.choice(words) if rng.random() < 0.3 else rng.choice(FILLERS)
+            if rng.random() < 0.05:
+                token = token.upper()
+            if rng.random() < 0.08:
+                token += rng.choice("!?,.")
+            tokens.append(token)
+        sentences.append(" ".join(tokens).capitalize() + ".")
+    return sentences
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark batch VADER scoring against polarity_scores")
+    parser.add_argument("--sentences", type=int, default=100000, help="Sentences to score (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (default: 3)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    analyzer = get_analyzer()
+    sentences = make_sentences(args.sentences)
+    
+    expected = [analyzer.sia.polarity_scores(sentence)["compound"] for sentence in sentences]
+    actual = analyzer.scorer.compound_scores(sentences)
+    max_difference = max((abs(a - b) for a, b in zip(actual, expected)), default=0.0)
+    
+    results = {
+        "sentences": args.sentences,
+        "max_compound_difference": max_difference,
+        "polarity_scores": measure(lambda: [analyzer.sia.polarity_scores(s) for s in sentences],
+                                   args.repeat, trace=False),
+        "batch": measure(lambda: analyzer.scorer.compound_scores(sentences), args.repeat),
+    }
+    
+    before, after = results["polarity_scores"]["p50_ms"], results["batch"]["p50_ms"]
+    print(f"{args.sentences} sentences   polarity_scores {before:.0f} ms   batch {after:.0f} ms   "
+          f"speedup {before / max(after, 1e-9):.1f}x   peak {results['batch']['peak_kib'] / 1024:.1f} MiB   "
+          f"max compound difference {max_difference}")
+    
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark the overhead --local removes from the command-line tools
+
+The same extract_content calls are timed against an API server running in this
+process (over HTTP on the shared keep-alive session) and in local mode. YouTube
+is replaced by FakeYouTubeTranscriptApi and web pages come from the fixture
+server, so the difference is the HTTP round trip, JSON encoding and decoding,
+and response validation.
+
+Usage:
+    python -m benchmarks.bench_local_mode [--segments 1000 10000] [--repeat 20] [-o results.json]
+"""
+import argparse
+from typing import Dict
+from unittest.mock import patch
+
+from api_client import extract_content
+from app.web_content_service import WebContentService
+from benchmarks.harness import measure, write_results
+from benchmarks.run_benchmarks import VIDEO_URLS, start_api_server
+from benchmarks.stubs import FakeYouTubeTranscriptApi, FixtureServer, fixture_pages
+
+
+def time_modes(url: str, format_text: bool, api_url: str, repeat: int) -> Dict:
+    """Time one extraction over HTTP and in local mode"""
+
+    def call(local: bool):
+        WebContentService.fingerprint_index.clear()
+        result = extract_content(url, format_text=format_text, api_url=api_url, local=local)
+        assert isinstance(result, dict), result
+        return result
+
+    assert call(False) == call(True)
+    result = {mode: measure(lambda: call(mode == "local"), repeat, trace=False) for mode in ("http", "local")}
+    result["saved_ms"] = round(result["http"]["p50_ms"] - result["local"]["p50_ms"], 3)
+    return result
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Compare extract_content over HTTP and in local mode")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1000, 10000],
+                        help="Transcript lengths in segments (default: 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per case (default: 20)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results: Dict = {"repeat": args.repeat, "cases": {}}
+    with FixtureServer(fixture_pages()) as server, \
+            patch("app.transcript_service.YouTubeTranscriptApi", FakeYouTubeTranscriptApi):
+        api = start_api_server()
+        api_url = f"http://127.0.0.1:{api.servers[0].sockets[0].getsockname()[1]}"
+        cases = [(f"webpage_{page}", server.url(f"/{page}.html"), True) for page in ("small", "large")]
+        try:
+            for name, url, format_text in cases:
+                results["cases"][name] = time_modes(url, format_text, api_url, args.repeat)
+            for segments in args.segments:
+                FakeYouTubeTranscriptApi.configure(segments=segments)
+                for format_text in (True, False):
+                    name = f"youtube_{segments}_{'text' if format_text else 'segments'}"
+                    results["cases"][name] = time_modes(VIDEO_URLS[0], format_text, api_url, args.repeat)
+        finally:
+            api.should_exit = True
+
+    for name, case in results["cases"].items():
+        http, local = case["http"]["p50_ms"], case["local"]["p50_ms"]
+        print(f"{name:<24} http {http:>9.2f} ms   local {local:>9.2f} ms   saved {case['saved_ms']:>8.2f} ms   "
+              f"speedup {http / max(local, 1e-9):.2f}x")
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark peak memory of buffered and streaming CLI output on long transcripts
+
+For each transcript length, every output mode runs in a fresh child process so
+peak RSS is not shared between runs. The child builds the extraction result
+first, records its peak RSS, then writes the output to a file; the growth of
+the peak while writing is what the output path costs. The "buffered" modes
+build the whole document first, as the CLIs did; the "streaming" modes use
+OutputWriter.
+
+Usage:
+    python -m benchmarks.bench_output_writers [--hours 3 12 48] [-o results.json]
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from app.transcript_service import TranscriptService
+from benchmarks.harness import peak_rss_mib, write_results
+from benchmarks.stubs import make_segments
+from output_writers import OutputWriter, ndjson_records
+
+# make_segments averages 3.75 seconds per segment
+SEGMENTS_PER_HOUR = 960
+
+
+def write_json_buffered(result: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(result, indent=2))
+
+
+def write_json_streaming(result: Dict, path: str) -> None:
+    with OutputWriter(path) as out:
+        out.write_json(result)
+
+
+def write_ndjson_streaming(result: Dict, path: str) -> None:
+    with OutputWriter(path) as out:
+        out.write_ndjson(ndjson_records(result))
+
+
+def write_text_buffered(result: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(TranscriptService.format_transcript(result["text"]))
+
+
+def write_text_streaming(result: Dict, path: str) -> None:
+    with OutputWriter(path) as out:
+        out.write_all(TranscriptService.iter_format_transcript(result["text"]))
+
+
+MODES = {
+    "json_buffered": write_json_buffered,
+    "json_streaming": write_json_streaming,
+    "ndjson_streaming": write_ndjson_streaming,
+    "text_buffered": write_text_buffered,
+    "text_streaming": write_text_streaming,
+}
+
+
+def make_result(hours: float) -> Dict:
+    """A /content result for a YouTube transcript of the given length"""
+    return {"status": "success", "url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "content_type": "youtube",
+            "video_id": "dQw4w9WgXcQ", "language": "en", "text": make_segments(int(hours * SEGMENTS_PER_HOUR))}
+
+
+def run_child(mode: str, hours: float, path: str) -> Dict:
+    """Write one output in this process and report the peak RSS it added"""
+    result = make_result(hours)
+    gc.collect()
+    before = peak_rss_mib()
+    start = time.perf_counter()
+    MODES[mode](result, path)
+    elapsed = time.perf_counter() - start
+    after = peak_rss_mib()
+    return {"data_peak_rss_mib": before, "peak_rss_mib": after, "added_mib": round(after - before, 1),
+            "write_ms": round(elapsed * 1000, 1), "output_mib": round(os.path.getsize(path) / (1 << 20), 1)}
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Compare peak RSS of buffered and streaming CLI output")
+    parser.add_argument("--hours", type=float, nargs="+", default=[3, 12, 48],
+                        help="Transcript lengths in hours (default: 3 12 48)")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Output modes to run")
+    parser.add_argument("--child", nargs=3, metavar=("MODE", "HOURS", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.child:
+        mode, hours, path = args.child
+        print(json.dumps(run_child(mode, float(hours), path)))
+        return
+
+    results: Dict = {"segments_per_hour": SEGMENTS_PER_HOUR, "cases": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for hours in args.hours:
+            case = results["cases"][f"{hours:g}h"] = {}
+            for mode in args.modes:
+                path = os.path.join(directory, mode)
+                child = subprocess.run([sys.executable, "-m", "benchmarks.bench_output_writers",
+                                        "--child", mode, str(hours), path],
+                                       capture_output=True, text=True, check=True)
+                case[mode] = json.loads(child.stdout)
+                os.remove(path)
+                print(f"{hours:>6g}h  {mode:<17} output {case[mode]['output_mib']:>7.1f} MiB   "
+                      f"peak RSS +{case[mode]['added_mib']:>7.1f} MiB   write {case[mode]['write_ms']:>8.1f} ms")
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
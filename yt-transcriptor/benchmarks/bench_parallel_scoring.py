@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark quote extraction on a process pool from 1 to N workers
+
+Every run is checked against the single-process result, so the benchmark also
+confirms that parallel scoring is deterministic.
+
+Usage:
+    python -m benchmarks.bench_parallel_scoring [--sentences 400000] [--max-workers 8] [-o results.json]
+"""
+import argparse
+import os
+
+from benchmarks.bench_batch_scoring import make_sentences
+from benchmarks.harness import measure, write_results
+from sentiment_analyzer import get_analyzer, get_scoring_pool
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark parallel sentiment scoring from 1 to N workers")
+    parser.add_argument("--sentences", type=int, default=400000, help="Sentences in the transcript (default: 400000)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest worker count to try (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10, help="Quotes of each polarity (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per worker count (default: 3)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    analyzer = get_analyzer()
+    transcript = " ".join(make_sentences(args.sentences))
+    expected = analyzer.get_top_sentiments(transcript, args.top)
+    
+    results = {"sentences": args.sentences, "workers": {}}
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        if workers > 1:
+            # Start the pool outside the timed runs; its initializer loads the lexicon, and the
+            # task returns a pid because an analyzer cannot be pickled back
+            get_scoring_pool(workers).submit(os.getpid).result()
+        assert analyzer.get_top_sentiments(transcript, args.top, workers=workers) == expected
+        stats = measure(lambda: analyzer.get_top_sentiments(transcript, args.top, workers=workers),
+                        args.repeat, trace=False)
+        baseline = baseline or stats["p50_ms"]
+        stats["speedup"] = round(baseline / max(stats["p50_ms"], 1e-9), 2)
+        results["workers"][workers] = stats
+        print(f"{workers:>2} workers   p50 {stats['p50_ms']:>9.1f} ms   speedup {stats['speedup']:.2f}x")
+    
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
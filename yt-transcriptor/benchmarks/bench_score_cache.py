@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sentence score memo on a corpus with repeated boilerplate
+
+Documents mix unique sentences with intros, sponsor reads and newsletter
+footers drawn from a small pool, at --duplicate-rate of all sentences. Each
+timed run starts from an empty memo, so hits come only from repeats within
+the corpus.
+
+Usage:
+    python -m benchmarks.bench_score_cache [--sentences 100000] [--duplicate-rate 0.3] [-o results.json]
+"""
+import argparse
+import random
+from typing import List
+
+from benchmarks.bench_batch_scoring import make_sentences
+from benchmarks.harness import measure, write_results
+from score_cache import SentenceScoreCache
+from sentiment_analyzer import SentimentAnalyzer
+
+BOILERPLATE = [
+    "Hey everyone and welcome back to the channel, it's so great to see you all again.",
+    "Before we start, don't forget to like and subscribe and hit the notification bell.",
+    "This video is sponsored by {sponsor}, the easiest way to {benefit}.",
+    "Use my code at checkout to get {discount} percent off your first order, thanks {sponsor}!",
+    "Thanks for reading, and if you enjoyed this issue please share it with a friend.",
+    "You are receiving this email because you subscribed to our newsletter.",
+    "Unsubscribe at any time, we really hate spam as much as you do.",
+    "That's it for today, see you in the next one and have an awesome week.",
+]
+SPONSORS = ["SquareSpace", "NordVPN", "Skillshare", "HelloFresh", "Brilliant"]
+BENEFITS = ["build a beautiful website", "stay safe online", "learn something new", "cook great meals"]
+
+
+def boilerplate_pool() -> List[str]:
+    """Every filled-in variant of the boilerplate templates"""
+    pool = []
+    for template in BOILERPLATE:
+        variants = {template.format(sponsor=sponsor, benefit=benefit, discount=discount)
+                    for sponsor in SPONSORS for benefit in BENEFITS for discount in (10, 20)}
+        pool.extend(sorted(variants))
+    return pool
+
+
+def make_corpus(count: int, duplicate_rate: float, seed: int = 11) -> List[str]:
+    """Unique synthetic sentences with boilerplate mixed in at duplicate_rate"""
+    rng = random.Random(seed)
+    pool = boilerplate_pool()
+    unique = iter(make_sentences(count, seed))
+    return [rng.choice(pool) if rng.random() < duplicate_rate else next(unique) for _ in range(count)]
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark the sentence score memo on repeated boilerplate")
+    parser.add_argument("--sentences", type=int, default=100000, help="Sentences in the corpus (default: 100000)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.3,
+                        help="Fraction of sentences that are boilerplate (default: 0.3)")
+    parser.add_argument("--cache-size", type=int, default=50000, help="Memo capacity (default: 50000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs (default: 3)")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.sentences, args.duplicate_rate)
+    plain = SentimentAnalyzer()
+    memoized = SentimentAnalyzer(cache=SentenceScoreCache(args.cache_size), memoize_batches=True)
+    cache = memoized.cache
+
+    def per_sentence(analyzer: SentimentAnalyzer):
+        if analyzer.cache is not None:
+            analyzer.cache.clear()
+        return [analyzer.analyze_sentiment(sentence)["compound"] for sentence in corpus]
+
+    def batched(analyzer: SentimentAnalyzer):
+        if analyzer.cache is not None:
+            analyzer.cache.clear()
+        return analyzer.compound_scores(corpus)
+
+    expected = per_sentence(plain)
+    assert per_sentence(memoized) == expected and batched(memoized) == expected
+
+    results = {
+        "sentences": args.sentences,
+        "duplicate_rate": args.duplicate_rate,
+        "distinct_sentences": len(set(corpus)),
+        "analyze_sentiment": {
+            "uncached": measure(lambda: per_sentence(plain), args.repeat, trace=False),
+            "memoized": measure(lambda: per_sentence(memoized), args.repeat, trace=False),
+        },
+        "batch": {
+            "uncached": measure(lambda: batched(plain), args.repeat, trace=False),
+            "memoized": measure(lambda: batched(memoized), args.repeat, trace=False),
+        },
+    }
+    cache.clear()
+    per_sentence(memoized)
+    results["cache"] = cache.stats()
+
+    for mode in ("analyze_sentiment", "batch"):
+        before, after = results[mode]["uncached"]["p50_ms"], results[mode]["memoized"]["p50_ms"]
+        print(f"{mode:<17} {args.sentences} sentences   uncached {before:.0f} ms   memoized {after:.0f} ms   "
+              f"speedup {before / max(after, 1e-9):.2f}x")
+    print(f"hit rate {results['cache']['hit_rate']:.1%}   memo size {results['cache']['size']}")
+
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for SentimentAnalyzer with comparison against a stored baseline
+
+Synthetic documents are generated from a fixed seed in three kinds:
+"transcript" ([MM:SS] timestamped segment lines), "captions" (the same segments
+without timestamps) and "article" (punctuated paragraphs). For every kind and
+size, clean_transcript, split_into_sentences, analyze_sentiment (once per
+sentence) and get_top_quotes are timed separately, with one extra run traced by
+tracemalloc for peak memory and retained blocks. The analyzer is built without
+a score memo, so repeated runs do the same work.
+
+Usage:
+    python -m benchmarks.bench_sentiment_analyzer -o results.json
+    python -m benchmarks.bench_sentiment_analyzer --sizes 1000 10000 --fail-on-regression
+    python -m benchmarks.bench_sentiment_analyzer --update-baseline
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+from app.transcript_service import TranscriptService
+from benchmarks.bench_batch_scoring import FILLERS
+from benchmarks.harness import compare_results, measure, write_results
+from sentiment_analyzer import SentimentAnalyzer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "sentiment_analyzer.json")
+KINDS = ("transcript", "captions", "article")
+STAGES = ("clean_transcript", "split_into_sentences", "analyze_sentiment", "get_top_quotes")
+
+
+def make_words(count: int, vocabulary: List[str], rng: random.Random) -> List[str]:
+    """Words grouped into sentences of 5-25, about a third of them lexicon words"""
+    words = []
+    while len(words) < count:
+        sentence = [rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(FILLERS)
+                    for _ in range(rng.randint(5, 25))]
+        sentence[0] = sentence[0].capitalize()
+        sentence[-1] += rng.choice(".....!?")
+        words.extend(sentence)
+    return words[:count]
+
+
+def make_document(kind: str, words: int, vocabulary: List[str], seed: int = 7) -> str:
+    """A synthetic document of the given kind and exact word count"""
+    rng = random.Random(seed)
+    tokens = make_words(words, vocabulary, rng)
+    if kind == "article":
+        paragraphs = []
+        index = 0
+        while index < len(tokens):
+            size = rng.randint(40, 160)
+            paragraphs.append(" ".join(tokens[index:index + size]))
+            index += size
+        return "\n\n".join(paragraphs)
+
+    segments = []
+    start = 0.0
+    index = 0
+    while index < len(tokens):
+        size = rng.randint(4, 14)
+        segments.append({"text": " ".join(tokens[index:index + size]), "start": start})
+        start += round(rng.uniform(1.5, 6.0), 2)
+        index += size
+    if kind == "transcript":
+        return TranscriptService.format_transcript(segments)
+    return "\n".join(segment["text"] for segment in segments)
+
+
+def run_case(analyzer: SentimentAnalyzer, text: str, repeat: int, trace: bool) -> Dict:
+    """Time each analyzer stage on one document"""
+    cleaned = analyzer.clean_transcript(text)
+    sentences = analyzer.split_into_sentences(cleaned)
+    result = {"words": len(text.split()), "chars": len(text), "sentences": len(sentences)}
+    result["clean_transcript"] = measure(lambda: analyzer.clean_transcript(text), repeat, trace)
+    result["split_into_sentences"] = measure(lambda: analyzer.split_into_sentences(cleaned), repeat, trace)
+    result["analyze_sentiment"] = measure(lambda: [analyzer.analyze_sentiment(s) for s in sentences], repeat, trace)
+    result["get_top_quotes"] = measure(lambda: analyzer.get_top_quotes(text, 5, 'positive'), repeat, trace)
+    return result
+
+
+def print_comparison(rows: List[Dict]) -> None:
+    """Print changed metrics and a summary line"""
+    for row in rows:
+        if row["status"] != "unchanged":
+            print(f"{row['status']:<11} {row['path']:<42} {row['metric']:<8} "
+                  f"{row['baseline']:>12} -> {row['current']:<12} ({row['ratio']:.2f}x)")
+    counts = {status: sum(1 for row in rows if row["status"] == status)
+              for status in ("regression", "improvement", "unchanged")}
+    print(f"compared {len(rows)} metrics: {counts['regression']} regressions, "
+          f"{counts['improvement']} improvements, {counts['unchanged']} unchanged")
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark SentimentAnalyzer stages on synthetic documents")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                        help="Document sizes in words (default: 1000 10000 100000 1000000)")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS), help="Document kinds to run")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (default: 3)")
+    parser.add_argument("--no-trace", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative change reported as a regression or improvement (default: 0.1)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on any regression")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer()
+    vocabulary = sorted(word for word in analyzer.sia.lexicon if word.isalpha())
+    results: Dict = {"config": {k: v for k, v in vars(args).items() if k in ("sizes", "kinds", "repeat", "no_trace")},
+                     "cases": {}}
+
+    for kind in args.kinds:
+        for words in args.sizes:
+            name = f"{kind}_{words}"
+            case = results["cases"][name] = run_case(analyzer, make_document(kind, words, vocabulary),
+                                                     args.repeat, not args.no_trace)
+            timings = "   ".join(f"{stage} {case[stage]['p50_ms']:>9.1f} ms" for stage in STAGES)
+            print(f"{name:<19} {case['sentences']:>7} sentences   {timings}")
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare_results(results, baseline, args.threshold)
+        results["comparison"] = {"baseline": baseline.get("environment"), "threshold": args.threshold, "rows": rows}
+        print_comparison(rows)
+
+    if args.output:
+        write_results(args.output, results)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        write_results(args.baseline, results)
+
+    regressions = [row for row in results.get("comparison", {}).get("rows", []) if row["status"] == "regression"]
+    if args.fail_on_regression and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark SummaryService against newspaper3k's article.nlp()
+
+Usage:
+    python -m benchmarks.bench_summary [--words 500 5000 50000] [--repeat 5]
+"""
+import argparse
+import random
+
+from app.summary_service import SummaryService
+from benchmarks.harness import measure, write_results
+
+VOCABULARY = (
+    "city council transit plan budget residents library park river bridge school teacher "
+    "students election vote mayor street traffic bus rail airport housing rent market "
+    "business owners festival music weather storm season harvest farmers water energy "
+    "solar wind power grid hospital doctors nurses patients research university science"
+).split()
+FILLER = "the a of and to in that is was for on with as by".split()
+
+
+def make_text(words: int, seed: int = 0) -> str:
+    """Generate a deterministic article-like text of roughly the given length"""
+    rng = random.Random(seed)
+    sentences = []
+    count = 0
+    while count < words:
+        length = rng.randint(8, 24)
+        tokens = [rng.choice(VOCABULARY if rng.random() < 0.6 else FILLER) for _ in range(length)]
+        sentences.append(" ".join(tokens).capitalize() + ".")
+        count += length
+    return " ".join(sentences)
+
+
+def newspaper_nlp(text: str):
+    """Build a callable running article.nlp() on pre-extracted text, or None if unavailable"""
+    try:
+        from newspaper import Article
+        from newspaper.article import ArticleDownloadState
+    except ImportError:
+        return None
+    
+    def run():
+        article = Article("https://example.com/benchmark")
+        article.download_state = ArticleDownloadState.SUCCESS
+        article.is_parsed = True
+        article.set_title("Benchmark article")
+        article.set_text(text)
+        article.nlp()
+    
+    try:
+        run()
+    except LookupError:
+        # article.nlp() needs the NLTK punkt tokenizer (see download_nltk_data.py)
+        return None
+    return run
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Benchmark SummaryService against newspaper3k article.nlp()")
+    parser.add_argument("--words", type=int, nargs="+", default=[500, 5000, 50000], help="Text sizes in words")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per measurement")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+    
+    results = []
+    for words in args.words:
+        text = make_text(words)
+        row = {
+            "words": words,
+            "summary_service": measure(lambda: (SummaryService.summarize(text),
+                                                SummaryService.extract_keywords(text)), args.repeat),
+        }
+        nlp = newspaper_nlp(text)
+        row["newspaper_nlp"] = measure(nlp, args.repeat) if nlp else None
+        results.append(row)
+        
+        ours = row["summary_service"]
+        line = f"{words:>8} words  summary_service {ours['p50_ms']:>10.2f} ms {ours['retained_blocks']:>8} blocks"
+        if row["newspaper_nlp"]:
+            theirs = row["newspaper_nlp"]
+            line += f"  newspaper_nlp {theirs['p50_ms']:>10.2f} ms {theirs['retained_blocks']:>8} blocks"
+            line += f"  speedup {theirs['p50_ms'] / max(ours['p50_ms'], 1e-9):.1f}x"
+        else:
+            line += "  newspaper_nlp unavailable (NLTK punkt not installed)"
+        print(line)
+    
+    if args.output:
+        write_results(args.output, {"summary": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Shared helpers for timing benchmarks and recording results
+"""
+import json
+import math
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize_timings(timings: List[float]) -> Dict[str, float]:
+    """Latency statistics in milliseconds"""
+    return {
+        "count": len(timings),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3) if timings else 0.0,
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3) if timings else 0.0,
+    }
+
+
+def measure(func: Callable[[], object], repeat: int, trace: bool = True) -> Dict[str, float]:
+    """
+    Time a callable, then trace one more run for peak memory and retained blocks
+
+    Args:
+        func: Callable to benchmark
+        repeat: Number of timed runs
+        trace: Whether to run the tracemalloc pass
+
+    Returns:
+        Dict of latency statistics, plus "peak_kib" and "retained_blocks" when traced
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    result = summarize_timings(timings)
+    
+    if trace:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        func()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_kib"] = round(peak / 1024, 1)
+        result["retained_blocks"] = sum(max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno"))
+    return result
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def environment_info() -> Dict[str, Optional[str]]:
+    """Metadata identifying the run so results can be compared over time"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5, cwd=os.path.dirname(__file__)).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": str(os.cpu_count()),
+    }
+
+
+def write_results(path: str, results: Dict) -> None:
+    """Write results with run metadata as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment_info(), **results}, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = 0.1,
+                    metrics: tuple = ("p50_ms", "peak_kib")) -> List[Dict]:
+    """
+    Compare benchmark results with a baseline run
+
+    Every dict holding one of the metrics is matched by its path in both results.
+
+    Args:
+        current: Results of this run
+        baseline: Results of the baseline run
+        threshold: Relative change beyond which a metric counts as a regression or an improvement
+        metrics: Metric names to compare
+
+    Returns:
+        List of {"path", "metric", "baseline", "current", "ratio", "status"} rows,
+        where status is "regression", "improvement" or "unchanged"
+    """
+    rows = []
+
+    def walk(new: Dict, old: Dict, path: str):
+        for key, value in new.items():
+            if key == "environment" or not isinstance(value, dict) or not isinstance(old.get(key), dict):
+                continue
+            walk(value, old[key], f"{path}/{key}" if path else key)
+        for metric in metrics:
+            before, after = old.get(metric), new.get(metric)
+            if not isinstance(before, (int, float)) or not isinstance(after, (int, float)) or before <= 0:
+                continue
+            ratio = after / before
+            status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "unchanged"
+            rows.append({"path": path, "metric": metric, "baseline": before, "current": after,
+                         "ratio": round(ratio, 3), "status": status})
+
+    walk(current, baseline, "")
+    return rows
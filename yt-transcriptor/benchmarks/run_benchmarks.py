@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark and load-test suite for the Content Extraction API, fully offline
+
+Web pages are served from a local fixture server and YouTube is replaced by
+FakeYouTubeTranscriptApi, so runs are reproducible without network access.
+
+Usage:
+    python -m benchmarks.run_benchmarks -o results.json
+    python -m benchmarks.run_benchmarks --only load --requests 500 --concurrency 16
+"""
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from unittest.mock import patch
+
+import requests
+import uvicorn
+
+from app.transcript_service import TranscriptService
+from app.web_content_service import WebContentService
+from benchmarks.harness import measure, peak_rss_mib, summarize_timings, write_results
+from benchmarks.stubs import FakeYouTubeTranscriptApi, FixtureServer, fixture_pages, make_segments
+
+VIDEO_URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/embed/dQw4w9WgXcQ",
+    "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ&t=42",
+    "https://example.com/not/a/video",
+]
+
+EXTRACTORS = {
+    "trafilatura": WebContentService.extract_with_trafilatura,
+    "newspaper3k": WebContentService.extract_with_newspaper,
+    "beautifulsoup": WebContentService.extract_with_beautifulsoup,
+    "extract_content": WebContentService.extract_content,
+}
+
+
+def run_microbenchmarks(server: FixtureServer, repeat: int) -> Dict:
+    """Time format_transcript, extract_video_id and each extractor"""
+    results = {"format_transcript": {}, "extract_video_id": None, "extractors": {}}
+
+    for count in (100, 1000, 10000):
+        segments = make_segments(count)
+        results["format_transcript"][f"{count}_segments"] = measure(
+            lambda: TranscriptService.format_transcript(segments), repeat)
+        print(f"format_transcript {count:>6} segments  p50 {results['format_transcript'][f'{count}_segments']['p50_ms']:>9.3f} ms")
+
+    def video_ids():
+        for _ in range(200):
+            for url in VIDEO_URLS:
+                TranscriptService.extract_video_id(url)
+
+    results["extract_video_id"] = measure(video_ids, repeat)
+    results["extract_video_id"]["calls_per_run"] = 200 * len(VIDEO_URLS)
+    print(f"extract_video_id  {200 * len(VIDEO_URLS)} calls  p50 {results['extract_video_id']['p50_ms']:>9.3f} ms")
+
+    for page in ("small", "large", "pathological"):
+        url = server.url(f"/{page}.html")
+        results["extractors"][page] = {}
+        for name, extractor in EXTRACTORS.items():
+            WebContentService.fingerprint_index.clear()
+            stats = measure(lambda: extractor(url), repeat)
+            stats["status"] = extractor(url)["status"]
+            results["extractors"][page][name] = stats
+            print(f"{name:<16} {page:<13} p50 {stats['p50_ms']:>9.3f} ms  peak {stats['peak_kib']:>9.1f} KiB  ({stats['status']})")
+
+    return results
+
+
+def start_api_server() -> uvicorn.Server:
+    """Run the API in a background thread on a free port"""
+    config = uvicorn.Config("app.api:app", host="127.0.0.1", port=0, log_level="warning")
+    server = uvicorn.Server(config)
+    server.install_signal_handlers = lambda: None
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def run_load_test(server: FixtureServer, total_requests: int, concurrency: int) -> Dict:
+    """Drive /content with a mix of YouTube and web page requests"""
+    api = start_api_server()
+    port = api.servers[0].sockets[0].getsockname()[1]
+    endpoint = f"http://127.0.0.1:{port}/content"
+    targets = [VIDEO_URLS[0], server.url("/small.html"), VIDEO_URLS[1], server.url("/large.html")]
+    local = threading.local()
+
+    def one_request(i: int) -> Dict:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        url = targets[i % len(targets)]
+        start = time.perf_counter()
+        try:
+            response = session.post(endpoint, json={"url": url}, timeout=60)
+            ok = response.status_code == 200 and response.json().get("status") == "success"
+        except requests.RequestException:
+            ok = False
+        return {"latency": time.perf_counter() - start, "ok": ok,
+                "kind": "youtube" if "youtu" in url else "webpage"}
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one_request, range(total_requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        api.should_exit = True
+
+    results = {
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total_requests / elapsed, 2),
+        "errors": sum(1 for s in samples if not s["ok"]),
+        "latency": summarize_timings([s["latency"] for s in samples]),
+        "by_kind": {},
+        "peak_rss_mib": peak_rss_mib(),
+    }
+    for kind in ("youtube", "webpage"):
+        results["by_kind"][kind] = summarize_timings([s["latency"] for s in samples if s["kind"] == kind])
+
+    latency = results["latency"]
+    print(f"load  {total_requests} requests x{concurrency}  {results['rps']} rps  "
+          f"p50 {latency['p50_ms']} ms  p95 {latency['p95_ms']} ms  p99 {latency['p99_ms']} ms  "
+          f"errors {results['errors']}  peak RSS {results['peak_rss_mib']} MiB")
+    return results
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Offline benchmark and load-test suite for the Content Extraction API")
+    parser.add_argument("--only", choices=["micro", "load"], help="Run only one part of the suite")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per microbenchmark (default: 5)")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests in the load scenario (default: 200)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients in the load scenario (default: 8)")
+    parser.add_argument("--segments", type=int, default=1000, help="Segments per fake YouTube transcript (default: 1000)")
+    parser.add_argument("--yt-latency", type=float, default=0.05, help="Fake YouTube API latency per call in seconds (default: 0.05)")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Fixture server latency per response in seconds")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    FakeYouTubeTranscriptApi.configure(segments=args.segments, latency=args.yt_latency)
+    results: Dict = {"config": vars(args)}
+
+    with FixtureServer(fixture_pages(), latency=args.page_latency) as server, \
+            patch("app.transcript_service.YouTubeTranscriptApi", FakeYouTubeTranscriptApi):
+        if args.only in (None, "micro"):
+            results["micro"] = run_microbenchmarks(server, args.repeat)
+        if args.only in (None, "load"):
+            results["load"] = run_load_test(server, args.requests, args.concurrency)
+
+    results["peak_rss_mib"] = peak_rss_mib()
+    if args.output:
+        write_results(args.output, results)
+
+
+if __name__ == "__main__":
+    main()
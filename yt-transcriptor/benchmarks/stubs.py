@@ -0,0 +1,173 @@
+"""
+Offline stubs for benchmarks: a local fixture HTTP server and a fake YouTube transcript API
+"""
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+_WORDS = (
+    "council transit plan budget residents library park river bridge school students election "
+    "vote mayor street traffic rail airport housing market business festival weather energy "
+    "hospital research university great terrible wonderful awful happy sad love hate"
+).split()
+
+
+def _paragraph(rng: random.Random, words: int = 80) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def large_page(paragraphs: int = 2000, seed: int = 0) -> str:
+    """A long article (~1 MB) with many paragraphs and page chrome"""
+    rng = random.Random(seed)
+    body = "\n".join(f"<p>{_paragraph(rng)}</p>" for _ in range(paragraphs))
+    nav = "".join(f'<li><a href="/section/{i}">Section {i}</a></li>' for i in range(200))
+    return (f"<html><head><title>Large benchmark article</title></head><body>"
+            f"<header><nav><ul>{nav}</ul></nav></header><article><h1>Large benchmark article</h1>"
+            f"{body}</article><footer>Footer</footer></body></html>")
+
+
+def pathological_page(depth: int = 2000, scripts: int = 500, seed: int = 0) -> str:
+    """Deeply nested markup, heavy inline scripts and text without paragraph tags"""
+    rng = random.Random(seed)
+    script = "<script>var data = [" + ",".join(str(i) for i in range(200)) + "];</script>"
+    text = " ".join(_paragraph(rng, 40) for _ in range(50))
+    return ("<html><head><title>Pathological benchmark page</title>" + script * scripts + "</head><body>"
+            + "<div><span>" * depth + text + "</span></div>" * depth
+            + "<table>" + "<tr><td>cell</td></tr>" * 5000 + "</table></body></html>")
+
+
+def fixture_pages() -> Dict[str, str]:
+    """Benchmark pages keyed by URL path"""
+    with open(os.path.join(FIXTURES_DIR, "small.html"), "r", encoding="utf-8") as f:
+        small = f.read()
+    return {
+        "/small.html": small,
+        "/large.html": large_page(),
+        "/pathological.html": pathological_page(),
+    }
+
+
+class FixtureServer:
+    """
+    Local HTTP server serving benchmark pages from memory
+
+    Usage:
+        with FixtureServer(fixture_pages()) as server:
+            url = server.url("/small.html")
+    """
+    
+    def __init__(self, pages: Dict[str, str], latency: float = 0.0):
+        self.pages = pages
+        self.latency = latency
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def url(self, path: str) -> str:
+        """Absolute URL of a fixture path"""
+        host, port = self._server.server_address
+        return f"http://{host}:{port}{path}"
+    
+    def __enter__(self) -> "FixtureServer":
+        pages = {path: body.encode("utf-8") for path, body in self.pages.items()}
+        latency = self.latency
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, include_body: bool):
+                body = pages.get(self.path)
+                if latency:
+                    time.sleep(latency)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if include_body:
+                    self.wfile.write(body)
+            
+            def do_GET(self):
+                self._respond(True)
+            
+            def do_HEAD(self):
+                self._respond(False)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def make_segments(count: int, seed: int = 0) -> List[Dict]:
+    """Synthetic transcript segments in youtube-transcript-api's format"""
+    rng = random.Random(seed)
+    segments = []
+    start = 0.0
+    for _ in range(count):
+        duration = round(rng.uniform(1.5, 6.0), 2)
+        segments.append({"text": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 14))),
+                         "start": round(start, 2), "duration": duration})
+        start += duration
+    return segments
+
+
+class FakeTranscript:
+    """Stand-in for youtube_transcript_api's Transcript"""
+    
+    def __init__(self, segments: List[Dict], language_code: str, latency: float):
+        self._segments = segments
+        self.language_code = language_code
+        self._latency = latency
+    
+    def fetch(self) -> List[Dict]:
+        if self._latency:
+            time.sleep(self._latency)
+        return list(self._segments)
+
+
+class FakeTranscriptList:
+    """Stand-in for youtube_transcript_api's TranscriptList"""
+    
+    def __init__(self, segments: List[Dict], latency: float):
+        self._segments = segments
+        self._latency = latency
+    
+    def find_transcript(self, language_codes: List[str]) -> FakeTranscript:
+        return FakeTranscript(self._segments, language_codes[0], self._latency)
+
+
+class FakeYouTubeTranscriptApi:
+    """
+    Drop-in replacement for YouTubeTranscriptApi with configurable latency
+
+    Both list_transcripts() and fetch() sleep for ``latency`` seconds to model
+    the two round trips the real API makes.
+    """
+    
+    segments: List[Dict] = make_segments(1000)
+    latency: float = 0.0
+    
+    @classmethod
+    def configure(cls, segments: int = 1000, latency: float = 0.0) -> None:
+        """Set the transcript length and simulated network latency"""
+        cls.segments = make_segments(segments)
+        cls.latency = latency
+    
+    @classmethod
+    def list_transcripts(cls, video_id: str) -> FakeTranscriptList:
+        if cls.latency:
+            time.sleep(cls.latency)
+        return FakeTranscriptList(cls.segments, cls.latency)
@@ -0,0 +1,32 @@
+"""
+Script to precompile the VADER lexicon into data/vader_lexicon.marshal
+
+Run once after downloading NLTK data (see download_nltk_data.py) whenever the
+lexicon changes. SentimentAnalyzer loads the result with a single read.
+"""
+import marshal
+import os
+import sys
+
+import nltk
+
+from sentiment_analyzer import LEXICON_PATH
+
+source = sys.argv[1] if len(sys.argv) > 1 else None
+if source:
+    with open(source, "r", encoding="utf-8") as f:
+        raw = f.read()
+else:
+    raw = nltk.data.load("sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt")
+
+lexicon = {}
+for line in raw.split("\n"):
+    if not line.strip():
+        continue
+    word, measure = line.strip().split("\t")[0:2]
+    lexicon[word] = float(measure)
+
+os.makedirs(os.path.dirname(LEXICON_PATH), exist_ok=True)
+with open(LEXICON_PATH, "wb") as f:
+    f.write(marshal.dumps(lexicon))
+print(f"Wrote {len(lexicon)} entries to {LEXICON_PATH}")
@@ -2,49 +2,11 @@
 Command-line client for Content Extraction Tool
 """
 import argparse
-import json
-import requests
 import sys
 import re
-
-
-def extract_content(url, language=None, format_text=True, api_url="http://localhost:8000"):
-    """
-    Extract content from a URL (YouTube video or web page)
-    
-    Args:
-        url: URL to extract content from
-        language: Preferred language code (optional, for YouTube)
-        format_text: Whether to return formatted text (for YouTube)
-        api_url: API server URL
-        
-    Returns:
-        Extracted content or error message
-    """
-    endpoint = f"{api_url}/content"
-    
-    try:
-        response = requests.post(
-            endpoint,
-            json={
-                "url": url,
-                "language": language,
-                "format_text": format_text
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data["status"] == "success":
-                return data
-            else:
-                return f"Error: {data['message']}"
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Connection error: {str(e)}"
+from api_client import extract_content
+from content_cache import get_content_cache
+from output_writers import OutputWriter, ndjson_records
 
 
 def main():
@@ -53,7 +15,12 @@ def main():
     parser.add_argument("url", help="URL to extract content from")
     parser.add_argument("-l", "--language", help="Preferred language code for YouTube transcripts (e.g., 'en', 'es')")
     parser.add_argument("--raw", action="store_true", help="Output raw data (JSON)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Output raw data as NDJSON: the result without its text, then one transcript segment per line")
     parser.add_argument("--api", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--local", action="store_true", help="Extract content in this process instead of calling the API server")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local content cache")
+    parser.add_argument("--refresh", action="store_true", help="Fetch again even if the content is cached, and update the cache")
     parser.add_argument("-o", "--output", help="Output file (default: print to stdout)")
     
     args = parser.parse_args()
@@ -62,33 +29,34 @@ def main():
     result = extract_content(
         args.url,
         language=args.language,
-        format_text=not args.raw,
-        api_url=args.api
+        format_text=not (args.raw or args.ndjson),
+        api_url=args.api,
+        local=args.local,
+        cache=None if args.no_cache else get_content_cache(),
+        refresh=args.refresh
     )
     
-    # Format output
-    if isinstance(result, dict):
-        if args.raw:
-            output = json.dumps(result, indent=2)
-        else:
-            if result.get("content_type") == "youtube":
-                output = result.get("text", "No transcript available")
+    # Write output as it is formatted
+    with OutputWriter(args.output, end="" if args.ndjson else None) as out:
+        if isinstance(result, dict):
+            if args.ndjson:
+                out.write_ndjson(ndjson_records(result))
+            elif args.raw:
+                out.write_json(result)
+            elif result.get("content_type") == "youtube":
+                out.write(str(result.get("text", "No transcript available")))
             else:
                 # Format web page content
                 title = result.get("title", "No title")
                 text = result.get("text", "No content available")
                 
-                output = f"Title: {title}\n\n{text}"
-    else:
-        output = result  # Error message
+                out.write(f"Title: {title}\n\n")
+                out.write(str(text))
+        else:
+            out.write(str(result))  # Error message
     
-    # Output result
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
         print(f"Content saved to {args.output}")
-    else:
-        print(output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,199 @@
+"""
+On-disk cache of extracted content shared by the command-line tools
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yt-transcriptor", "content")
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MB = 256
+# Eviction trims the cache to this fraction of max_bytes, so it does not run on every write
+EVICT_TO = 0.9
+SUFFIX = ".json.gz"
+
+
+def content_key(url: str, language: Optional[str], format_text: bool) -> str:
+    """File name stem identifying an extraction request"""
+    raw = json.dumps([url, language, bool(format_text)])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ContentCache:
+    """
+    Size-bounded on-disk cache of /content results with a time to live
+
+    Each entry is one gzip-compressed JSON file keyed by URL, language and
+    format_text. Its modification time records when it was stored, for the TTL,
+    and its access time when it was last read, for least-recently-used eviction.
+    Files are replaced atomically, so concurrent runs can share a directory.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB << 20,
+                 ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # Bytes on disk, counted on the first write
+        self._lock = threading.Lock()
+
+    def _file(self, url: str, language: Optional[str], format_text: bool) -> str:
+        return os.path.join(self.path, content_key(url, language, format_text) + SUFFIX)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, url: str, language: Optional[str] = None, format_text: bool = True) -> Optional[Dict]:
+        """Cached content for a request, or None if missing, expired or unreadable"""
+        path = self._file(url, language, format_text)
+        try:
+            stat = os.stat(path)
+            now = time.time()
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+                self._count(False)
+                return None
+            with open(path, "rb") as f:
+                data = json.loads(gzip.decompress(f.read()))
+            # Mark as recently used, keeping the time it was stored
+            os.utime(path, (now, stat.st_mtime))
+        except FileNotFoundError:
+            self._count(False)
+            return None
+        except (OSError, EOFError, ValueError, zlib.error):
+            self._remove(path)
+            self._count(False)
+            return None
+        self._count(True)
+        return data
+
+    def put(self, url: str, language: Optional[str], format_text: bool, data: Dict) -> None:
+        """Store content for a request, evicting the least recently used entries if over max_bytes"""
+        if self.max_bytes <= 0:
+            return
+        payload = gzip.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        if len(payload) > self.max_bytes:
+            return
+        path = self._file(url, language, format_text)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        # A cache that cannot be written (read-only home, full disk) only costs a refetch
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, _, size in self._entries())
+            else:
+                self._size += len(payload) - replaced
+            if self._size > self.max_bytes:
+                self._size = self._evict(int(self.max_bytes * EVICT_TO))
+
+    def _entries(self) -> List[Tuple[str, os.stat_result, int]]:
+        """(path, stat, size) of every entry on disk"""
+        entries = []
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat, stat.st_size))
+        return entries
+
+    def _evict(self, target: int) -> int:
+        """Remove expired entries, then the least recently used ones, until at most target bytes remain"""
+        now = time.time()
+        kept = []
+        for path, stat, size in self._entries():
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+            else:
+                kept.append((stat.st_atime, path, size))
+        kept.sort()
+        total = sum(size for _, _, size in kept)
+        for _, path, size in kept:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        return total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """Hit-rate statistics of this process and the size of the cache on disk"""
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "entries": len(entries),
+                "bytes": sum(size for _, _, size in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove every entry and reset the statistics"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            self._size = 0
+            self.hits = self.misses = 0
+
+
+_shared_cache: Optional[ContentCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_content_cache() -> ContentCache:
+    """
+    Get the process-wide content cache, configured on first use
+
+    CONTENT_CACHE_DIR sets its directory (default ~/.cache/yt-transcriptor/content),
+    CONTENT_CACHE_TTL the lifetime of an entry in seconds (default 7 days) and
+    CONTENT_CACHE_MAX_MB the size bound (default 256).
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ContentCache(
+                    path=os.getenv("CONTENT_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                    max_bytes=int(float(os.getenv("CONTENT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * (1 << 20)),
+                    ttl=float(os.getenv("CONTENT_CACHE_TTL", DEFAULT_TTL)),
+                )
+    return _shared_cache
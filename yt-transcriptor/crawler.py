@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Crawler - Extract every article listed in a sitemap.xml or RSS/Atom feed as NDJSON
+"""
+import argparse
+import json
+import sys
+
+from app.crawl_service import CrawlService
+
+
+def main():
+    """Main function for CLI"""
+    parser = argparse.ArgumentParser(description="Crawl a sitemap or RSS/Atom feed and extract each article as NDJSON")
+    parser.add_argument("feed_url", help="Sitemap, sitemap index, RSS or Atom feed URL")
+    parser.add_argument("--workers", type=int, default=8, help="Number of concurrent extractions (default: 8)")
+    parser.add_argument("--per-domain", type=int, default=2, help="Maximum concurrent extractions per domain (default: 2)")
+    parser.add_argument("--state", help="State file used to skip articles whose lastmod has not changed")
+    parser.add_argument("-o", "--output", help="Output file (default: print to stdout)")
+    
+    args = parser.parse_args()
+    
+    state = CrawlService.load_state(args.state)
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    counts = {}
+    
+    try:
+        for record in CrawlService.crawl(args.feed_url, state=state,
+                                         max_workers=args.workers, per_domain=args.per_domain):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+    finally:
+        CrawlService.save_state(args.state, state)
+        if args.output:
+            out.close()
+    
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"Crawl finished: {summary or 'no articles found'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
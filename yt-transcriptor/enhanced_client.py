@@ -3,63 +3,31 @@
 Enhanced client for Content Extraction Tool with sentiment analysis
 """
 import argparse
-import json
 import sys
-import requests
-from sentiment_analyzer import SentimentAnalyzer
+from api_client import extract_content
+from content_cache import get_content_cache
+from output_writers import OutputWriter, ndjson_records
+from app.transcript_service import TranscriptService
+from sentiment_analyzer import format_timestamp, get_analyzer
 
-def extract_content(url, language=None, format_text=True, api_url="http://localhost:8000"):
-    """
-    Extract content from a URL (YouTube video or web page)
-    
-    Args:
-        url: URL to extract content from
-        language: Preferred language code (optional, for YouTube)
-        format_text: Whether to return formatted text (for YouTube)
-        api_url: API server URL
-        
-    Returns:
-        Extracted content or error message
-    """
-    endpoint = f"{api_url}/content"
-    
-    try:
-        response = requests.post(
-            endpoint,
-            json={
-                "url": url,
-                "language": language,
-                "format_text": format_text
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data["status"] == "success":
-                return data
-            else:
-                return f"Error: {data['message']}"
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Connection error: {str(e)}"
 
-
-def analyze_sentiment(transcript_text, top_n=5):
+def analyze_sentiment(transcript_text, top_n=5, video_id=None):
     """
     Analyze sentiment in transcript text
     
     Args:
-        transcript_text: Text to analyze
+        transcript_text: Text to analyze, or the raw transcript segments
         top_n: Number of top positive/negative sentences to return
+        video_id: YouTube video ID for links to the quotes (segments only)
         
     Returns:
         Dictionary with top positive and negative sentences
     """
-    analyzer = SentimentAnalyzer()
-    top_positive, top_negative = analyzer.get_top_sentiments(transcript_text, top_n)
+    analyzer = get_analyzer()
+    if isinstance(transcript_text, str):
+        top_positive, top_negative = analyzer.get_top_sentiments(transcript_text, top_n)
+    else:
+        top_positive, top_negative = analyzer.get_top_sentiments_from_segments(transcript_text, top_n, video_id)
     
     return {
         "top_positive": top_positive,
@@ -67,23 +35,59 @@ def analyze_sentiment(transcript_text, top_n=5):
     }
 
 
+def format_timeline(timeline):
+    """Format a sentiment timeline as one line per window with a bar for the mean score"""
+    return "".join(iter_timeline(timeline))
+
+
+def iter_timeline(timeline):
+    """Format a sentiment timeline line by line, for streaming output"""
+    yield "\n" + "="*80 + "\n"
+    yield f"SENTIMENT TIMELINE ({timeline['window_seconds']:g}s windows every {timeline['step_seconds']:g}s)\n"
+    yield "="*80 + "\n\n"
+    
+    for start, count, mean, low, high in zip(timeline["start"], timeline["count"], timeline["mean"],
+                                             timeline["min"], timeline["max"]):
+        if not count:
+            yield f"[{format_timestamp(start)}]      -\n"
+            continue
+        bar = ("+" if mean >= 0 else "-") * round(abs(mean) * 20)
+        yield f"[{format_timestamp(start)}] {mean:+.3f} {bar:<20} (n={count}, min {low:+.3f}, max {high:+.3f})\n"
+
+
+def format_statements(statements):
+    """Format scored statements, with their timestamp and link when known"""
+    return "".join(iter_statements(statements))
+
+
+def iter_statements(statements):
+    """Format scored statements piece by piece, for streaming output"""
+    for i, item in enumerate(statements, 1):
+        timestamp = f"[{item['timestamp']}] " if 'timestamp' in item else ""
+        yield f"{i}. {timestamp}{item['quote']} (Score: {item['score']:.3f})\n"
+        if 'url' in item:
+            yield f"   {item['url']}\n"
+        yield "\n"
+
+
 def format_sentiment_results(sentiment_results):
     """Format sentiment analysis results for display"""
-    output = "\n" + "="*80 + "\n"
-    output += "SENTIMENT ANALYSIS RESULTS\n"
-    output += "="*80 + "\n\n"
-    
-    output += "TOP POSITIVE STATEMENTS:\n"
-    output += "-"*80 + "\n"
-    for i, item in enumerate(sentiment_results["top_positive"], 1):
-        output += f"{i}. \"{item['text']}\" (Score: {item['score']:.3f})\n\n"
+    return "".join(iter_sentiment_results(sentiment_results))
+
+
+def iter_sentiment_results(sentiment_results):
+    """Format sentiment analysis results piece by piece, for streaming output"""
+    yield "\n" + "="*80 + "\n"
+    yield "SENTIMENT ANALYSIS RESULTS\n"
+    yield "="*80 + "\n\n"
     
-    output += "\nTOP NEGATIVE STATEMENTS:\n"
-    output += "-"*80 + "\n"
-    for i, item in enumerate(sentiment_results["top_negative"], 1):
-        output += f"{i}. \"{item['text']}\" (Score: {item['score']:.3f})\n\n"
+    yield "TOP POSITIVE STATEMENTS:\n"
+    yield "-"*80 + "\n"
+    yield from iter_statements(sentiment_results["top_positive"])
     
-    return output
+    yield "\nTOP NEGATIVE STATEMENTS:\n"
+    yield "-"*80 + "\n"
+    yield from iter_statements(sentiment_results["top_negative"])
 
 
 def main():
@@ -92,61 +96,74 @@ def main():
     parser.add_argument("url", help="URL to extract content from")
     parser.add_argument("-l", "--language", help="Preferred language code for YouTube transcripts (e.g., 'en', 'es')")
     parser.add_argument("--raw", action="store_true", help="Output raw data (JSON)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Output raw data as NDJSON: the result without its text, then one transcript segment per line")
     parser.add_argument("--api", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--local", action="store_true", help="Extract content in this process instead of calling the API server")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local content cache")
+    parser.add_argument("--refresh", action="store_true", help="Fetch again even if the content is cached, and update the cache")
     parser.add_argument("-o", "--output", help="Output file (default: print to stdout)")
     parser.add_argument("--sentiment", action="store_true", help="Perform sentiment analysis on the transcript")
     parser.add_argument("--top", type=int, default=5, help="Number of top positive/negative sentences to show")
+    parser.add_argument("--timeline", action="store_true", help="Show how sentiment evolves over a YouTube video")
+    parser.add_argument("--window", type=float, default=60.0, help="Timeline window in seconds (default: 60)")
+    parser.add_argument("--step", type=float, help="Seconds between timeline windows (default: window)")
     
     args = parser.parse_args()
     
-    # Extract content
+    # Extract content (raw segments for YouTube, so quotes keep their timestamps)
     result = extract_content(
         args.url,
         language=args.language,
-        format_text=not args.raw,
-        api_url=args.api
+        format_text=False,
+        api_url=args.api,
+        local=args.local,
+        cache=None if args.no_cache else get_content_cache(),
+        refresh=args.refresh
     )
     
-    # Format output
-    if isinstance(result, dict):
-        if args.raw:
-            output = json.dumps(result, indent=2)
-        else:
-            if result.get("content_type") == "youtube":
-                transcript_text = result.get("text", "No transcript available")
-                output = transcript_text
+    # Write output as it is formatted
+    with OutputWriter(args.output, end="" if args.ndjson else None) as out:
+        if isinstance(result, dict):
+            if args.raw or args.ndjson:
+                if args.timeline and result.get("content_type") == "youtube" and result.get("text"):
+                    result["sentiment_timeline"] = get_analyzer().sentiment_timeline(result["text"], args.window,
+                                                                                     args.step)
+                if args.ndjson:
+                    out.write_ndjson(ndjson_records(result))
+                else:
+                    out.write_json(result)
+            elif result.get("content_type") == "youtube":
+                segments = result.get("text") or []
+                if segments:
+                    out.write_all(TranscriptService.iter_format_transcript(segments))
+                else:
+                    out.write("No transcript available")
                 
                 # Perform sentiment analysis if requested
-                if args.sentiment and transcript_text != "No transcript available":
-                    sentiment_results = analyze_sentiment(transcript_text, args.top)
-                    sentiment_output = format_sentiment_results(sentiment_results)
-                    output += sentiment_output
-                    
-                    # Add sentiment results to the result dict for raw output
-                    if args.raw:
-                        result["sentiment_analysis"] = sentiment_results
-                        output = json.dumps(result, indent=2)
+                if args.sentiment and segments:
+                    sentiment_results = analyze_sentiment(segments, args.top, result.get("video_id"))
+                    out.write_all(iter_sentiment_results(sentiment_results))
+                
+                if args.timeline and segments:
+                    timeline = get_analyzer().sentiment_timeline(segments, args.window, args.step)
+                    out.write_all(iter_timeline(timeline))
             else:
                 # Format web page content
                 title = result.get("title", "No title")
                 text = result.get("text", "No content available")
-                output = f"Title: {title}\n\n{text}"
+                out.write(f"Title: {title}\n\n")
+                out.write(str(text))
                 
                 # Perform sentiment analysis if requested
                 if args.sentiment and text != "No content available":
                     sentiment_results = analyze_sentiment(text, args.top)
-                    sentiment_output = format_sentiment_results(sentiment_results)
-                    output += sentiment_output
-    else:
-        output = result  # Error message
+                    out.write_all(iter_sentiment_results(sentiment_results))
+        else:
+            out.write(str(result))  # Error message
     
-    # Output result
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
         print(f"Content saved to {args.output}")
-    else:
-        print(output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Streaming output for the command-line tools
+
+Output is written to stdout or a file piece by piece as it is formatted, so a
+long transcript is never held in memory a second time as one output string.
+"""
+import json
+import os
+import sys
+from typing import Dict, Iterable, Iterator, Optional
+
+# Small pieces are joined into writes of about this many characters
+WRITE_CHUNK_CHARS = 1 << 16
+
+
+class OutputWriter:
+    """
+    Incremental writer to stdout or a file
+
+    Like print(), output to stdout ends with a newline; files get exactly what
+    was written. Pass end to override.
+
+    Usage:
+        with OutputWriter(args.output) as out:
+            out.write_all(TranscriptService.iter_format_transcript(segments))
+            out.write_json(result)
+    """
+
+    def __init__(self, path: Optional[str] = None, end: Optional[str] = None):
+        self.path = path
+        self.end = end if end is not None else ("" if path else "\n")
+        self.stream = open(path, "w", encoding="utf-8") if path else sys.stdout
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> bool:
+        try:
+            if exc_type is None and self.end:
+                self.stream.write(self.end)
+            self.close()
+        except BrokenPipeError:
+            exc_type = BrokenPipeError
+        if exc_type is BrokenPipeError and self.stream is sys.stdout:
+            # The reader went away (e.g. piped into head): stop quietly, and point stdout
+            # at devnull so flushing it again at exit does not fail
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return True
+        return False
+
+    def close(self) -> None:
+        """Flush the output, closing it if it is a file"""
+        if self.stream is sys.stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+    def write(self, text: str) -> None:
+        """Write a piece of text"""
+        self.stream.write(text)
+
+    def write_all(self, pieces: Iterable[str]) -> None:
+        """Write text pieces as they are produced, batched into writes of about WRITE_CHUNK_CHARS"""
+        buffer = []
+        size = 0
+        for piece in pieces:
+            buffer.append(piece)
+            size += len(piece)
+            if size >= WRITE_CHUNK_CHARS:
+                self.stream.write("".join(buffer))
+                buffer = []
+                size = 0
+        if buffer:
+            self.stream.write("".join(buffer))
+
+    def write_json(self, data, indent: Optional[int] = 2) -> None:
+        """Write data as JSON, the same text as json.dumps(data, indent=indent), encoded incrementally"""
+        self.write_all(json.JSONEncoder(indent=indent).iterencode(data))
+
+    def write_ndjson(self, records: Iterable[Dict]) -> None:
+        """Write one compact JSON document per line"""
+        self.write_all(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+
+def ndjson_records(result: Dict) -> Iterator[Dict]:
+    """
+    Records of an extraction result for NDJSON output
+
+    The first record is the result without its text. YouTube transcript segments
+    then follow one per record; web page text is kept in the first record.
+    """
+    text = result.get("text")
+    if isinstance(text, list):
+        yield {key: value for key, value in result.items() if key != "text"}
+        yield from text
+    else:
+        yield result
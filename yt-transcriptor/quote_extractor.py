@@ -4,151 +4,293 @@ Quote Extractor - Extract positive and negative quotes from YouTube videos or we
 """
 import argparse
 import json
+import os
 import sys
-import requests
-from sentiment_analyzer import SentimentAnalyzer
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from api_client import create_session, extract_content
+from content_cache import get_content_cache
+from output_writers import OutputWriter
+from sentiment_analyzer import get_analyzer
 
-def extract_content(url, language=None, format_text=True, api_url="http://localhost:8000"):
+
+def extract_quotes(transcript_text, top_n=5, sentiment_type='positive', video_id=None):
     """
-    Extract content from a URL (YouTube video or web page)
+    Extract top positive or negative quotes from transcript text
     
     Args:
-        url: URL to extract content from
-        language: Preferred language code (optional, for YouTube)
-        format_text: Whether to return formatted text (for YouTube)
-        api_url: API server URL
+        transcript_text: Text to analyze, or the raw transcript segments
+        top_n: Number of top quotes to return
+        sentiment_type: 'positive' or 'negative'
+        video_id: YouTube video ID for links to the quotes (segments only)
         
     Returns:
-        Extracted content or error message
+        List of quotes with sentiment scores (and start times for segments)
     """
-    endpoint = f"{api_url}/content"
+    analyzer = get_analyzer()
+    if isinstance(transcript_text, str):
+        return analyzer.get_top_quotes(transcript_text, top_n, sentiment_type)
+    return analyzer.get_top_quotes_from_segments(transcript_text, top_n, sentiment_type, video_id)
+
+
+def format_quotes_output(quotes, sentiment_type='positive'):
+    """Format quotes for display"""
+    return "".join(iter_quotes_output(quotes, sentiment_type))
+
+
+def iter_quotes_output(quotes, sentiment_type='positive'):
+    """Format quotes for display piece by piece, for streaming output"""
+    yield "\n" + "="*80 + "\n"
+    yield f"TOP {len(quotes)} {sentiment_type.upper()} QUOTES\n"
+    yield "="*80 + "\n\n"
     
-    try:
-        response = requests.post(
-            endpoint,
-            json={
-                "url": url,
-                "language": language,
-                "format_text": format_text
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data["status"] == "success":
-                return data
-            else:
-                return f"Error: {data['message']}"
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Connection error: {str(e)}"
+    for i, item in enumerate(quotes, 1):
+        timestamp = f"[{item['timestamp']}] " if 'timestamp' in item else ""
+        yield f"{i}. {timestamp}{item['quote']} (Score: {item['score']:.3f})\n"
+        if 'url' in item:
+            yield f"   {item['url']}\n"
+        yield "\n"
 
 
-def extract_quotes(transcript_text, top_n=5, sentiment_type='positive'):
+def quote_record(url, result, top_n=5, sentiment_type='positive'):
     """
-    Extract top positive or negative quotes from transcript text
+    Build the batch-mode record for one URL
     
     Args:
-        transcript_text: Text to analyze
+        url: Requested URL
+        result: extract_content result (content dict or error message)
         top_n: Number of top quotes to return
         sentiment_type: 'positive' or 'negative'
         
     Returns:
-        List of quotes with sentiment scores
+        Dict with "url" and "status", plus the quotes on success or "message" on error
     """
-    analyzer = SentimentAnalyzer()
-    quotes = analyzer.get_top_quotes(transcript_text, top_n, sentiment_type)
-    
-    return quotes
+    if not isinstance(result, dict):
+        return {"url": url, "status": "error", "message": result}
+    text = result.get("text")
+    if not text:
+        return {"url": url, "status": "error", "content_type": result.get("content_type"),
+                "message": "No content available"}
+    return {
+        "url": url,
+        "status": "success",
+        "content_type": result.get("content_type"),
+        "title": result.get("title"),
+        "video_id": result.get("video_id"),
+        "sentiment_type": sentiment_type,
+        "quotes": extract_quotes(text, top_n, sentiment_type, result.get("video_id")),
+    }
 
 
-def format_quotes_output(quotes, sentiment_type='positive'):
-    """Format quotes for display"""
-    output = "\n" + "="*80 + "\n"
-    output += f"TOP {len(quotes)} {sentiment_type.upper()} QUOTES\n"
-    output += "="*80 + "\n\n"
+def read_urls(source):
+    """URLs from a file or '-' for stdin, one per line, skipping blanks, comments and repeats"""
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        seen = set()
+        for line in stream:
+            url = line.strip()
+            if url and not url.startswith("#") and url not in seen:
+                seen.add(url)
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def completed_urls(path):
+    """URLs that already have a successful record in an NDJSON output file"""
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partial line from an interrupted run
+            if isinstance(record, dict) and record.get("status") == "success":
+                done.add(record.get("url"))
+    return done
+
+
+def run_batch(urls, out, language=None, api_url="http://localhost:8000", top_n=5, sentiment_type='positive',
+              workers=8, scoring_workers=0, local=False, cache=None, refresh=False):
+    """
+    Fetch URLs concurrently and write one NDJSON quote record per URL as it completes
     
-    for i, item in enumerate(quotes, 1):
-        output += f"{i}. {item['quote']} (Score: {item['score']:.3f})\n\n"
+    Content is fetched on a thread pool sharing one connection pool. Quotes are
+    extracted on the warm process-wide analyzer, or on a pool of scoring_workers
+    processes that each load it once.
     
-    return output
+    Args:
+        urls: Iterable of URLs
+        out: Text stream to write records to
+        language: Preferred language code for YouTube transcripts
+        api_url: API server URL
+        top_n: Number of top quotes per URL
+        sentiment_type: 'positive' or 'negative'
+        workers: Concurrent fetches
+        scoring_workers: Processes for quote extraction (0 extracts in this process)
+        local: Extract content in this process instead of calling the API server
+        cache: ContentCache to answer from and store fetched content in (optional)
+        refresh: Fetch again even if the content is cached
+        
+    Returns:
+        Dict with the number of "success" and "error" records written
+    """
+    counts = {"success": 0, "error": 0}
+    session = create_session(pool_size=workers)
+    scoring = ProcessPoolExecutor(max_workers=scoring_workers, initializer=get_analyzer) if scoring_workers > 0 else None
+    
+    def emit(record):
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        counts[record["status"]] += 1
+    
+    def fetch(url):
+        return url, extract_content(url, language=language, format_text=False, api_url=api_url, session=session,
+                                    local=local, cache=cache, refresh=refresh)
+    
+    urls = iter(urls)
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as fetchers:
+            while True:
+                # Keep a bounded number of fetches and extractions in flight
+                while len(pending) < workers * 2:
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    pending.add(fetchers.submit(fetch, url))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    outcome = future.result()
+                    if isinstance(outcome, dict):
+                        emit(outcome)
+                    elif scoring is not None:
+                        pending.add(scoring.submit(quote_record, *outcome, top_n, sentiment_type))
+                    else:
+                        emit(quote_record(*outcome, top_n, sentiment_type))
+    finally:
+        if scoring is not None:
+            scoring.shutdown()
+    return counts
 
 
 def main():
     """Main function for CLI"""
     parser = argparse.ArgumentParser(description="Extract positive or negative quotes from YouTube videos or web pages")
-    parser.add_argument("url", help="URL to extract content from")
+    parser.add_argument("url", nargs="?", help="URL to extract content from")
     parser.add_argument("-l", "--language", help="Preferred language code for YouTube transcripts (e.g., 'en', 'es')")
     parser.add_argument("--raw", action="store_true", help="Output raw data (JSON)")
     parser.add_argument("--api", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--local", action="store_true", help="Extract content in this process instead of calling the API server")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local content cache")
+    parser.add_argument("--refresh", action="store_true", help="Fetch again even if the content is cached, and update the cache")
     parser.add_argument("-o", "--output", help="Output file (default: print to stdout)")
     parser.add_argument("--type", choices=['positive', 'negative'], default='positive', 
                         help="Type of quotes to extract (default: positive)")
     parser.add_argument("--top", type=int, default=5, help="Number of top quotes to show")
     parser.add_argument("--transcript-only", action="store_true", help="Output only the transcript without sentiment analysis")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Read URLs from FILE ('-' for stdin), one per line, and write one NDJSON record per URL")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetches in batch mode (default: 8)")
+    parser.add_argument("--scoring-workers", type=int, default=0,
+                        help="Processes for quote extraction in batch mode (default: 0, extract in this process)")
+    parser.add_argument("--resume", action="store_true",
+                        help="In batch mode, skip URLs already done in the -o file and append to it")
     
     args = parser.parse_args()
     
-    # Extract content
+    if args.batch:
+        done = completed_urls(args.output) if args.resume else set()
+        urls = (url for url in read_urls(args.batch) if url not in done)
+        if args.output:
+            # Start a fresh line in case the previous run stopped mid-record
+            if args.resume and os.path.exists(args.output) and os.path.getsize(args.output):
+                with open(args.output, "rb") as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b"\n"
+            else:
+                needs_newline = False
+            out = open(args.output, "a" if args.resume else "w", encoding="utf-8")
+            if needs_newline:
+                out.write("\n")
+        else:
+            out = sys.stdout
+        try:
+            counts = run_batch(urls, out, args.language, args.api, args.top, args.type,
+                               args.workers, args.scoring_workers, args.local,
+                               None if args.no_cache else get_content_cache(), args.refresh)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"{counts['success']} succeeded, {counts['error']} failed, {len(done)} skipped as already done",
+              file=sys.stderr)
+        return
+    if not args.url:
+        parser.error("a URL or --batch is required")
+    
+    # Extract content (quotes are taken from the raw segments to keep their timestamps)
     result = extract_content(
         args.url,
         language=args.language,
-        format_text=not args.raw,
-        api_url=args.api
+        format_text=args.transcript_only and not args.raw,
+        api_url=args.api,
+        local=args.local,
+        cache=None if args.no_cache else get_content_cache(),
+        refresh=args.refresh
     )
     
-    # Format output
-    if isinstance(result, dict):
-        if result.get("content_type") == "youtube":
-            transcript_text = result.get("text", "No transcript available")
-            
-            # If transcript-only flag is set, just output the transcript
-            if args.transcript_only:
-                output = transcript_text
-                if args.raw:
-                    output = json.dumps({"url": args.url, "transcript": transcript_text}, indent=2)
-            elif transcript_text != "No transcript available":
-                quotes = extract_quotes(transcript_text, args.top, args.type)
+    # Write output as it is formatted
+    with OutputWriter(args.output) as out:
+        if isinstance(result, dict):
+            if result.get("content_type") == "youtube":
+                transcript_text = result.get("text", "No transcript available")
                 
-                if args.raw:
-                    output = json.dumps({"url": args.url, "quotes": quotes}, indent=2)
+                # If transcript-only flag is set, just output the transcript
+                if args.transcript_only:
+                    if args.raw:
+                        out.write_json({"url": args.url, "transcript": transcript_text})
+                    else:
+                        out.write(str(transcript_text))
+                elif transcript_text != "No transcript available":
+                    quotes = extract_quotes(transcript_text, args.top, args.type, result.get("video_id"))
+                    
+                    if args.raw:
+                        out.write_json({"url": args.url, "quotes": quotes})
+                    else:
+                        out.write_all(iter_quotes_output(quotes, args.type))
                 else:
-                    output = format_quotes_output(quotes, args.type)
+                    out.write("Error: No transcript available for this video")
             else:
-                output = "Error: No transcript available for this video"
-        else:
-            # Handle web page content
-            title = result.get("title", "No title")
-            text = result.get("text", "No content available")
-            
-            # If transcript-only flag is set, just output the text content
-            if args.transcript_only:
-                output = f"Title: {title}\n\n{text}"
-                if args.raw:
-                    output = json.dumps({"url": args.url, "title": title, "content": text}, indent=2)
-            elif text != "No content available":
-                quotes = extract_quotes(text, args.top, args.type)
+                # Handle web page content
+                title = result.get("title", "No title")
+                text = result.get("text", "No content available")
                 
-                if args.raw:
-                    output = json.dumps({"url": args.url, "title": title, "quotes": quotes}, indent=2)
+                # If transcript-only flag is set, just output the text content
+                if args.transcript_only:
+                    if args.raw:
+                        out.write_json({"url": args.url, "title": title, "content": text})
+                    else:
+                        out.write(f"Title: {title}\n\n")
+                        out.write(str(text))
+                elif text != "No content available":
+                    quotes = extract_quotes(text, args.top, args.type)
+                    
+                    if args.raw:
+                        out.write_json({"url": args.url, "title": title, "quotes": quotes})
+                    else:
+                        out.write(f"Title: {title}\n\n")
+                        out.write_all(iter_quotes_output(quotes, args.type))
                 else:
-                    output = f"Title: {title}\n\n"
-                    output += format_quotes_output(quotes, args.type)
-            else:
-                output = "Error: No content available from this web page"
-    else:
-        output = result  # Error message
+                    out.write("Error: No content available from this web page")
+        else:
+            out.write(str(result))  # Error message
     
-    # Output result
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write(output)
         print(f"Content saved to {args.output}")
-    else:
-        print(output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,133 @@
+"""
+Memo of sentence sentiment scores shared across documents
+"""
+import hashlib
+import marshal
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (neg, neu, pos, compound), the fields of VADER's polarity_scores
+Scores = Tuple[float, float, float, float]
+
+SCORE_FIELDS = ("neg", "neu", "pos", "compound")
+
+
+def sentence_key(sentence: str) -> bytes:
+    """
+    Hash of a sentence with its whitespace normalized
+
+    VADER tokenizes on whitespace, so sentences that differ only in spacing
+    always get the same scores and can share an entry.
+    """
+    return hashlib.blake2b(" ".join(sentence.split()).encode("utf-8"), digest_size=16).digest()
+
+
+class SentenceScoreCache:
+    """
+    Bounded, thread-safe LRU memo of sentence scores
+
+    Entries are keyed by sentence_key, so memory per entry does not depend on the
+    sentence length. With a path, the memo can be loaded from and saved to a local
+    file to carry over across runs.
+    """
+
+    def __init__(self, maxsize: int = 50000, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Scores]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[Scores]:
+        """Look up the scores of a sentence key, counting a hit or a miss"""
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return scores
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[Scores]]:
+        """Look up a batch of sentence keys under a single lock acquisition"""
+        with self._lock:
+            found = []
+            for key in keys:
+                scores = self._entries.get(key)
+                if scores is not None:
+                    self._entries.move_to_end(key)
+                found.append(scores)
+            hits = len(found) - found.count(None)
+            self.hits += hits
+            self.misses += len(found) - hits
+            return found
+
+    def put(self, key: bytes, scores: Scores) -> None:
+        """Store the scores of a sentence key, evicting the least recently used entries"""
+        self.put_many([(key, scores)])
+
+    def put_many(self, items: Iterable[Tuple[bytes, Scores]]) -> None:
+        """Store a batch of (key, scores) entries"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            for key, scores in items:
+                self._entries[key] = scores
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Hit-rate statistics since the memo was created or last cleared"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Add the entries saved in a file, keeping the most recent ones that fit
+
+        Returns:
+            int: Number of entries loaded (0 if the file is missing or unreadable)
+        """
+        path = path or self.path
+        try:
+            with open(path, "rb") as f:
+                entries = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return 0
+        self.put_many(entries[-self.maxsize:] if self.maxsize > 0 else [])
+        return min(len(entries), max(self.maxsize, 0))
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the entries to a file, least recently used first, replacing it atomically"""
+        path = path or self.path
+        with self._lock:
+            entries = list(self._entries.items())
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(marshal.dumps(entries))
+        os.replace(temp_path, path)
@@ -1,99 +1,798 @@
 """
 Sentiment Analysis module for YouTube transcripts
 """
+import atexit
+import heapq
+import marshal
+import os
 import re
-from typing import Dict, List, Tuple
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+from batch_sentiment import BatchSentimentScorer
+from score_cache import SCORE_FIELDS, SentenceScoreCache, sentence_key
+
+# VADER lexicon precompiled by build_vader_lexicon.py into a marshalled {word: valence} dict
+LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "vader_lexicon.marshal")
+
+
+def load_lexicon(path: str = LEXICON_PATH) -> Dict[str, float]:
+    """
+    Load the precompiled VADER lexicon with a single read
+    
+    Raises ValueError, EOFError or TypeError if the file is corrupt, truncated or
+    was marshalled by an incompatible Python version.
+    """
+    with open(path, "rb") as f:
+        lexicon = marshal.loads(f.read())
+    if not isinstance(lexicon, dict):
+        raise TypeError(f"{path} does not contain a lexicon dict")
+    return lexicon
+
+
+class PrecompiledSentimentIntensityAnalyzer(SentimentIntensityAnalyzer):
+    """VADER analyzer built from an already parsed lexicon instead of NLTK's text file"""
+    
+    def __init__(self, lexicon: Dict[str, float]):
+        self.lexicon = lexicon
+        self.constants = VaderConstants()
+
+
+def create_intensity_analyzer(lexicon_path: str = LEXICON_PATH) -> SentimentIntensityAnalyzer:
+    """
+    Create a VADER analyzer, preferring the precompiled lexicon
+    
+    Falls back to NLTK's vader_lexicon resource, downloading it only if it is
+    missing, when the precompiled lexicon is absent or cannot be loaded.
+    """
+    if os.path.exists(lexicon_path):
+        try:
+            return PrecompiledSentimentIntensityAnalyzer(load_lexicon(lexicon_path))
+        except (OSError, ValueError, EOFError, TypeError):
+            # The marshal format is not guaranteed across Python versions
+            pass
+    
+    import nltk
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+    except LookupError:
+        nltk.download('vader_lexicon')
+    return SentimentIntensityAnalyzer()
+
+# Compound score a sentence must exceed (positive) or fall below (negative) to be quoted
+POSITIVE_THRESHOLD = 0.2
+NEGATIVE_THRESHOLD = -0.2
+
+# Sentences scored per batch, and per task in parallel mode; smaller chunks cost
+# more to ship to a worker process than they save
+CHUNK_SENTENCES = 2000
+
+# Sentences longer than this are split again at clauses to get shorter quotes
+LONG_SENTENCE_CHARS = 100
+
+# Transcripts are read in slices of this many characters
+STREAM_CHUNK_CHARS = 1 << 16
+# A sentence still without an end after this many characters is clause-split as it
+# streams in, so unpunctuated text (e.g. auto-captions) does not pile up in memory
+MAX_PENDING_CHARS = 1 << 16
+
+_TIMESTAMP = re.compile(r'\[\d+:\d+\]')
+# Matches the end punctuation plus the whitespace split on; leading with the character
+# class lets the regex engine skip ahead instead of testing lookbehinds at every position
+_SENTENCE_END = re.compile(r'[.?!](?<!\w\.\w.)(?<![A-Z][a-z]\.)\s')
+_CLAUSE_BREAK = re.compile(r'(?<=\,|\;)\s+|(?<=\sand\s)|(?<=\sbut\s)|(?<=\sor\s)|(?<=\sso\s)')
+# Longest lookbehind in _SENTENCE_END and _CLAUSE_BREAK
+_SENTENCE_CONTEXT = 4
+_CLAUSE_CONTEXT = 5
+
+Transcript = Union[str, Iterable[str]]
+
+
+def iter_chunks(transcript: Transcript) -> Iterator[str]:
+    """
+    Yield a transcript in chunks of about STREAM_CHUNK_CHARS characters
+    
+    Accepts a string, or an iterable of text pieces such as the lines of a file;
+    small pieces are joined so per-chunk work is amortized.
+    """
+    if isinstance(transcript, str):
+        for start in range(0, len(transcript), STREAM_CHUNK_CHARS):
+            yield transcript[start:start + STREAM_CHUNK_CHARS]
+        return
+    pieces = []
+    size = 0
+    for piece in transcript:
+        pieces.append(piece)
+        size += len(piece)
+        if size >= STREAM_CHUNK_CHARS:
+            yield ''.join(pieces)
+            pieces = []
+            size = 0
+    if pieces:
+        yield ''.join(pieces)
+
+
+def _candidate(text: str, start: int, end: int, base: int) -> Optional[Tuple[int, str]]:
+    """
+    Strip the candidate quote text[start:end], dropping very short (not meaningful)
+    and very long ones
+    
+    Returns:
+        Tuple of (offset of the quote in the stream, quote), where text starts at offset base
+    """
+    piece = text[start:end]
+    sentence = piece.strip()
+    if 20 < len(sentence) < 200:
+        return base + start + len(piece) - len(piece.lstrip()), sentence
+    return None
+
+
+def _sentences_from_raw(raw: str, base: int) -> Iterator[Tuple[int, str]]:
+    """Candidate quotes with their offsets from one raw sentence, splitting long ones at clauses"""
+    last = 0
+    if len(raw.strip()) > LONG_SENTENCE_CHARS:
+        for match in _CLAUSE_BREAK.finditer(raw):
+            candidate = _candidate(raw, last, match.start(), base)
+            if candidate is not None:
+                yield candidate
+            last = match.end()
+    candidate = _candidate(raw, last, len(raw), base)
+    if candidate is not None:
+        yield candidate
+
+
+def segment_fields(segment) -> Tuple[str, float]:
+    """
+    Text and start time of a transcript segment
+    
+    Accepts the dicts returned by youtube-transcript-api, snippet objects with
+    text and start attributes, or compact (text, start) tuples.
+    """
+    if isinstance(segment, dict):
+        return segment.get('text', ''), segment.get('start', 0)
+    if isinstance(segment, tuple):
+        return segment
+    return segment.text, segment.start
+
+
+def compact_segments(segments: Iterable) -> List[Tuple[str, float]]:
+    """Convert transcript segments to compact (text, start) tuples that are cheap to pickle"""
+    return [segment_fields(segment) for segment in segments]
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format a start time as MM:SS, like TranscriptService.format_transcript"""
+    return f"{int(seconds // 60):02d}:{int(seconds % 60):02d}"
+
+
+def timestamp_url(video_id: str, seconds: float) -> str:
+    """Link to a YouTube video at the given time"""
+    return f"https://www.youtube.com/watch?v={video_id}&t={int(seconds)}s"
+
+
+def _window_extremes(scores: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum and maximum of scores[lo[i]:hi[i]] for every window
+    
+    Both ends of the windows only move forward, so one sweep with monotonic
+    deques of candidate indices answers every window: each score enters and
+    leaves each deque at most once, for O(n + windows) in total. Empty windows
+    are NaN.
+    """
+    lows = np.full(len(lo), np.nan)
+    highs = np.full(len(lo), np.nan)
+    values = scores.tolist()
+    minima: deque = deque()
+    maxima: deque = deque()
+    end = 0
+    for i, (first, stop) in enumerate(zip(lo.tolist(), hi.tolist())):
+        while end < stop:
+            value = values[end]
+            while minima and values[minima[-1]] >= value:
+                minima.pop()
+            minima.append(end)
+            while maxima and values[maxima[-1]] <= value:
+                maxima.pop()
+            maxima.append(end)
+            end += 1
+        while minima and minima[0] < first:
+            minima.popleft()
+        while maxima and maxima[0] < first:
+            maxima.popleft()
+        if first < stop:
+            lows[i] = values[minima[0]]
+            highs[i] = values[maxima[0]]
+    return lows, highs
+
+
+def timeline_windows(starts: np.ndarray, scores: np.ndarray, window_seconds: float,
+                     step_seconds: float) -> Dict[str, List]:
+    """
+    Aggregate time-stamped compound scores over sliding windows
+    
+    Windows start every step_seconds from 0 up to the last start time and cover
+    [t, t + window_seconds). Sums come from a prefix-sum array and minimum and
+    maximum from one sliding-window sweep, so the whole timeline costs
+    O(n + windows).
+    
+    Args:
+        starts: Start time of each score, in ascending order
+        scores: Compound scores
+        window_seconds: Width of each window
+        step_seconds: Distance between window starts
+        
+    Returns:
+        Dict of parallel lists "start", "count", "mean", "min" and "max"
+        (None for windows without any scores)
+    """
+    if window_seconds <= 0 or step_seconds <= 0:
+        raise ValueError("window_seconds and step_seconds must be positive")
+    timeline = {"start": [], "count": [], "mean": [], "min": [], "max": []}
+    if not len(starts):
+        return timeline
+    
+    window_starts = np.arange(int(starts[-1] // step_seconds) + 1) * step_seconds
+    lo = np.searchsorted(starts, window_starts, side='left')
+    hi = np.searchsorted(starts, window_starts + window_seconds, side='left')
+    counts = hi - lo
+    prefix = np.concatenate(([0.0], np.cumsum(scores)))
+    
+    filled = counts > 0
+    means = np.full(len(window_starts), np.nan)
+    means[filled] = (prefix[hi[filled]] - prefix[lo[filled]]) / counts[filled]
+    lows, highs = _window_extremes(np.asarray(scores, dtype=np.float64), lo, hi)
+    
+    def column(values: np.ndarray) -> List[Optional[float]]:
+        return [None if value != value else value for value in np.round(values, 4).tolist()]
+    
+    timeline["start"] = window_starts.tolist()
+    timeline["count"] = counts.tolist()
+    timeline["mean"] = column(means)
+    timeline["min"] = column(lows)
+    timeline["max"] = column(highs)
+    return timeline
+
+
+class TopQuoteHeaps:
+    """
+    Bounded min-heaps of the strongest positive and negative sentences seen so far
+    
+    Each heap holds at most top_n entries with its weakest entry on top, so pushing
+    n sentences costs O(n log top_n). Ties are broken by sentence position to match
+    the stable sort used previously.
+    """
+    
+    def __init__(self, top_n: int, positive: bool = True, negative: bool = True):
+        self.top_n = top_n
+        self.track_positive = positive
+        self.track_negative = negative
+        # Entries are (compound, -index, sentence, start) and (-compound, -index, sentence, start)
+        self._positive: List[Tuple[float, int, str, Optional[float]]] = []
+        self._negative: List[Tuple[float, int, str, Optional[float]]] = []
+    
+    def _push(self, heap: List, entry: Tuple[float, int, str, Optional[float]]) -> None:
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+    
+    def push(self, index: int, sentence: str, compound: float, start: Optional[float] = None) -> None:
+        """Offer a scored sentence at a given position in the document, with its start time if known"""
+        if self.top_n <= 0:
+            return
+        if self.track_positive and compound > POSITIVE_THRESHOLD:
+            self._push(self._positive, (compound, -index, sentence, start))
+        elif self.track_negative and compound < NEGATIVE_THRESHOLD:
+            self._push(self._negative, (-compound, -index, sentence, start))
+    
+    def merge(self, other: "TopQuoteHeaps") -> None:
+        """Fold in the heaps of another accumulator (e.g. from another chunk)"""
+        for entry in other._positive:
+            self._push(self._positive, entry)
+        for entry in other._negative:
+            self._push(self._negative, entry)
+    
+    def positive(self) -> List[Tuple[str, float, Optional[float]]]:
+        """Top positive (sentence, compound, start) entries, strongest first"""
+        return [(sentence, compound, start) for compound, _, sentence, start in sorted(self._positive, reverse=True)]
+    
+    def negative(self) -> List[Tuple[str, float, Optional[float]]]:
+        """Top negative (sentence, compound, start) entries, strongest first"""
+        return [(sentence, -key, start) for key, _, sentence, start in sorted(self._negative, reverse=True)]
+
+
+class ScoredSentences:
+    """
+    Every candidate quote of a document with its compound score
+    
+    Built once with SentimentAnalyzer.score_all or score_all_segments, it answers
+    top-quote queries for any top_n and polarity, and timelines, without scoring
+    again. Results are the same as from get_top_quotes and sentiment_timeline.
+    """
+    
+    def __init__(self, sentences: List[str], scores: List[float], starts: Optional[List[float]] = None):
+        self.sentences = sentences
+        self.scores = np.asarray(scores, dtype=np.float64)
+        self.starts = None if starts is None else np.asarray(starts, dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.sentences)
+    
+    def top(self, top_n: int, sentiment_type: str = 'positive') -> List[Tuple[str, float, Optional[float]]]:
+        """Top (sentence, compound, start) entries of a polarity, strongest first, as TopQuoteHeaps orders them"""
+        if top_n <= 0:
+            return []
+        if sentiment_type == 'positive':
+            indices = np.flatnonzero(self.scores > POSITIVE_THRESHOLD)
+            keys = -self.scores[indices]
+        else:
+            indices = np.flatnonzero(self.scores < NEGATIVE_THRESHOLD)
+            keys = self.scores[indices]
+        # Strongest score first, earliest sentence first among equal scores
+        order = indices[np.lexsort((indices, keys))[:top_n]]
+        return [(self.sentences[index], float(self.scores[index]),
+                 None if self.starts is None else float(self.starts[index])) for index in order]
+    
+    def timeline(self, window_seconds: float = 60.0, step_seconds: Optional[float] = None) -> Dict:
+        """Sentiment timeline as returned by SentimentAnalyzer.sentiment_timeline (segments only)"""
+        if self.starts is None:
+            raise ValueError("a timeline needs sentence start times; score segments with score_all_segments")
+        step_seconds = step_seconds or window_seconds
+        timeline = timeline_windows(self.starts, self.scores, window_seconds, step_seconds)
+        return {"window_seconds": window_seconds, "step_seconds": step_seconds, **timeline}
 
-# Download required NLTK resources
-try:
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('vader_lexicon')
 
 class SentimentAnalyzer:
     """Class to analyze sentiment in text"""
     
-    def __init__(self):
-        self.sia = SentimentIntensityAnalyzer()
+    def __init__(self, lexicon_path: str = LEXICON_PATH, cache: Optional[SentenceScoreCache] = None,
+                 memoize_batches: bool = False):
+        self.lexicon_path = lexicon_path
+        self.sia = create_intensity_analyzer(lexicon_path)
+        self.scorer = BatchSentimentScorer(self.sia.lexicon, self.sia.constants)
+        # Optional memo of sentence scores, so repeated sentences are scored once. Batch
+        # scoring is cheap enough that hashing only pays off with many repeats, so batches
+        # use the memo only when memoize_batches is set
+        self.cache = cache
+        self.memoize_batches = memoize_batches
     
-    def clean_transcript(self, transcript: str) -> str:
+    def clean_transcript(self, transcript: Transcript) -> str:
         """Remove timestamps and clean the transcript text"""
-        # Remove timestamps like [00:00]
-        cleaned_text = re.sub(r'\[\d+:\d+\]', '', transcript)
-        # Remove extra whitespace
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-        return cleaned_text
+        return ''.join(self.iter_clean(transcript))
     
-    def split_into_sentences(self, text: str) -> List[str]:
+    def iter_clean(self, transcript: Transcript) -> Iterator[str]:
+        """
+        Stream the cleaned transcript: timestamps removed and whitespace collapsed
+        
+        Input is only cut at whitespace, which no timestamp contains, so the joined
+        output equals cleaning the whole text at once.
+        """
+        pending = ''
+        started = False
+        for chunk in chain(iter_chunks(transcript), (None,)):
+            if chunk is None:
+                head, pending = pending, ''
+            else:
+                pending += chunk
+                cut = max(pending.rfind(' '), pending.rfind('\n')) + 1
+                if not cut:
+                    continue
+                head, pending = pending[:cut], pending[cut:]
+            words = _TIMESTAMP.sub('', head).split()
+            if words:
+                yield (' ' if started else '') + ' '.join(words)
+                started = True
+    
+    def split_into_sentences(self, text: Transcript) -> List[str]:
         """Split text into sentences using regex instead of NLTK tokenizer"""
-        # Simple regex-based sentence splitting - more aggressive to get shorter quotes
-        sentences = []
-        # First split by obvious sentence boundaries
-        raw_splits = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s', text)
-        
-        # Then further split long sentences by common conjunctions and pauses
-        for raw in raw_splits:
-            if len(raw.strip()) > 100:  # Only split long sentences
-                sub_sentences = re.split(r'(?<=\,|\;)\s+|(?<=\sand\s)|(?<=\sbut\s)|(?<=\sor\s)|(?<=\sso\s)', raw)
-                sentences.extend([s.strip() for s in sub_sentences if len(s.strip()) > 20])
+        return list(self.iter_split(text))
+    
+    def iter_split(self, text: Transcript) -> Iterator[str]:
+        """Stream candidate quotes from text as sentence boundaries arrive"""
+        return (sentence for _, sentence in self.iter_split_offsets(text))
+    
+    def iter_split_offsets(self, text: Transcript) -> Iterator[Tuple[int, str]]:
+        """
+        Stream candidate quotes, with the offset of each in the text, as sentence boundaries arrive
+        
+        Text is split at sentence ends, and sentences over LONG_SENTENCE_CHARS are split
+        again at commas, semicolons and conjunctions to get shorter quotes.
+        """
+        buffer = ''  # a few characters of lookbehind context, then the pending sentence
+        base = 0  # offset of buffer in the text
+        start = 0  # where the pending sentence starts in buffer
+        clauses = None  # an overlong pending sentence being clause-split as it streams
+        clause_base = 0
+        clause_pos = 0
+        
+        for chunk in chain(iter_chunks(text), (None,)):
+            if chunk is None:
+                ends = [(len(buffer), len(buffer))]
             else:
-                sentences.append(raw.strip())
-                
-        # Filter out very short sentences (likely not meaningful)
-        return [s for s in sentences if len(s.strip()) > 20 and len(s.strip()) < 200]
+                # A boundary can start with punctuation that ended the previous chunk
+                scan = max(len(buffer) - 1, 0)
+                buffer += chunk
+                ends = [(match.end() - 1, match.end()) for match in _SENTENCE_END.finditer(buffer, scan)]
+            
+            for end, next_start in ends:
+                if clauses is None:
+                    yield from _sentences_from_raw(buffer[start:end], base + start)
+                else:
+                    yield from self._split_clauses(clauses + buffer[start:end], clause_pos, clause_base, final=True)[0]
+                    clauses = None
+                start = next_start
+            
+            # Only a pending sentence that is already long once stripped is certain to be clause-split
+            if len(buffer) - start > MAX_PENDING_CHARS and len(buffer[start:].strip()) > LONG_SENTENCE_CHARS:
+                if clauses is None:
+                    clauses, clause_base, clause_pos = '', base + start, 0
+                pieces, clause_pos = self._split_clauses(clauses + buffer[start:], clause_pos, clause_base, final=False)
+                remainder = pieces.pop()
+                clause_base += len(clauses) + len(buffer) - start - len(remainder)
+                clauses = remainder
+                yield from pieces
+                start = len(buffer)
+            
+            keep = max(0, start - _SENTENCE_CONTEXT)
+            buffer = buffer[keep:]
+            base += keep
+            start -= keep
+    
+    @staticmethod
+    def _split_clauses(text: str, pos: int, base: int, final: bool) -> Tuple[List, int]:
+        """
+        Clause-split a long sentence from pos on, where text starts at offset base
+        
+        Returns the (offset, quote) candidates found, followed (unless final) by the
+        unsplit remainder with its lookbehind context, and the remainder's position in it.
+        """
+        pieces = []
+        last = pos
+        for match in _CLAUSE_BREAK.finditer(text, pos):
+            candidate = _candidate(text, last, match.start(), base)
+            if candidate is not None:
+                pieces.append(candidate)
+            last = match.end()
+        if final:
+            candidate = _candidate(text, last, len(text), base)
+            if candidate is not None:
+                pieces.append(candidate)
+            return pieces, 0
+        keep = max(0, last - _CLAUSE_CONTEXT)
+        pieces.append(text[keep:])
+        return pieces, last - keep
+    
+    def iter_sentences(self, transcript: Transcript) -> Iterator[str]:
+        """Stream candidate quotes from a transcript, cleaning and splitting lazily"""
+        return self.iter_split(self.iter_clean(transcript))
+    
+    def iter_segment_sentences(self, segments: Iterable) -> Iterator[Tuple[str, float]]:
+        """
+        Stream candidate quotes with their start times from raw transcript segments
+        
+        Segment texts are joined as format_transcript and clean_transcript would join
+        them, so sentences span segment boundaries and the quotes are the same as for
+        the rendered transcript. Each quote starts at the time of the segment holding
+        its first character.
+        """
+        starts = deque()  # (offset, start time) of segments streamed ahead of the splitter
+        
+        def texts() -> Iterator[str]:
+            offset = 0
+            for segment in segments:
+                text, start = segment_fields(segment)
+                text = ' '.join(text.split())
+                if not text:
+                    continue
+                if offset:
+                    text = ' ' + text
+                starts.append((offset + 1 if offset else 0, start))
+                offset += len(text)
+                yield text
+        
+        current = 0.0
+        for offset, sentence in self.iter_split_offsets(texts()):
+            while starts and starts[0][0] <= offset:
+                current = starts.popleft()[1]
+            yield sentence, current
     
     def analyze_sentiment(self, text: str) -> Dict[str, float]:
         """Analyze sentiment of a text segment"""
-        return self.sia.polarity_scores(text)
+        if self.cache is None:
+            return self.sia.polarity_scores(text)
+        key = sentence_key(text)
+        scores = self.cache.get(key)
+        if scores is not None:
+            return dict(zip(SCORE_FIELDS, scores))
+        result = self.sia.polarity_scores(text)
+        self.cache.put(key, tuple(result[field] for field in SCORE_FIELDS))
+        return result
     
-    def get_top_quotes(self, transcript: str, top_n: int = 5, sentiment_type: str = 'positive') -> List[Dict]:
+    def compound_scores(self, sentences: List[str]) -> List[float]:
+        """
+        Batch-score sentences, taking memoized scores from the cache with memoize_batches
+        
+        Only sentences missing from the cache are scored, each distinct one once.
+        """
+        if self.cache is None or not self.memoize_batches:
+            return self.scorer.compound_scores(sentences)
+        keys = [sentence_key(sentence) for sentence in sentences]
+        found = self.cache.get_many(keys)
+        missing = {}
+        for index, scores in enumerate(found):
+            if scores is None:
+                missing.setdefault(keys[index], index)
+        if missing:
+            scored = self.scorer.polarity_scores([sentences[index] for index in missing.values()])
+            columns = zip(*(scored[field].tolist() for field in SCORE_FIELDS))
+            new = dict(zip(missing, columns))
+            self.cache.put_many(new.items())
+            found = [new[keys[index]] if scores is None else scores for index, scores in enumerate(found)]
+        return [scores[3] for scores in found]
+    
+    def get_top_quotes(self, transcript: Transcript, top_n: int = 5, sentiment_type: str = 'positive',
+                       workers: Optional[int] = None) -> List[Dict]:
         """
         Extract top positive or negative quotes from transcript
         
         Args:
-            transcript: The transcript text with timestamps
+            transcript: The transcript text with timestamps, or an iterable of text chunks
             top_n: Number of top sentences to return
             sentiment_type: 'positive' or 'negative'
+            workers: Number of processes to score sentences on (default: score in this process)
             
         Returns:
             List of top quotes with their sentiment scores
         """
-        # Clean and prepare text
-        cleaned_text = self.clean_transcript(transcript)
-        sentences = self.split_into_sentences(cleaned_text)
-        
-        # Analyze each sentence
-        analyzed_sentences = []
-        for sentence in sentences:
-            sentiment = self.analyze_sentiment(sentence)
-            analyzed_sentences.append({
-                'text': sentence,
-                'compound': sentiment['compound'],
-                'positive': sentiment['pos'],
-                'negative': sentiment['neg'],
-                'neutral': sentiment['neu']
-            })
-        
-        # Sort by compound score (overall sentiment)
+        heaps = self.score_sentences(transcript, top_n,
+                                     positive=sentiment_type == 'positive',
+                                     negative=sentiment_type != 'positive',
+                                     workers=workers)
         if sentiment_type == 'positive':
-            filtered_sentences = sorted(
-                [s for s in analyzed_sentences if s['compound'] > 0.2],  # Lower threshold to get more results
-                key=lambda x: x['compound'],
-                reverse=True
-            )
-        else:  # negative
-            filtered_sentences = sorted(
-                [s for s in analyzed_sentences if s['compound'] < -0.2],  # Lower threshold to get more results
-                key=lambda x: x['compound']
-            )
-        
-        # Format results - return just the quotes with scores
-        top_quotes = [{'quote': self.format_quote(s['text']), 'score': s['compound']} 
-                      for s in filtered_sentences[:top_n]]
-        
-        return top_quotes
+            return self.format_quotes(heaps.positive())
+        return self.format_quotes(heaps.negative())
+    
+    def get_top_sentiments(self, transcript: Transcript, top_n: int = 5,
+                           workers: Optional[int] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Extract top positive and top negative quotes in a single pass
+        
+        Each sentence is scored once. Results are identical to calling
+        get_top_quotes for each polarity.
+        
+        Args:
+            transcript: The transcript text with timestamps, or an iterable of text chunks
+            top_n: Number of top sentences of each polarity to return
+            workers: Number of processes to score sentences on (default: score in this process)
+            
+        Returns:
+            Tuple of (top positive quotes, top negative quotes)
+        """
+        heaps = self.score_sentences(transcript, top_n, workers=workers)
+        return self.format_quotes(heaps.positive()), self.format_quotes(heaps.negative())
+    
+    def get_top_quotes_from_segments(self, segments: Iterable, top_n: int = 5, sentiment_type: str = 'positive',
+                                     video_id: Optional[str] = None, workers: Optional[int] = None) -> List[Dict]:
+        """
+        Extract top positive or negative quotes from raw transcript segments
+        
+        Args:
+            segments: Transcript segments with text and start time (see segment_fields)
+            top_n: Number of top sentences to return
+            sentiment_type: 'positive' or 'negative'
+            video_id: YouTube video ID for deep links (optional)
+            workers: Number of processes to score sentences on (default: score in this process)
+            
+        Returns:
+            List of top quotes with their sentiment scores, start times and links
+        """
+        heaps = self.score_segments(segments, top_n,
+                                    positive=sentiment_type == 'positive',
+                                    negative=sentiment_type != 'positive',
+                                    workers=workers)
+        if sentiment_type == 'positive':
+            return self.format_quotes(heaps.positive(), video_id)
+        return self.format_quotes(heaps.negative(), video_id)
+    
+    def get_top_sentiments_from_segments(self, segments: Iterable, top_n: int = 5, video_id: Optional[str] = None,
+                                         workers: Optional[int] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Extract top positive and top negative quotes from raw transcript segments in a single pass
+        
+        Args:
+            segments: Transcript segments with text and start time (see segment_fields)
+            top_n: Number of top sentences of each polarity to return
+            video_id: YouTube video ID for deep links (optional)
+            workers: Number of processes to score sentences on (default: score in this process)
+            
+        Returns:
+            Tuple of (top positive quotes, top negative quotes)
+        """
+        heaps = self.score_segments(segments, top_n, workers=workers)
+        return self.format_quotes(heaps.positive(), video_id), self.format_quotes(heaps.negative(), video_id)
+    
+    def sentiment_timeline(self, segments: Iterable, window_seconds: float = 60.0,
+                           step_seconds: Optional[float] = None) -> Dict:
+        """
+        Track how sentiment evolves over a transcript
+        
+        Every sentence is scored once and placed at the start time of its
+        segment; the windows are then aggregated with timeline_windows.
+        
+        Args:
+            segments: Transcript segments with text and start time (see segment_fields)
+            window_seconds: Width of each window in seconds
+            step_seconds: Distance between window starts (default: window_seconds)
+            
+        Returns:
+            Dict with "window_seconds", "step_seconds" and the parallel lists
+            "start", "count", "mean", "min" and "max" of compound scores
+        """
+        step_seconds = step_seconds or window_seconds
+        items = self.iter_segment_sentences(segments)
+        starts = []
+        scores = []
+        for chunk in iter(lambda: list(islice(items, CHUNK_SENTENCES)), []):
+            sentences, chunk_starts = zip(*chunk)
+            starts.extend(chunk_starts)
+            scores.extend(self.compound_scores(list(sentences)))
+        
+        timeline = timeline_windows(np.asarray(starts, dtype=np.float64), np.asarray(scores, dtype=np.float64),
+                                    window_seconds, step_seconds)
+        return {"window_seconds": window_seconds, "step_seconds": step_seconds, **timeline}
+    
+    def score_all(self, transcript: Transcript,
+                  progress: Optional[Callable[[float], None]] = None) -> ScoredSentences:
+        """
+        Score every candidate quote of a transcript once, to answer repeated queries
+        
+        Args:
+            transcript: The transcript text with timestamps, or an iterable of text chunks
+            progress: Called after each batch with the fraction of the input scored (optional)
+        """
+        total = len(transcript) if isinstance(transcript, str) else 0
+        consumed = [0]
+        
+        def chunks() -> Iterator[str]:
+            for chunk in iter_chunks(transcript):
+                consumed[0] += len(chunk)
+                yield chunk
+        
+        return self._score_all(self.iter_sentences(chunks()), False, lambda: consumed[0] / total if total else 0.0,
+                               progress)
+    
+    def score_all_segments(self, segments: Iterable,
+                           progress: Optional[Callable[[float], None]] = None) -> ScoredSentences:
+        """
+        Score every candidate quote of raw transcript segments once, keeping start times
+        
+        Args:
+            segments: Transcript segments with text and start time (see segment_fields)
+            progress: Called after each batch with the fraction of the segments scored (optional)
+        """
+        total = len(segments) if hasattr(segments, '__len__') else 0
+        consumed = [0]
+        
+        def counted() -> Iterator:
+            for segment in segments:
+                consumed[0] += 1
+                yield segment
+        
+        return self._score_all(self.iter_segment_sentences(counted()), True,
+                               lambda: consumed[0] / total if total else 0.0, progress)
+    
+    def _score_all(self, items: Iterator, timed: bool, fraction: Callable[[], float],
+                   progress: Optional[Callable[[float], None]]) -> ScoredSentences:
+        """Batch-score sentences, or (sentence, start) pairs when timed, keeping all of them"""
+        sentences = []
+        scores = []
+        starts = [] if timed else None
+        for chunk in iter(lambda: list(islice(items, CHUNK_SENTENCES)), []):
+            if timed:
+                chunk, chunk_starts = (list(column) for column in zip(*chunk))
+                starts.extend(chunk_starts)
+            sentences.extend(chunk)
+            scores.extend(self.compound_scores(chunk))
+            if progress:
+                progress(min(fraction(), 1.0))
+        if progress:
+            progress(1.0)
+        return ScoredSentences(sentences, scores, starts)
+    
+    def score_sentences(self, transcript: Transcript, top_n: int, positive: bool = True, negative: bool = True,
+                        workers: Optional[int] = None) -> TopQuoteHeaps:
+        """
+        Clean, split and batch-score a transcript, keeping the top_n quotes of each polarity
+        
+        Sentences stream from the transcript into batches of CHUNK_SENTENCES, so memory
+        stays flat for very long input. With workers > 1, batches are scored on a
+        process pool, with this analyzer's lexicon and a bounded number in flight
+        (the score memo only saves work, so it is not shared). Every entry carries its
+        document position, so the result does not depend on the number of workers.
+        """
+        return self._score_stream(self.iter_sentences(transcript), False, top_n, positive, negative, workers)
+    
+    def score_segments(self, segments: Iterable, top_n: int, positive: bool = True, negative: bool = True,
+                       workers: Optional[int] = None) -> TopQuoteHeaps:
+        """Split and batch-score raw transcript segments, keeping the top_n quotes of each polarity with start times"""
+        return self._score_stream(self.iter_segment_sentences(segments), True, top_n, positive, negative, workers)
+    
+    def _score_stream(self, items: Iterator, timed: bool, top_n: int, positive: bool, negative: bool,
+                      workers: Optional[int]) -> TopQuoteHeaps:
+        """Score sentences, or (sentence, start) pairs when timed, in batches"""
+        heaps = TopQuoteHeaps(top_n, positive=positive, negative=negative)
+        chunks = iter(lambda: list(islice(items, CHUNK_SENTENCES)), [])
+        
+        first = next(chunks, [])
+        second = next(chunks, []) if len(first) == CHUNK_SENTENCES else []
+        chunks = enumerate(chain((first, second), chunks) if second else (first,))
+        
+        def batches():
+            for index, chunk in chunks:
+                if timed:
+                    sentences, starts = (list(column) for column in zip(*chunk))
+                else:
+                    sentences, starts = chunk, None
+                yield sentences, index * CHUNK_SENTENCES, starts
+        
+        # A transcript that fits in one chunk is not worth a trip to the pool
+        if not workers or workers <= 1 or not second:
+            for sentences, offset, starts in batches():
+                heaps.merge(self.score_batch(sentences, top_n, positive, negative, offset, starts))
+            return heaps
+        
+        pool = get_scoring_pool(workers)
+        in_flight = deque()
+        for sentences, offset, starts in batches():
+            in_flight.append(pool.submit(_score_chunk, self.lexicon_path, sentences, offset, top_n, positive,
+                                         negative, starts))
+            if len(in_flight) >= workers * 2:
+                heaps.merge(in_flight.popleft().result())
+        while in_flight:
+            heaps.merge(in_flight.popleft().result())
+        return heaps
+    
+    def score_batch(self, sentences: List[str], top_n: int, positive: bool = True, negative: bool = True,
+                    offset: int = 0, starts: Optional[List[float]] = None) -> TopQuoteHeaps:
+        """
+        Score a list of sentences, keeping the top_n quotes of each polarity
+        
+        Args:
+            sentences: Sentences to score
+            top_n: Number of top sentences of each polarity to keep
+            positive: Whether to keep positive quotes
+            negative: Whether to keep negative quotes
+            offset: Document position of the first sentence
+            starts: Start time of each sentence (optional)
+        """
+        heaps = TopQuoteHeaps(top_n, positive=positive, negative=negative)
+        for index, compound in enumerate(self.compound_scores(sentences)):
+            heaps.push(offset + index, sentences[index], compound, starts[index] if starts else None)
+        return heaps
+    
+    def format_quotes(self, scored: List[Tuple[str, float, Optional[float]]], video_id: Optional[str] = None) -> List[Dict]:
+        """
+        Format (sentence, compound, start) entries as quotes with their scores
+        
+        Quotes with a start time also get "start" (seconds), "timestamp" (MM:SS) and,
+        given a video_id, a "url" that opens the video at that time.
+        """
+        quotes = []
+        for sentence, compound, start in scored:
+            quote = {'quote': self.format_quote(sentence), 'score': compound}
+            if start is not None:
+                quote['start'] = start
+                quote['timestamp'] = format_timestamp(start)
+                if video_id:
+                    quote['url'] = timestamp_url(video_id, start)
+            quotes.append(quote)
+        return quotes
     
     def format_quote(self, text: str) -> str:
         """Format a quote for better readability"""
@@ -105,3 +804,76 @@ class SentimentAnalyzer:
         text = text.replace("  ", " ").strip()
         
         return f'"{text}"'
+
+
+_shared_analyzer: Optional[SentimentAnalyzer] = None
+_shared_lock = threading.Lock()
+
+
+def get_analyzer() -> SentimentAnalyzer:
+    """
+    Get the process-wide SentimentAnalyzer, creating it on first use
+    
+    The analyzer memoizes sentence scores in a thread-safe LRU cache of
+    SENTIMENT_CACHE_SIZE entries (default 50000, 0 disables it), so it is safe
+    to share across callers and threads. With SENTIMENT_CACHE_PATH set, the memo
+    is loaded from that file and saved back when the process exits, and with
+    SENTIMENT_CACHE_BATCHES set batch scoring uses it too.
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_lock:
+            if _shared_analyzer is None:
+                memoize_batches = os.getenv("SENTIMENT_CACHE_BATCHES", "false").lower() in ("1", "true", "yes")
+                _shared_analyzer = SentimentAnalyzer(cache=create_score_cache(), memoize_batches=memoize_batches)
+    return _shared_analyzer
+
+
+def create_score_cache() -> Optional[SentenceScoreCache]:
+    """Sentence score memo configured by SENTIMENT_CACHE_SIZE and SENTIMENT_CACHE_PATH"""
+    size = int(os.getenv("SENTIMENT_CACHE_SIZE", 50000))
+    if size <= 0:
+        return None
+    path = os.getenv("SENTIMENT_CACHE_PATH") or None
+    cache = SentenceScoreCache(size, path)
+    if path:
+        atexit.register(cache.save)
+    return cache
+
+
+_worker_analyzers: Dict[str, SentimentAnalyzer] = {}
+
+
+def _worker_analyzer(lexicon_path: str) -> SentimentAnalyzer:
+    """Analyzer a scoring worker uses for lexicon_path: the shared one for the default lexicon"""
+    if lexicon_path == LEXICON_PATH:
+        return get_analyzer()
+    analyzer = _worker_analyzers.get(lexicon_path)
+    if analyzer is None:
+        analyzer = _worker_analyzers[lexicon_path] = SentimentAnalyzer(lexicon_path)
+    return analyzer
+
+
+def _score_chunk(lexicon_path: str, sentences: List[str], offset: int, top_n: int, positive: bool,
+                 negative: bool, starts: Optional[List[float]] = None) -> TopQuoteHeaps:
+    """Pool task: score a run of consecutive sentences starting at document position offset"""
+    return _worker_analyzer(lexicon_path).score_batch(sentences, top_n, positive, negative, offset, starts)
+
+
+_scoring_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_scoring_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the process pool used for parallel scoring, starting it on first use
+    
+    Each worker loads the default lexicon once when it starts, and any other
+    lexicon the first time a task asks for it; pools are kept for reuse across
+    calls.
+    """
+    with _pools_lock:
+        pool = _scoring_pools.get(workers)
+        if pool is None:
+            pool = _scoring_pools[workers] = ProcessPoolExecutor(max_workers=workers, initializer=get_analyzer)
+        return pool
@@ -5,6 +5,7 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
+from app.analysis_service import AnalysisService
 from app.api import app
 
 
@@ -88,3 +89,168 @@ class TestAPI:
         data = response.json()
         assert data["status"] == "error"
         assert "Transcripts are disabled" in data["message"]
+
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_content_youtube_includes_summary(self, mock_get):
+        """Test that YouTube content is summarized from the spoken text"""
+        mock_get.return_value = {
+            "status": "success",
+            "transcript": [
+                {"text": "Today we review the new electric bicycle.", "start": 0.0},
+                {"text": "The electric bicycle battery lasts all week.", "start": 4.0}
+            ],
+            "language": "en"
+        }
+        
+        response = client.post(
+            "/content",
+            json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["content_type"] == "youtube"
+        assert "[00:" not in data["summary"]
+        assert any("electric bicycle" in keyword for keyword in data["keywords"])
+
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_content_youtube_unformatted_segments(self, mock_get):
+        """Test that format_text=False returns the transcript segments as a list"""
+        segments = [
+            {"text": "Today we review the new electric bicycle.", "start": 0.0, "duration": 4.0},
+            {"text": "The electric bicycle battery lasts all week.", "start": 4.0, "duration": 3.5}
+        ]
+        mock_get.return_value = {"status": "success", "transcript": segments, "language": "en"}
+
+        response = client.post(
+            "/content",
+            json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "format_text": False}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["text"] == segments
+
+    def test_quotes_from_text_is_cached(self):
+        """Test quote extraction from text and caching by content hash"""
+        AnalysisService.clear_cache()
+        text = ("I absolutely love this wonderful and amazing little café. "
+                "The service was terrible and the soup was cold and awful.")
+        
+        first = client.post("/quotes", json={"text": text, "sentiment_type": "negative", "top_n": 3})
+        second = client.post("/quotes", json={"text": text, "sentiment_type": "negative", "top_n": 3})
+        
+        assert first.status_code == 200
+        data = first.json()
+        assert data["status"] == "success"
+        assert data["cached"] is False
+        assert len(data["quotes"]) == 1
+        assert data["quotes"][0]["score"] < 0
+        assert second.json()["cached"] is True
+        assert second.json()["quotes"] == data["quotes"]
+    
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_analyze_youtube_url(self, mock_get):
+        """Test analysis of a YouTube transcript fetched server-side"""
+        AnalysisService.clear_cache()
+        mock_get.return_value = {
+            "status": "success",
+            "transcript": [
+                {"text": "This is the best and most beautiful song ever written.", "start": 0.0},
+                {"text": "I hate how sad and painful the ending is for everyone.", "start": 5.0}
+            ],
+            "language": "en"
+        }
+        
+        response = client.get("/analyze", params={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["content_type"] == "youtube"
+        assert "best" in data["top_positive"][0]["quote"]
+        assert "hate" in data["top_negative"][0]["quote"]
+        assert data["video_id"] == "dQw4w9WgXcQ"
+        assert data["top_negative"][0]["timestamp"] == "00:05"
+        assert data["top_negative"][0]["url"] == "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5s"
+
+    @patch("app.summary_service.SummaryService.enrich")
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_analyze_youtube_url_skips_summary(self, mock_get, mock_enrich):
+        """Test that analyzing a YouTube transcript does not summarize it"""
+        AnalysisService.clear_cache()
+        mock_get.return_value = {
+            "status": "success",
+            "transcript": [{"text": "This is the best song ever written.", "start": 0.0}],
+            "language": "en"
+        }
+
+        response = client.get("/analyze", params={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"})
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "success"
+        mock_enrich.assert_not_called()
+
+    def test_analyze_requires_url_or_text(self):
+        """Test that an analysis request without input is rejected"""
+        response = client.post("/analyze", json={"top_n": 3})
+        assert response.status_code == 400
+    
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_timeline_youtube_url(self, mock_get):
+        """Test the windowed sentiment timeline of a YouTube transcript"""
+        AnalysisService.clear_cache()
+        mock_get.return_value = {
+            "status": "success",
+            "transcript": [
+                {"text": "This is the best and most beautiful song ever written.", "start": 0.0},
+                {"text": "I hate how sad and painful the ending is.", "start": 35.0},
+                {"text": "The bridge in the middle is perfectly okay, I guess.", "start": 95.0}
+            ],
+            "language": "en"
+        }
+        
+        response = client.get("/timeline", params={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                                                   "window_seconds": 60, "step_seconds": 30})
+        
+        assert response.status_code == 200
+        timeline = response.json()["timeline"]
+        assert timeline["start"] == [0.0, 30.0, 60.0, 90.0]
+        assert timeline["count"] == [2, 1, 1, 1]
+        assert timeline["max"][0] > 0 > timeline["min"][0]
+        assert timeline["mean"][1] == timeline["min"][1] < 0
+    
+    def test_timeline_requires_youtube(self):
+        """Test that a timeline is refused for web pages"""
+        with patch("app.web_content_service.WebContentService.extract_content") as mock_extract:
+            mock_extract.return_value = {"status": "success", "title": "Page", "text": "Great news."}
+            response = client.post("/timeline", json={"url": "https://example.com/article"})
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "error"
+    
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_large_responses_are_gzipped(self, mock_get):
+        """Test that large responses are compressed for clients that accept gzip"""
+        mock_get.return_value = {
+            "status": "success",
+            "transcript": [{"text": f"Segment number {i} of a long video.", "start": float(i)} for i in range(200)],
+            "language": "en"
+        }
+        
+        response = client.post("/content", json={"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"},
+                               headers={"Accept-Encoding": "gzip"})
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["text"].startswith("[00:00] Segment number 0")
+
+    def test_start_warms_process_workers(self, monkeypatch):
+        """Test that the warm-up tasks of a process pool complete instead of failing to pickle"""
+        AnalysisService.shutdown()
+        monkeypatch.setenv("ANALYZER_WORKERS", "2")
+        try:
+            futures = AnalysisService.start()
+            assert [future.result(timeout=60) for future in futures] == [None, None]
+        finally:
+            AnalysisService.shutdown()
@@ -0,0 +1,127 @@
+"""
+Tests for the shared API client
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from api_client import AsyncContentClient, create_session, extract_content, get_session
+
+SUCCESS = {"status": "success", "url": "https://example.com", "content_type": "webpage", "text": "Hello"}
+
+
+class FlakyServer:
+    """Local HTTP/1.1 server answering /content with queued status codes, then success"""
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append((body, self.headers.get("Accept-Encoding")))
+                server.connections.add(self.client_address)
+                status = server.statuses.pop(0) if server.statuses else 200
+                payload = json.dumps(SUCCESS if status == 200 else {"detail": "busy"}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class TestAPIClient:
+    """Test cases for the shared API client"""
+
+    def test_shared_session_is_reused(self):
+        """Test that the CLIs share one pooled session"""
+        assert get_session() is get_session()
+        assert "gzip" in get_session().headers["Accept-Encoding"]
+
+    def test_retries_then_keeps_connection_alive(self):
+        """Test that 429/5xx responses are retried and later calls reuse the connection"""
+        session = create_session(backoff_factor=0)
+        with FlakyServer([503, 429]) as server:
+            first = extract_content("https://example.com", format_text=False, api_url=server.url, session=session)
+            second = extract_content("https://example.com", api_url=server.url, session=session)
+
+        assert first == SUCCESS and second == SUCCESS
+        assert len(server.requests) == 4
+        assert server.requests[0] == ({"url": "https://example.com", "language": None, "format_text": False},
+                                      "gzip, deflate")
+        assert len(server.connections) == 1
+
+    def test_gives_up_after_retries(self):
+        """Test that the last error response is reported once retries run out"""
+        session = create_session(retries=1, backoff_factor=0)
+        with FlakyServer([500, 502, 503]) as server:
+            result = extract_content("https://example.com", api_url=server.url, session=session)
+        assert result.startswith("Error: 502")
+
+    def test_connection_error(self):
+        """Test that an unreachable API gives a connection error message"""
+        session = create_session(retries=0)
+        result = extract_content("https://example.com", api_url="http://127.0.0.1:9", session=session)
+        assert result.startswith("Connection error")
+
+    def test_async_client_retries_and_keeps_order(self):
+        """Test the httpx variant against a transport that rate-limits every first attempt"""
+        attempts = {}
+
+        def handler(request):
+            url = json.loads(request.content)["url"]
+            attempts[url] = attempts.get(url, 0) + 1
+            if attempts[url] == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={**SUCCESS, "url": url})
+
+        async def run():
+            async with AsyncContentClient(backoff_factor=0, transport=httpx.MockTransport(handler)) as client:
+                return await client.extract_many([f"https://example.com/{i}" for i in range(20)], concurrency=5)
+
+        results = asyncio.run(run())
+        assert [result["url"] for result in results] == [f"https://example.com/{i}" for i in range(20)]
+        assert set(attempts.values()) == {2}
+
+    def test_local_mode_matches_api(self):
+        """Test that in-process extraction returns exactly what /content returns"""
+        from unittest.mock import patch
+
+        from fastapi.testclient import TestClient
+
+        from app.api import ContentResponse, app
+        from app.content_service import RESPONSE_FIELDS
+
+        assert tuple(ContentResponse.model_fields) == RESPONSE_FIELDS
+        transcript = {"status": "success", "language": "en",
+                      "transcript": [{"text": "Electric bicycles are wonderful.", "start": 0.0},
+                                     {"text": "The battery lasts all week.", "start": 3.5}]}
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        with patch("app.transcript_service.TranscriptService.get_transcript", return_value=transcript):
+            for format_text in (True, False):
+                served = TestClient(app).post("/content", json={"url": url, "format_text": format_text}).json()
+                assert extract_content(url, format_text=format_text, local=True) == served
+
+        assert extract_content("not a url", local=True).startswith("Error: 422")
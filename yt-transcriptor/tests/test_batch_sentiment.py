@@ -0,0 +1,104 @@
+"""
+Tests for the BatchSentimentScorer class
+"""
+import random
+
+import pytest
+from batch_sentiment import BatchSentimentScorer, normalize_token
+from sentiment_analyzer import get_analyzer
+
+# Sentences that exercise each VADER rule: boosters, caps, negation, "never so",
+# "least", "kind of", idioms, multi-word boosters, "but", punctuation and repeats
+REFERENCE_SENTENCES = [
+    "",
+    "a",
+    "!!!",
+    "The movie was good.",
+    "The movie was VERY GOOD!!!",
+    "The movie was not good at all.",
+    "The movie isn't really that great?",
+    "This was never so good, never this bad.",
+    "It was the least bad option, at least it was fine.",
+    "The food was kind of awful but the service was excellent!",
+    "That concert was the bomb and the shit, yeah right.",
+    "He said it would cut the mustard, a kiss of death really.",
+    "It is sort of nice and just enough fun.",
+    "Good good good BAD bad bad.",
+    "I don't hate it, I hate HATE it?!?",
+    "\"Wonderful,\" she said... (sadly) :) :(",
+    "Barely acceptable, hardly terrible, extremely mediocre??",
+    "KIND OF great, Kind of terrible, kindof okay.",
+]
+
+
+def random_corpus(size: int, seed: int = 11):
+    """Random sentences mixing lexicon words with function words, caps and punctuation"""
+    lexicon = get_analyzer().sia.lexicon
+    rng = random.Random(seed)
+    words = sorted(w for w in lexicon if w.isalpha())
+    fillers = ("the a movie it was is and I we this so but never not least at very kind of sort just "
+               "enough isn't don't shit bomb bad ass yeah right cut mustard kiss death hand to mouth "
+               "really extremely barely kinda").split()
+    marks = ["!", "?", ",", ".", "!!", "?!?", "...", ":)", "'"]
+
+    def word():
+        w = rng.choice(words) if rng.random() < 0.3 else rng.choice(fillers)
+        roll = rng.random()
+        if roll < 0.08:
+            w = w.upper()
+        elif roll < 0.12:
+            w = w.capitalize()
+        if rng.random() < 0.1:
+            w += rng.choice(marks)
+        if rng.random() < 0.03:
+            w = rng.choice(['"', "'", "(", "!"]) + w
+        return w
+
+    return [" ".join(word() for _ in range(rng.randint(0, 25))) for _ in range(size)]
+
+
+class TestBatchSentimentScorer:
+    """Test cases for BatchSentimentScorer"""
+    
+    @pytest.fixture(scope="class")
+    def scorer(self):
+        analyzer = get_analyzer()
+        return BatchSentimentScorer(analyzer.sia.lexicon, analyzer.sia.constants)
+    
+    @pytest.mark.parametrize("token,expected", [
+        ("a", ""),
+        ("good", "good"),
+        ("good!", "good"),
+        ("!good", "good"),
+        ("good?!?", "good"),
+        ("good...", "good..."),
+        ("(good", "(good"),
+        ("!good!", "!good!"),
+        ("don't!", "don't!"),
+        ("a!", "a!"),
+        (":)", ":)"),
+    ])
+    def test_normalize_token(self, token, expected):
+        """Test that tokens are stripped exactly like VADER's SentiText"""
+        assert normalize_token(token, frozenset(get_analyzer().sia.constants.PUNC_LIST)) == expected
+    
+    def test_matches_polarity_scores_on_reference_sentences(self, scorer):
+        """Test that every score matches polarity_scores on hand-picked rule cases"""
+        sia = get_analyzer().sia
+        scores = scorer.polarity_scores(REFERENCE_SENTENCES)
+        for index, sentence in enumerate(REFERENCE_SENTENCES):
+            expected = sia.polarity_scores(sentence)
+            for key in ("neg", "neu", "pos", "compound"):
+                assert scores[key][index] == pytest.approx(expected[key], abs=1e-4), (sentence, key)
+    
+    def test_compound_scores_match_polarity_scores(self, scorer):
+        """Test that batch compound scores match polarity_scores on a random corpus"""
+        sia = get_analyzer().sia
+        corpus = random_corpus(3000)
+        expected = [sia.polarity_scores(sentence)["compound"] for sentence in corpus]
+        assert scorer.compound_scores(corpus) == pytest.approx(expected, abs=1e-4)
+    
+    def test_empty_batch(self, scorer):
+        """Test that an empty batch scores to nothing"""
+        assert scorer.compound_scores([]) == []
+        assert len(scorer.polarity_scores([])["compound"]) == 0
@@ -0,0 +1,89 @@
+"""
+Tests for the on-disk content cache
+"""
+import os
+import time
+
+import api_client
+from content_cache import SUFFIX, ContentCache, content_key
+
+TRANSCRIPT = {"status": "success", "content_type": "youtube", "video_id": "abc123",
+              "text": [{"text": "I absolutely love this wonderful song so much.", "start": float(index)}
+                       for index in range(500)]}
+URL = "https://www.youtube.com/watch?v=abc123"
+
+
+def entry_files(path):
+    return sorted(name for name in os.listdir(path) if name.endswith(SUFFIX))
+
+
+class TestContentCache:
+    """Test cases for ContentCache"""
+
+    def test_round_trip_is_keyed_and_compressed(self, tmp_path):
+        """Test that entries are found only by the same URL, language and format_text, and stored compressed"""
+        cache = ContentCache(str(tmp_path))
+        cache.put(URL, "en", False, TRANSCRIPT)
+
+        assert cache.get(URL, "en", False) == TRANSCRIPT
+        assert cache.get(URL, None, False) is None
+        assert cache.get(URL, "en", True) is None
+        (name,) = entry_files(tmp_path)
+        assert os.path.getsize(tmp_path / name) * 10 < len(repr(TRANSCRIPT))
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+    def test_expired_and_corrupt_entries_are_misses(self, tmp_path):
+        """Test that entries older than the TTL and unreadable files are dropped"""
+        cache = ContentCache(str(tmp_path), ttl=60)
+        cache.put(URL, None, False, TRANSCRIPT)
+        (name,) = entry_files(tmp_path)
+        stored = time.time() - 120
+        os.utime(tmp_path / name, (stored, stored))
+        assert cache.get(URL, None, False) is None
+        assert entry_files(tmp_path) == []
+
+        cache.put(URL, None, False, TRANSCRIPT)
+        (tmp_path / name).write_bytes(b"not gzip")
+        assert cache.get(URL, None, False) is None
+        assert entry_files(tmp_path) == []
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that writes past max_bytes evict the entries read least recently"""
+        cache = ContentCache(str(tmp_path))
+        cache.put("https://example.com/0", None, True, TRANSCRIPT)
+        entry_size = cache.stats()["bytes"]
+        cache.clear()
+        cache = ContentCache(str(tmp_path), max_bytes=int(entry_size * 3.5))
+
+        now = time.time()
+        for index in range(3):
+            cache.put(f"https://example.com/{index}", None, True, TRANSCRIPT)
+            name = content_key(f"https://example.com/{index}", None, True) + SUFFIX
+            os.utime(tmp_path / name, (now - 100 + index, now))
+        assert cache.get("https://example.com/0", None, True) is not None  # 0 is now the most recently used
+        cache.put("https://example.com/3", None, True, TRANSCRIPT)
+
+        assert cache.stats()["bytes"] <= cache.max_bytes
+        assert cache.get("https://example.com/0", None, True) is not None
+        assert cache.get("https://example.com/1", None, True) is None
+        assert cache.get("https://example.com/3", None, True) is not None
+
+    def test_extract_content_skips_the_network_on_repeat(self, tmp_path, monkeypatch):
+        """Test that cached content is returned without a request, errors are not cached, and refresh refetches"""
+        calls = []
+
+        def fake_remote(url, language=None, format_text=True, api_url=None, session=None):
+            calls.append(url)
+            return "Error: 404 - not found" if "broken" in url else TRANSCRIPT
+
+        monkeypatch.setattr(api_client, "extract_content_remote", fake_remote)
+        cache = ContentCache(str(tmp_path))
+
+        for _ in range(3):
+            assert api_client.extract_content(URL, format_text=False, cache=cache) == TRANSCRIPT
+            assert api_client.extract_content("https://example.com/broken", cache=cache).startswith("Error")
+        assert calls == [URL] + ["https://example.com/broken"] * 3
+
+        assert api_client.extract_content(URL, format_text=False, cache=cache, refresh=True) == TRANSCRIPT
+        assert api_client.extract_content(URL, format_text=False) == TRANSCRIPT
+        assert calls.count(URL) == 3
@@ -0,0 +1,77 @@
+"""
+Tests for the content fingerprinting module
+"""
+import random
+
+import pytest
+from app.content_fingerprint import SimHashIndex, hamming_distance, simhash
+
+
+_VOCABULARY = (
+    "the city council approved new transit plan on tuesday after long debate adds "
+    "three bus lines extends light rail service to airport and funds protected bike "
+    "lanes downtown supporters said vote was overdue while opponents questioned "
+    "projected ridership numbers cost taxpayers mayor budget residents"
+).split()
+_rng = random.Random(7)
+# Article-length text (~800 words) built deterministically from a small vocabulary
+ARTICLE = " ".join(_rng.choice(_VOCABULARY) for _ in range(800))
+
+
+class TestSimHash:
+    """Test cases for SimHash fingerprints"""
+    
+    def test_identical_text_same_fingerprint(self):
+        """Test that identical text produces identical fingerprints"""
+        assert simhash(ARTICLE) == simhash(ARTICLE)
+    
+    def test_near_duplicate_is_close(self):
+        """Test that small edits keep fingerprints within a few bits"""
+        syndicated = "Updated: " + ARTICLE + " Reporting by staff. Copyright Example News."
+        assert hamming_distance(simhash(ARTICLE), simhash(syndicated)) <= 3
+    
+    def test_different_text_is_far(self):
+        """Test that unrelated text produces distant fingerprints"""
+        other = (
+            "A recipe for sourdough bread needs flour, water, salt and a lively starter. "
+            "Knead the dough, let it rest overnight in the fridge and bake it in a hot "
+            "dutch oven until the crust is deep brown and crackles as it cools."
+        )
+        assert hamming_distance(simhash(ARTICLE), simhash(other)) > 3
+    
+    def test_empty_text(self):
+        """Test fingerprint of empty text"""
+        assert simhash("") == 0
+
+
+class TestSimHashIndex:
+    """Test cases for SimHashIndex"""
+    
+    def test_add_reports_duplicate(self):
+        """Test that a near-duplicate is reported against the original key"""
+        index = SimHashIndex()
+        assert index.add("https://a.example/story", simhash(ARTICLE)) is None
+        duplicate = index.add("https://b.example/story", simhash(ARTICLE + " Reporting by staff."))
+        assert duplicate == "https://a.example/story"
+    
+    def test_same_key_is_not_duplicate(self):
+        """Test that re-adding the same key does not flag itself"""
+        index = SimHashIndex()
+        index.add("https://a.example/story", simhash(ARTICLE))
+        assert index.add("https://a.example/story", simhash(ARTICLE)) is None
+        assert len(index) == 1
+    
+    def test_eviction_bounds_memory(self):
+        """Test that the oldest entries are evicted past max_entries"""
+        index = SimHashIndex(max_entries=2)
+        index.add("first", 0x0000000000000000)
+        index.add("second", 0xFFFF0000FFFF0000)
+        index.add("third", 0x00FF00FF00FF00FF)
+        assert len(index) == 2
+        assert index.find(0x0000000000000000) is None
+        assert index.find(0xFFFF0000FFFF0000) == "second"
+    
+    def test_invalid_configuration(self):
+        """Test that a distance that cannot be guaranteed by banding is rejected"""
+        with pytest.raises(ValueError):
+            SimHashIndex(bands=4, max_distance=4)
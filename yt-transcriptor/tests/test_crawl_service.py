@@ -0,0 +1,179 @@
+"""
+Tests for the CrawlService class, run offline against a local fixture server
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.crawl_service import CrawlService
+from app.web_content_service import WebContentService
+
+
+ARTICLE_TEMPLATE = """<html><head><title>{title}</title></head><body>
+<article><h1>{title}</h1>
+<p>{title} is the subject of this article. Local reporters spent the week talking to residents,
+business owners and officials about what the change means for the neighbourhood.</p>
+<p>Most of the people we interviewed were cautiously optimistic, although several raised concerns
+about parking, noise and the timeline that the city published in its original proposal.</p>
+</article></body></html>"""
+
+
+def build_site(base):
+    """Fixture pages keyed by path"""
+    pages = {
+        "/sitemap_index.xml": f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{base}/sitemap_news.xml</loc></sitemap>
+</sitemapindex>""",
+        "/sitemap_news.xml": f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>{base}/articles/park</loc><lastmod>2024-05-01</lastmod></url>
+  <url><loc>{base}/articles/library</loc><lastmod>2024-05-02</lastmod></url>
+  <url><loc>{base}/articles/missing</loc></url>
+</urlset>""",
+        "/sitemap_partly_broken.xml": f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>{base}/sitemap_gone.xml</loc></sitemap>
+  <sitemap><loc>{base}/sitemap_truncated.xml</loc></sitemap>
+  <sitemap><loc>{base}/sitemap_news.xml</loc></sitemap>
+</sitemapindex>""",
+        "/sitemap_truncated.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>""",
+        "/rss.xml": f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>News</title>
+  <item><title>Park</title><link>{base}/articles/park</link><pubDate>Wed, 01 May 2024 10:00:00 GMT</pubDate></item>
+</channel></rss>""",
+        "/atom.xml": f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>News</title>
+  <entry><title>Library</title><link href="{base}/articles/library"/><updated>2024-05-02T10:00:00Z</updated></entry>
+</feed>""",
+        "/articles/park": ARTICLE_TEMPLATE.format(title="The new riverside park"),
+        "/articles/library": ARTICLE_TEMPLATE.format(title="The renovated central library"),
+    }
+    return pages
+
+
+@pytest.fixture(scope="module")
+def fixture_site():
+    """Serve the fixture pages from a local HTTP server"""
+    pages = {}
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            payload = body.encode("utf-8")
+            content_type = "application/xml" if self.path.endswith(".xml") else "text/html"
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    pages.update(build_site(base))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield base
+    server.shutdown()
+
+
+class TestCrawlService:
+    """Test cases for CrawlService"""
+    
+    def test_discover_urls_follows_sitemap_index(self, fixture_site):
+        """Test URL discovery through a sitemap index"""
+        entries = list(CrawlService.discover_urls(f"{fixture_site}/sitemap_index.xml"))
+        assert [e["url"] for e in entries] == [
+            f"{fixture_site}/articles/park",
+            f"{fixture_site}/articles/library",
+            f"{fixture_site}/articles/missing",
+        ]
+        assert entries[0]["lastmod"] == "2024-05-01"
+        assert entries[2]["lastmod"] is None
+    
+    def test_discover_urls_rss_and_atom(self, fixture_site):
+        """Test URL discovery from RSS and Atom feeds"""
+        rss = list(CrawlService.discover_urls(f"{fixture_site}/rss.xml"))
+        atom = list(CrawlService.discover_urls(f"{fixture_site}/atom.xml"))
+        assert rss == [{"url": f"{fixture_site}/articles/park", "lastmod": "Wed, 01 May 2024 10:00:00 GMT"}]
+        assert atom == [{"url": f"{fixture_site}/articles/library", "lastmod": "2024-05-02T10:00:00Z"}]
+    
+    def test_parse_feed_unsupported(self):
+        """Test that unknown XML documents are rejected"""
+        with pytest.raises(ValueError):
+            CrawlService.parse_feed(b"<html><body>not a feed</body></html>")
+    
+    def test_crawl_extracts_and_skips_unchanged(self, fixture_site):
+        """Test end-to-end crawl and lastmod-based skipping on the next run"""
+        WebContentService.fingerprint_index.clear()
+        state = {}
+        results = {r["url"]: r for r in CrawlService.crawl(f"{fixture_site}/sitemap_index.xml",
+                                                          state=state, max_workers=4, per_domain=2)}
+        
+        park = results[f"{fixture_site}/articles/park"]
+        assert park["status"] == "success"
+        assert "riverside park" in park["text"]
+        assert results[f"{fixture_site}/articles/missing"]["status"] == "error"
+        assert state == {
+            f"{fixture_site}/articles/park": "2024-05-01",
+            f"{fixture_site}/articles/library": "2024-05-02",
+        }
+        
+        rerun = {r["url"]: r["status"] for r in CrawlService.crawl(f"{fixture_site}/sitemap_index.xml",
+                                                                  state=state)}
+        assert rerun[f"{fixture_site}/articles/park"] == "skipped"
+        assert rerun[f"{fixture_site}/articles/library"] == "skipped"
+        assert rerun[f"{fixture_site}/articles/missing"] == "error"
+    
+    def test_crawl_continues_past_broken_sitemaps(self, fixture_site):
+        """Test that a 404 or malformed child sitemap is reported without stopping the crawl"""
+        results = list(CrawlService.crawl(f"{fixture_site}/sitemap_partly_broken.xml",
+                                          extract=lambda url: {"status": "success", "text": url}))
+        
+        errors = [r for r in results if r.get("type") == "sitemap"]
+        assert [r["url"] for r in errors] == [f"{fixture_site}/sitemap_gone.xml",
+                                              f"{fixture_site}/sitemap_truncated.xml"]
+        assert all(r["status"] == "error" for r in errors)
+        assert "404" in errors[0]["message"]
+        assert sorted(r["url"] for r in results if r.get("type") != "sitemap") == [
+            f"{fixture_site}/articles/library",
+            f"{fixture_site}/articles/missing",
+            f"{fixture_site}/articles/park",
+        ]
+    
+    def test_crawl_respects_per_domain_limit(self, fixture_site):
+        """Test that no more than per_domain extractions run at once for a domain"""
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        release = threading.Event()
+        
+        def slow_extract(url):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(0.05)
+            with lock:
+                active -= 1
+            return {"status": "success", "text": url}
+        
+        results = list(CrawlService.crawl(f"{fixture_site}/sitemap_index.xml", max_workers=8,
+                                          per_domain=1, extract=slow_extract))
+        assert len(results) == 3
+        assert peak == 1
+    
+    def test_state_round_trip(self, tmp_path):
+        """Test saving and loading crawl state"""
+        path = str(tmp_path / "state.json")
+        assert CrawlService.load_state(path) == {}
+        CrawlService.save_state(path, {"https://example.com/a": "2024-01-01"})
+        assert CrawlService.load_state(path) == {"https://example.com/a": "2024-01-01"}
@@ -0,0 +1,49 @@
+"""
+Tests for the streaming output writers
+"""
+import json
+
+import output_writers
+from app.transcript_service import TranscriptService
+from output_writers import OutputWriter, ndjson_records
+
+RESULT = {"status": "success", "content_type": "youtube", "video_id": "abc123", "title": "Café",
+          "text": [{"text": f"Segment {index} with ünïcode", "start": index * 2.5} for index in range(3000)]}
+
+
+class TestOutputWriters:
+    """Test cases for OutputWriter"""
+
+    def test_json_matches_dumps(self, tmp_path, monkeypatch):
+        """Test that streamed JSON is the same text as json.dumps, written in bounded pieces"""
+        monkeypatch.setattr(output_writers, "WRITE_CHUNK_CHARS", 1000)
+        path = tmp_path / "out.json"
+        with OutputWriter(str(path)) as out:
+            writes = []
+            write = out.stream.write
+            out.stream.write = lambda text: writes.append(len(text)) or write(text)
+            out.write_json(RESULT)
+
+        assert path.read_text(encoding="utf-8") == json.dumps(RESULT, indent=2)
+        assert len(writes) > 10 and max(writes) < 2000
+
+    def test_text_to_stdout_ends_like_print(self, capsys):
+        """Test that stdout output ends with a newline like print() and files get exactly what was written"""
+        with OutputWriter() as out:
+            out.write_all(TranscriptService.iter_format_transcript(RESULT["text"]))
+        assert capsys.readouterr().out == TranscriptService.format_transcript(RESULT["text"]) + "\n"
+
+        with OutputWriter(end="") as out:
+            out.write("no newline")
+        assert capsys.readouterr().out == "no newline"
+
+    def test_ndjson_records(self, tmp_path):
+        """Test that NDJSON has the result without its text first, then one segment per line"""
+        path = tmp_path / "out.ndjson"
+        with OutputWriter(str(path)) as out:
+            out.write_ndjson(ndjson_records(RESULT))
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0]) == {key: value for key, value in RESULT.items() if key != "text"}
+        assert [json.loads(line) for line in lines[1:]] == RESULT["text"]
+        assert list(ndjson_records({"status": "success", "text": "Page"})) == [{"status": "success", "text": "Page"}]
@@ -0,0 +1,154 @@
+"""
+Tests for on-demand request profiling
+"""
+import asyncio
+import marshal
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.api import app
+from app.profiling import ProfileStore, RequestProfiler, profile_store, pstats_text
+
+
+client = TestClient(app)
+TOKEN = "s3cret"
+VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+TRANSCRIPT = {
+    "status": "success",
+    "transcript": [{"text": "Hello world", "start": 0.0}],
+    "language": "en"
+}
+
+
+@pytest.fixture
+def profiling_env(monkeypatch):
+    """Enable profiling with a token and an empty store"""
+    monkeypatch.setenv("PROFILING_ENABLED", "true")
+    monkeypatch.setenv("PROFILING_TOKEN", TOKEN)
+    monkeypatch.delenv("PROFILING_SAMPLE_RATE", raising=False)
+    monkeypatch.delenv("PROFILING_MODE", raising=False)
+    profile_store.clear()
+    yield monkeypatch
+    profile_store.clear()
+
+
+class TestProfiling:
+    """Test cases for request profiling"""
+    
+    def test_disabled_by_default(self, monkeypatch):
+        """Test that the debug endpoints are hidden unless profiling is enabled"""
+        monkeypatch.delenv("PROFILING_ENABLED", raising=False)
+        response = client.get("/debug/profiles", headers={"X-Profile-Token": TOKEN})
+        assert response.status_code == 404
+    
+    def test_enabled_without_token_stays_disabled(self, monkeypatch):
+        """Test that profiling cannot be enabled without a token"""
+        monkeypatch.setenv("PROFILING_ENABLED", "true")
+        monkeypatch.delenv("PROFILING_TOKEN", raising=False)
+        response = client.get("/debug/profiles")
+        assert response.status_code == 404
+    
+    def test_wrong_token_rejected(self, profiling_env):
+        """Test that the debug endpoints require the token"""
+        response = client.get("/debug/profiles", headers={"X-Profile-Token": "wrong"})
+        assert response.status_code == 403
+    
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_debug_header_profiles_request(self, mock_get, profiling_env):
+        """Test that a request with the debug header is profiled and downloadable"""
+        mock_get.return_value = TRANSCRIPT
+        
+        response = client.get("/transcript", params={"url": VIDEO_URL},
+                              headers={"X-Profile": "1", "X-Profile-Token": TOKEN})
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+        
+        listing = client.get("/debug/profiles", headers={"X-Profile-Token": TOKEN}).json()["profiles"]
+        assert listing[0]["id"] == profile_id
+        assert listing[0]["path"] == "/transcript"
+        
+        download = client.get(f"/debug/profiles/{profile_id}", headers={"X-Profile-Token": TOKEN})
+        assert download.status_code == 200
+        stats = marshal.loads(download.content)
+        assert any(func[2] == "format_transcript" for func in stats)
+        
+        report = client.get(f"/debug/profiles/{profile_id}", params={"format": "text"},
+                            headers={"X-Profile-Token": TOKEN})
+        assert "Ordered by: cumulative time" in report.text
+    
+    def test_debug_header_without_token_not_profiled(self, profiling_env):
+        """Test that the debug header alone does not trigger profiling"""
+        response = client.get("/", headers={"X-Profile": "1"})
+        assert "X-Profile-Id" not in response.headers
+    
+    def test_sample_rate_profiles_all_requests(self, profiling_env):
+        """Test sampling a fraction of requests without the debug header"""
+        profiling_env.setenv("PROFILING_SAMPLE_RATE", "1.0")
+        profiling_env.setenv("PROFILING_MODE", "sample")
+        response = client.get("/")
+        profile_id = response.headers["X-Profile-Id"]
+        
+        download = client.get(f"/debug/profiles/{profile_id}", params={"format": "collapsed"},
+                              headers={"X-Profile-Token": TOKEN})
+        assert download.status_code == 200
+        assert response.headers["X-Profile-Id"] == profile_store.list()[0]["id"]
+
+    
+    @pytest.mark.parametrize("mode", ["cprofile", "sample"])
+    def test_profile_excludes_concurrent_requests(self, mode, monkeypatch):
+        """Test that work other tasks do while the profiled request awaits is not in its profile"""
+        monkeypatch.setenv("PROFILING_SAMPLE_INTERVAL_MS", "1")
+        
+        def spin(seconds):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                pass
+        
+        def profiled_work():
+            spin(0.05)
+        
+        def other_request_work():
+            spin(0.05)
+        
+        async def other_request():
+            other_request_work()
+        
+        async def child_task():
+            profiled_work()
+        
+        async def profiled_request():
+            # Started before profiling, so it runs in another request's context
+            other = asyncio.get_running_loop().create_task(other_request())
+            profiler = RequestProfiler.try_start(mode)
+            # A task the request starts itself belongs to its profile
+            await asyncio.get_running_loop().create_task(child_task())
+            await other
+            return profiler.stop()
+        
+        captured = asyncio.run(asyncio.wait_for(profiled_request(), 5))
+        if mode == "sample":
+            text = captured["data"].decode()
+        else:
+            text = "\n".join(func[2] for func in marshal.loads(captured["data"]))
+        assert "profiled_work" in text
+        assert "other_request_work" not in text
+
+
+class TestProfileStore:
+    """Test cases for ProfileStore"""
+    
+    def test_ring_buffer_is_bounded(self):
+        """Test that old profiles are dropped past the buffer size"""
+        from app.profiling import RequestProfiler
+        store = ProfileStore(size=2)
+        ids = []
+        for _ in range(3):
+            profiler = RequestProfiler.try_start("cprofile")
+            captured = profiler.stop()
+            ids.append(store.add("GET", "/", 200, profiler, captured))
+        assert [p["id"] for p in store.list()] == [ids[2], ids[1]]
+        assert store.get(ids[0]) is None
+        assert "function calls" in pstats_text(store.get(ids[2])["data"])
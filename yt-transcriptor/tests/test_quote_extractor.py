@@ -0,0 +1,69 @@
+"""
+Tests for quote_extractor batch mode
+"""
+import io
+import json
+import sys
+
+import quote_extractor
+
+
+def fake_extract_content(url, language=None, format_text=True, api_url=None, session=None, local=False, cache=None,
+                         refresh=False):
+    """Stand-in for the API: YouTube URLs get segments, broken URLs an error, others text"""
+    if "broken" in url:
+        return "Error: 404 - not found"
+    if "youtube" in url:
+        return {"status": "success", "content_type": "youtube", "video_id": "abc123",
+                "text": [{"text": "I absolutely love this wonderful song so much.", "start": 12.0}]}
+    return {"status": "success", "content_type": "webpage", "title": "Page",
+            "text": "What a truly great and happy day this was for everyone."}
+
+
+class TestQuoteExtractorBatch:
+    """Test cases for quote_extractor batch mode"""
+    
+    def test_run_batch_writes_one_record_per_url(self, monkeypatch):
+        """Test that every URL gets one NDJSON record, errors included"""
+        monkeypatch.setattr(quote_extractor, "extract_content", fake_extract_content)
+        urls = ["https://www.youtube.com/watch?v=abc123", "https://example.com/a", "https://example.com/broken"]
+        out = io.StringIO()
+        
+        counts = quote_extractor.run_batch(urls, out, top_n=2, workers=2)
+        
+        records = {record["url"]: record for record in map(json.loads, out.getvalue().splitlines())}
+        assert counts == {"success": 2, "error": 1}
+        assert set(records) == set(urls)
+        assert records[urls[0]]["quotes"][0]["url"] == "https://www.youtube.com/watch?v=abc123&t=12s"
+        assert records[urls[1]]["title"] == "Page" and records[urls[1]]["quotes"]
+        assert records[urls[2]] == {"url": urls[2], "status": "error", "message": "Error: 404 - not found"}
+    
+    def test_resume_skips_completed_urls(self, monkeypatch, tmp_path):
+        """Test that a rerun only fetches URLs without a successful record"""
+        urls_file = tmp_path / "urls.txt"
+        urls_file.write_text("https://example.com/a\n# comment\n\nhttps://example.com/b\n"
+                             "https://example.com/a\nhttps://example.com/broken\n")
+        output = tmp_path / "quotes.ndjson"
+        output.write_text(json.dumps({"url": "https://example.com/a", "status": "success", "quotes": []}) + "\n"
+                          + json.dumps({"url": "https://example.com/broken", "status": "error"}) + "\n"
+                          + '{"url": "https://example.com/b", "sta')
+        fetched = []
+        
+        def recording_extract_content(url, **kwargs):
+            fetched.append(url)
+            return fake_extract_content(url, **kwargs)
+        
+        monkeypatch.setattr(quote_extractor, "extract_content", recording_extract_content)
+        monkeypatch.setattr(sys, "argv", ["quote_extractor.py", "--batch", str(urls_file), "-o", str(output),
+                                          "--resume", "--workers", "2"])
+        quote_extractor.main()
+        
+        assert sorted(fetched) == ["https://example.com/b", "https://example.com/broken"]
+        records = []
+        for line in output.read_text().splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass
+        assert [r["url"] for r in records if r["status"] == "success"] == \
+            ["https://example.com/a", "https://example.com/b"]
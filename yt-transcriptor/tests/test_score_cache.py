@@ -0,0 +1,83 @@
+"""
+Tests for the sentence score memo
+"""
+import threading
+
+from score_cache import SentenceScoreCache, sentence_key
+from sentiment_analyzer import SentimentAnalyzer
+
+
+class TestSentenceScoreCache:
+    """Test cases for SentenceScoreCache"""
+
+    def test_key_normalizes_whitespace(self):
+        """Test that sentences differing only in whitespace share a key"""
+        assert sentence_key("  I love  this\nsong. ") == sentence_key("I love this song.")
+        assert sentence_key("I love this song.") != sentence_key("I LOVE this song.")
+
+    def test_lru_eviction_and_stats(self):
+        """Test that the least recently used entry is evicted and lookups are counted"""
+        cache = SentenceScoreCache(maxsize=2)
+        a, b, c = (sentence_key(text) for text in ("a", "b", "c"))
+        cache.put(a, (0.0, 1.0, 0.0, 0.0))
+        cache.put(b, (0.0, 1.0, 0.0, 0.1))
+        assert cache.get(a) is not None  # a is now the most recently used
+        cache.put(c, (0.0, 1.0, 0.0, 0.2))
+
+        assert cache.get(b) is None
+        assert cache.get_many([a, c]) == [(0.0, 1.0, 0.0, 0.0), (0.0, 1.0, 0.0, 0.2)]
+        assert cache.stats() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "size": 2, "maxsize": 2}
+
+    def test_persists_across_runs(self, tmp_path):
+        """Test that a saved memo is loaded by a new cache, keeping the most recent entries"""
+        path = str(tmp_path / "scores.marshal")
+        cache = SentenceScoreCache(maxsize=10, path=path)
+        for index in range(5):
+            cache.put(sentence_key(str(index)), (0.0, 1.0, 0.0, index / 10))
+        cache.save()
+
+        restored = SentenceScoreCache(maxsize=3, path=path)
+        assert len(restored) == 3
+        assert restored.get(sentence_key("4")) == (0.0, 1.0, 0.0, 0.4)
+        assert restored.get(sentence_key("1")) is None
+
+        (tmp_path / "broken.marshal").write_bytes(b"not marshal")
+        assert len(SentenceScoreCache(path=str(tmp_path / "broken.marshal"))) == 0
+
+    def test_thread_safe(self):
+        """Test concurrent lookups and inserts from many threads"""
+        cache = SentenceScoreCache(maxsize=500)
+        keys = [sentence_key(str(index)) for index in range(1000)]
+
+        def work(offset):
+            for index in range(offset, len(keys), 4):
+                if cache.get(keys[index]) is None:
+                    cache.put(keys[index], (0.0, 1.0, 0.0, 0.0))
+
+        threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 2000
+        assert stats["size"] == 500
+
+    def test_analyzer_scores_are_unchanged(self):
+        """Test that memoized scores equal fresh ones on both scoring paths"""
+        sentences = ["I love this wonderful song!", "The ending was terrible.", "I love  this wonderful song!",
+                     "It is a movie.", "The ending was terrible."]
+        plain = SentimentAnalyzer()
+        memoized = SentimentAnalyzer(cache=SentenceScoreCache(), memoize_batches=True)
+
+        expected = [plain.analyze_sentiment(sentence) for sentence in sentences]
+        assert [memoized.analyze_sentiment(sentence) for sentence in sentences] == expected
+        assert [memoized.analyze_sentiment(sentence) for sentence in sentences] == expected
+        assert memoized.cache.stats()["hits"] == 7
+
+        memoized.cache.clear()
+        assert memoized.compound_scores(sentences) == [scores["compound"] for scores in expected]
+        assert memoized.cache.stats()["size"] == 3
+        assert memoized.compound_scores(sentences[:2]) == [expected[0]["compound"], expected[1]["compound"]]
+        assert memoized.cache.stats()["hits"] == 2
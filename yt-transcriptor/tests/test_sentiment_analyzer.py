@@ -0,0 +1,262 @@
+"""
+Tests for the SentimentAnalyzer class
+"""
+import marshal
+import os
+import subprocess
+import sys
+
+import pytest
+import sentiment_analyzer
+from sentiment_analyzer import (LEXICON_PATH, PrecompiledSentimentIntensityAnalyzer, SentimentAnalyzer,
+                                create_intensity_analyzer, get_analyzer, load_lexicon)
+
+
+class TestSentimentAnalyzer:
+    """Test cases for SentimentAnalyzer"""
+    
+    def test_import_does_not_touch_network(self):
+        """Test that importing the module and loading the analyzer never looks up NLTK data"""
+        code = (
+            "import nltk\n"
+            "def fail(*args, **kwargs): raise AssertionError('NLTK data accessed')\n"
+            "nltk.download = nltk.data.find = nltk.data.load = fail\n"
+            "import sentiment_analyzer\n"
+            "sentiment_analyzer.get_analyzer().analyze_sentiment('good')\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+    
+    def test_precompiled_lexicon_is_used(self):
+        """Test that the shipped lexicon is loaded without NLTK's text file"""
+        assert os.path.exists(LEXICON_PATH)
+        analyzer = SentimentAnalyzer()
+        assert isinstance(analyzer.sia, PrecompiledSentimentIntensityAnalyzer)
+        assert analyzer.sia.lexicon["good"] > 0
+        assert analyzer.sia.lexicon["horrible"] < 0
+    
+    def test_precompiled_lexicon_matches_nltk(self):
+        """Test that the precompiled lexicon matches NLTK's vader_lexicon resource"""
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        try:
+            nltk_lexicon = SentimentIntensityAnalyzer().lexicon
+        except LookupError:
+            pytest.skip("NLTK vader_lexicon not installed")
+        assert load_lexicon() == nltk_lexicon
+    
+    def test_unreadable_lexicon_falls_back_to_nltk(self, tmp_path):
+        """Test that a corrupt or truncated precompiled lexicon falls back to NLTK's resource"""
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        try:
+            SentimentIntensityAnalyzer()
+        except LookupError:
+            pytest.skip("NLTK vader_lexicon not installed")
+        with open(LEXICON_PATH, "rb") as f:
+            data = f.read()
+        for name, content in (("truncated", data[:len(data) // 2]), ("garbage", b"\xffnot marshal"),
+                              ("not_a_dict", marshal.dumps(["good"]))):
+            path = tmp_path / f"{name}.marshal"
+            path.write_bytes(content)
+            sia = create_intensity_analyzer(str(path))
+            assert not isinstance(sia, PrecompiledSentimentIntensityAnalyzer)
+            assert sia.polarity_scores("This is good")["compound"] > 0
+    
+    def test_get_analyzer_is_shared(self):
+        """Test that get_analyzer returns one process-wide instance"""
+        assert get_analyzer() is get_analyzer()
+    
+    def test_get_top_quotes(self):
+        """Test extracting top positive and negative quotes from a transcript"""
+        transcript = (
+            "[00:01] I absolutely love this wonderful and amazing community.\n"
+            "[00:05] The weather today is cloudy with light wind.\n"
+            "[00:09] This was a terrible, awful and painful experience for everyone.\n"
+        )
+        analyzer = get_analyzer()
+        positive = analyzer.get_top_quotes(transcript, 5, 'positive')
+        negative = analyzer.get_top_quotes(transcript, 5, 'negative')
+        
+        assert positive[0]["quote"] == '"I absolutely love this wonderful and amazing community."'
+        assert positive[0]["score"] > 0.2
+        assert len(negative) == 1
+        assert "terrible" in negative[0]["quote"]
+    
+    def test_get_top_sentiments_matches_get_top_quotes(self):
+        """Test that the single-pass result matches sorting the full scored list"""
+        import random
+        rng = random.Random(3)
+        words = ("good bad great terrible love hate happy sad fine awful wonderful the a movie "
+                 "plot actor scene ending music really very not").split()
+        transcript = " ".join(
+            " ".join(rng.choice(words) for _ in range(rng.randint(5, 15))).capitalize() + "."
+            for _ in range(400)
+        )
+        analyzer = get_analyzer()
+        
+        # Reference: score everything, then stable-sort as get_top_quotes originally did
+        scored = [(s, analyzer.analyze_sentiment(s)['compound'], None)
+                  for s in analyzer.split_into_sentences(analyzer.clean_transcript(transcript))]
+        expected_positive = sorted([x for x in scored if x[1] > 0.2], key=lambda x: x[1], reverse=True)[:7]
+        expected_negative = sorted([x for x in scored if x[1] < -0.2], key=lambda x: x[1])[:7]
+        
+        top_positive, top_negative = analyzer.get_top_sentiments(transcript, 7)
+        assert top_positive == analyzer.format_quotes(expected_positive)
+        assert top_negative == analyzer.format_quotes(expected_negative)
+        assert top_positive == analyzer.get_top_quotes(transcript, 7, 'positive')
+        assert top_negative == analyzer.get_top_quotes(transcript, 7, 'negative')
+    
+    def test_parallel_scoring_is_deterministic(self, monkeypatch):
+        """Test that scoring on a process pool gives the same quotes for any worker count"""
+        import random
+        rng = random.Random(5)
+        words = ("good bad great terrible love hate happy sad fine awful wonderful the a movie "
+                 "plot actor scene ending music really very not").split()
+        # Repeated sentences make ties, which must still resolve by document position
+        pool = [" ".join(rng.choice(words) for _ in range(rng.randint(5, 15))).capitalize() + "."
+                for _ in range(60)]
+        transcript = " ".join(rng.choice(pool) for _ in range(600))
+        monkeypatch.setattr(sentiment_analyzer, "CHUNK_SENTENCES", 50)
+        analyzer = get_analyzer()
+        
+        expected = analyzer.get_top_sentiments(transcript, 7)
+        for workers in (2, 3):
+            assert analyzer.get_top_sentiments(transcript, 7, workers=workers) == expected
+            assert workers in sentiment_analyzer._scoring_pools
+        assert analyzer.get_top_quotes(transcript, 7, 'negative', workers=2) == expected[1]
+
+    def test_parallel_scoring_uses_instance_lexicon(self, monkeypatch, tmp_path):
+        """Test that pool workers score with the calling analyzer's lexicon, not the default one"""
+        # Every valence flipped, so the default lexicon would swap the polarities
+        path = tmp_path / "flipped.marshal"
+        path.write_bytes(marshal.dumps({word: -valence for word, valence in load_lexicon().items()}))
+        monkeypatch.setattr(sentiment_analyzer, "CHUNK_SENTENCES", 50)
+        analyzer = SentimentAnalyzer(lexicon_path=str(path))
+        transcript = " ".join(["This movie is good and wonderful.", "The ending was awful and sad."] * 100)
+
+        expected = analyzer.get_top_sentiments(transcript, 3)
+        assert "awful" in expected[0][0]["quote"]
+        assert analyzer.get_top_sentiments(transcript, 3, workers=2) == expected
+
+    def test_streaming_pipeline_matches_whole_text(self, monkeypatch):
+        """Test that streaming in tiny chunks gives the same sentences as one string"""
+        import random
+        rng = random.Random(9)
+        tokens = ("and but or so the a good e.g. U.S. Mr. word, semi; end. why? wow! [00:12] "
+                  "x\ny tail").split(" ")
+        text = "".join(rng.choice(tokens) + rng.choice([" ", "", "  ", "\n"]) for _ in range(3000))
+        analyzer = get_analyzer()
+        cleaned = analyzer.clean_transcript(text)
+        expected = analyzer.split_into_sentences(cleaned)
+        
+        monkeypatch.setattr(sentiment_analyzer, "STREAM_CHUNK_CHARS", 7)
+        monkeypatch.setattr(sentiment_analyzer, "MAX_PENDING_CHARS", 150)
+        assert analyzer.clean_transcript(iter(text)) == cleaned
+        assert list(analyzer.iter_sentences(iter(text))) == expected
+        assert list(analyzer.iter_sentences(text)) == expected
+    
+    def test_segment_quotes_match_rendered_transcript(self):
+        """Test that quotes from raw segments match the rendered transcript and carry start times"""
+        from app.transcript_service import TranscriptService
+        segments = [
+            {"text": "The first half was dull.", "start": 0.0},
+            {"text": "Then the band played the most", "start": 3.5},
+            {"text": "wonderful, joyful song I have ever heard!", "start": 7.25},
+            {"text": "", "start": 9.0},
+            {"text": "Sadly the sound was awful and the crowd was rude.", "start": 65.0},
+        ]
+        analyzer = get_analyzer()
+        text = TranscriptService.format_transcript(segments)
+        
+        top_positive, top_negative = analyzer.get_top_sentiments_from_segments(segments, 3, video_id="abc123")
+        assert [q["quote"] for q in top_positive] == [q["quote"] for q in analyzer.get_top_quotes(text, 3)]
+        assert [q["score"] for q in top_negative] == [q["score"] for q in analyzer.get_top_quotes(text, 3, 'negative')]
+        
+        # A sentence spanning two segments starts at the first of them
+        assert "wonderful" in top_positive[0]["quote"]
+        assert top_positive[0]["start"] == 3.5
+        assert top_positive[0]["timestamp"] == "00:03"
+        assert top_positive[0]["url"] == "https://www.youtube.com/watch?v=abc123&t=3s"
+        assert top_negative[0]["timestamp"] == "01:05"
+        
+        compact = sentiment_analyzer.compact_segments(segments)
+        assert analyzer.get_top_quotes_from_segments(compact, 3, 'negative') == \
+            [{k: v for k, v in q.items() if k != "url"} for q in top_negative]
+    
+    def test_sentiment_timeline(self):
+        """Test windowed mean/min/max of sentence scores against a direct computation"""
+        import random
+        rng = random.Random(3)
+        words = "good bad great terrible love hate fine awful the a movie plot really not".split()
+        segments = [{"text": " ".join(rng.choice(words) for _ in range(rng.randint(0, 8))) + rng.choice([".", ""]),
+                     "start": index * 2.5}
+                    for index in range(400)]
+        analyzer = get_analyzer()
+        timeline = analyzer.sentiment_timeline(segments, window_seconds=30, step_seconds=10)
+        
+        scored = [(start, analyzer.analyze_sentiment(sentence)['compound'])
+                  for sentence, start in analyzer.iter_segment_sentences(segments)]
+        assert timeline["start"] == [10.0 * i for i in range(len(timeline["start"]))]
+        assert timeline["start"][-1] <= scored[-1][0] < timeline["start"][-1] + 10
+        for index, window_start in enumerate(timeline["start"]):
+            scores = [score for start, score in scored if window_start <= start < window_start + 30]
+            assert timeline["count"][index] == len(scores)
+            if scores:
+                assert timeline["mean"][index] == pytest.approx(sum(scores) / len(scores), abs=1e-4)
+                assert timeline["min"][index] == round(min(scores), 4)
+                assert timeline["max"][index] == round(max(scores), 4)
+            else:
+                assert timeline["mean"][index] is None
+        
+        assert analyzer.sentiment_timeline([], 60)["start"] == []
+        with pytest.raises(ValueError):
+            analyzer.sentiment_timeline(segments, 0)
+    
+    def test_scored_sentences_answer_repeated_queries(self, monkeypatch):
+        """Test that one scoring pass answers every top_n, polarity and timeline like a fresh analysis"""
+        import random
+        monkeypatch.setattr(sentiment_analyzer, "CHUNK_SENTENCES", 50)
+        rng = random.Random(5)
+        words = "good bad great terrible love hate fine awful the a movie plot really not".split()
+        segments = [{"text": " ".join(rng.choice(words) for _ in range(rng.randint(3, 12))) + rng.choice([".", "!", ""]),
+                     "start": index * 3.0}
+                    for index in range(600)]
+        text = "\n".join(segment["text"] for segment in segments)
+        analyzer = SentimentAnalyzer()
+        
+        progress = []
+        scored = analyzer.score_all(text, progress.append)
+        assert len(progress) > 2 and progress == sorted(progress) and progress[-1] == 1.0
+        timed = analyzer.score_all_segments(segments)
+        for top_n in (0, 1, 5, 1000):
+            for sentiment_type in ('positive', 'negative'):
+                assert (analyzer.format_quotes(scored.top(top_n, sentiment_type))
+                        == analyzer.get_top_quotes(text, top_n, sentiment_type))
+                assert (analyzer.format_quotes(timed.top(top_n, sentiment_type), "vid")
+                        == analyzer.get_top_quotes_from_segments(segments, top_n, sentiment_type, "vid"))
+        assert timed.timeline(30, 10) == analyzer.sentiment_timeline(segments, 30, 10)
+        with pytest.raises(ValueError):
+            scored.timeline(30)
+    
+    def test_memory_stays_flat_on_100mb_transcript(self):
+        """Test that analyzing a 100MB streamed transcript does not grow memory with its size"""
+        code = (
+            "import resource\n"
+            "from sentiment_analyzer import get_analyzer\n"
+            "line = '[12:34] I really love how wonderful this community is, and the speakers were great. '\\\n"
+            "       'But the ending was terrible and sad!\\n'\n"
+            "def lines(total):\n"
+            "    for _ in range(total // len(line)):\n"
+            "        yield line\n"
+            "analyzer = get_analyzer()\n"
+            "analyzer.get_top_sentiments(lines(1 << 20), 5)\n"
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "positive, negative = analyzer.get_top_sentiments(lines(100 << 20), 5)\n"
+            "assert positive and negative\n"
+            "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        # ru_maxrss is in KiB on Linux
+        assert int(result.stdout) < 32 * 1024
@@ -0,0 +1,65 @@
+"""
+Tests for the SummaryService class
+"""
+import pytest
+from app.summary_service import SummaryService
+
+
+ARTICLE = (
+    "The city council approved a new transit plan on Tuesday. "
+    "The transit plan adds three bus lines and extends light rail service to the airport. "
+    "Council members said the light rail extension was the most expensive part of the transit plan. "
+    "A local bakery celebrated its tenth anniversary with free bread. "
+    "Residents will be able to comment on the transit plan at public meetings next month. "
+    "The weather was sunny and warm for most of the week. "
+    "Funding for the transit plan comes from a regional sales tax approved last year."
+)
+
+
+class TestSummaryService:
+    """Test cases for SummaryService"""
+    
+    def test_split_sentences(self):
+        """Test sentence splitting on punctuation"""
+        sentences = SummaryService.split_sentences("First sentence here. Second one! Third?")
+        assert sentences == ["First sentence here.", "Second one!", "Third?"]
+    
+    def test_split_sentences_windows_unpunctuated_transcripts(self):
+        """Test that long unpunctuated transcripts are split into windows"""
+        transcript = "".join(f"[00:{i:02d}] word{i} and more words here\n" for i in range(30))
+        sentences = SummaryService.split_sentences(transcript)
+        assert len(sentences) > 1
+        assert all(len(s.split()) <= 40 for s in sentences)
+        assert "[00:" not in " ".join(sentences)
+    
+    def test_extract_keywords(self):
+        """Test that the dominant topic ranks among the keywords"""
+        keywords = SummaryService.extract_keywords(ARTICLE, top_n=5)
+        assert len(keywords) == 5
+        assert any("transit plan" in keyword for keyword in keywords)
+        assert all(keyword == keyword.lower() for keyword in keywords)
+    
+    def test_extract_keywords_empty(self):
+        """Test keyword extraction on text without content words"""
+        assert SummaryService.extract_keywords("") == []
+        assert SummaryService.extract_keywords("it is what it is") == []
+    
+    def test_summarize_prefers_central_sentences(self):
+        """Test that the summary keeps on-topic sentences in document order"""
+        summary = SummaryService.summarize(ARTICLE, max_sentences=3)
+        lines = summary.split("\n")
+        assert len(lines) == 3
+        assert all("transit plan" in line or "light rail" in line for line in lines)
+        positions = [ARTICLE.index(line) for line in lines]
+        assert positions == sorted(positions)
+    
+    def test_summarize_short_text(self):
+        """Test that short text is returned whole"""
+        assert SummaryService.summarize("Only one sentence.", max_sentences=5) == "Only one sentence."
+    
+    def test_enrich_keeps_existing_values(self):
+        """Test that enrich only fills missing fields"""
+        result = {"text": ARTICLE, "summary": "Existing summary"}
+        SummaryService.enrich(result)
+        assert result["summary"] == "Existing summary"
+        assert result["keywords"]
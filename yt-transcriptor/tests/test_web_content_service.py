@@ -83,3 +83,26 @@ class TestWebContentService:
         result = WebContentService.extract_content("invalid-url")
         assert result["status"] == "error"
         assert "Invalid URL" in result["message"]
+
+    @patch('app.web_content_service.WebContentService.extract_with_trafilatura')
+    def test_extract_content_reports_duplicate(self, mock_trafilatura):
+        """Test that syndicated copies are flagged with duplicate_of"""
+        WebContentService.fingerprint_index.clear()
+        text = "Syndicated story about the city council approving a new transit plan. " * 10
+        mock_trafilatura.return_value = {
+            "status": "success",
+            "text": text,
+            "method": "trafilatura"
+        }
+        
+        original = WebContentService.extract_content("https://a.example.com/story")
+        mock_trafilatura.return_value = {
+            "status": "success",
+            "text": text,
+            "method": "trafilatura"
+        }
+        copy = WebContentService.extract_content("https://b.example.com/story")
+        
+        assert original["duplicate_of"] is None
+        assert copy["duplicate_of"] == "https://a.example.com/story"
+        assert copy["fingerprint"] == original["fingerprint"]
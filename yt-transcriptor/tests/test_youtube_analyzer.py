@@ -0,0 +1,37 @@
+"""
+Tests for the interactive content analyzer
+"""
+from unittest.mock import patch
+
+import youtube_analyzer
+
+
+SEGMENTS = [
+    {"text": "This is the best and most beautiful short ever made.", "start": 0.0, "duration": 4.0},
+    {"text": "I hate how quickly it ends.", "start": 4.0, "duration": 3.0}
+]
+
+
+class TestYouTubeAnalyzer:
+    """Test cases for the interactive content analyzer"""
+
+    def test_short_urls_are_youtube(self):
+        """Test that every URL form the server accepts is treated as YouTube"""
+        for url in ["https://www.youtube.com/shorts/dQw4w9WgXcQ",
+                    "https://www.youtube.com/live/dQw4w9WgXcQ",
+                    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+                    "https://music.youtube.com/watch?v=dQw4w9WgXcQ"]:
+            assert youtube_analyzer.is_youtube_url(url)
+
+    @patch("app.transcript_service.TranscriptService.get_transcript")
+    def test_shorts_url_menu_gets_segments(self, mock_get):
+        """Test that a /shorts/ URL reaches the YouTube menu as segments, not formatted text"""
+        mock_get.return_value = {"status": "success", "transcript": SEGMENTS, "language": "en"}
+
+        with patch("builtins.input", side_effect=["https://www.youtube.com/shorts/dQw4w9WgXcQ"]), \
+                patch.object(youtube_analyzer, "clear_screen"), \
+                patch.object(youtube_analyzer, "get_language_choice", return_value=None), \
+                patch.object(youtube_analyzer, "display_youtube_menu", return_value=False) as mock_menu:
+            youtube_analyzer.main(local=True)
+
+        mock_menu.assert_called_once_with("https://www.youtube.com/shorts/dQw4w9WgXcQ", SEGMENTS, "dQw4w9WgXcQ")
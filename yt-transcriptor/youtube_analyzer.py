@@ -2,12 +2,18 @@
 """
 Content Analyzer - Interactive menu-driven program for analyzing content from YouTube videos and web pages
 """
+import argparse
 import os
 import sys
 import json
-import re
-import requests
-from sentiment_analyzer import SentimentAnalyzer
+import threading
+from api_client import extract_content
+from content_cache import get_content_cache
+from enhanced_client import iter_timeline
+from output_writers import OutputWriter
+from quote_extractor import iter_quotes_output
+from app.transcript_service import TranscriptService
+from sentiment_analyzer import get_analyzer
 
 def clear_screen():
     """Clear the terminal screen"""
@@ -20,78 +26,68 @@ def print_header():
     print("="*80 + "\n")
 
 def is_youtube_url(url):
-    """Check if the URL is a YouTube URL"""
-    youtube_patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=([^&\s]+)',
-        r'(?:https?:\/\/)?(?:www\.)?youtu\.be\/([^\?\s]+)',
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/embed\/([^\?\s]+)'
-    ]
-    
-    for pattern in youtube_patterns:
-        if re.match(pattern, url):
-            return True
-    return False
+    """Check if the URL is a YouTube URL, as the server decides it (shorts, live, m. and music. URLs included)"""
+    return TranscriptService.extract_video_id(url) is not None
+
 
-def extract_content(url, language=None, format_text=True, api_url="http://localhost:8000"):
-    """
-    Extract content from a URL (YouTube video or web page)
+class BackgroundScorer:
+    """Scores every sentence of some content once in a background thread, so quote requests are answered from memory"""
     
-    Args:
-        url: URL to extract content from
-        language: Preferred language code (optional, for YouTube)
-        format_text: Whether to return formatted text (for YouTube)
-        api_url: API server URL
-        
-    Returns:
-        Extracted content or error message
-    """
-    endpoint = f"{api_url}/content"
+    def __init__(self, content, video_id=None):
+        self.video_id = video_id
+        self.progress = 0.0
+        self.scored = None
+        self.error = None
+        self._done = threading.Event()
+        threading.Thread(target=self._run, args=(content,), daemon=True).start()
     
-    try:
-        response = requests.post(
-            endpoint,
-            json={
-                "url": url,
-                "language": language,
-                "format_text": format_text
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data["status"] == "success":
-                return data
+    def _run(self, content):
+        analyzer = get_analyzer()
+        try:
+            if isinstance(content, str):
+                self.scored = analyzer.score_all(content, self._update)
             else:
-                return f"Error: {data['message']}"
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Connection error: {str(e)}"
-
-def extract_quotes(text, top_n=5, sentiment_type='positive'):
-    """Extract top positive or negative quotes from text"""
-    analyzer = SentimentAnalyzer()
-    quotes = analyzer.get_top_quotes(text, top_n, sentiment_type)
-    return quotes
-
-def format_quotes_output(quotes, sentiment_type='positive'):
-    """Format quotes for display"""
-    output = "\n" + "="*80 + "\n"
-    output += f"TOP {len(quotes)} {sentiment_type.upper()} QUOTES\n"
-    output += "="*80 + "\n\n"
+                self.scored = analyzer.score_all_segments(content, self._update)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+    
+    def _update(self, fraction):
+        self.progress = fraction
+    
+    def status(self):
+        """One-line scoring status for the menu"""
+        if not self._done.is_set():
+            return f"⏳ Scoring sentences... {self.progress:.0%}"
+        if self.error:
+            return f"❌ Sentiment scoring failed: {self.error}"
+        return f"✅ Sentiment ready ({len(self.scored)} sentences scored)"
     
-    for i, item in enumerate(quotes, 1):
-        output += f"{i}. {item['quote']} (Score: {item['score']:.3f})\n\n"
+    def wait(self):
+        """Wait for scoring to finish, showing its progress"""
+        if not self._done.is_set():
+            while not self._done.wait(0.2):
+                print(f"\r{self.status()}", end="", flush=True)
+            print()
+        if self.error:
+            raise self.error
+        return self.scored
     
-    return output
+    def quotes(self, top_n=5, sentiment_type='positive'):
+        """Top positive or negative quotes, from the scored sentences"""
+        scored = self.wait()
+        return get_analyzer().format_quotes(scored.top(top_n, sentiment_type), self.video_id)
+    
+    def timeline(self, window_seconds=60.0):
+        """Sentiment timeline of a YouTube transcript, from the scored sentences"""
+        return self.wait().timeline(window_seconds)
 
 def save_to_file(content, filename):
-    """Save content to a file"""
+    """Save content, a string or formatted pieces, to a file"""
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
+        with OutputWriter(filename) as out:
+            out.write_all([content] if isinstance(content, str) else content)
         return f"Content saved to {filename}"
     except Exception as e:
         return f"Error saving to file: {str(e)}"
@@ -128,22 +124,26 @@ def get_language_choice():
         print("❌ Invalid choice. Using default language.")
         return None
 
-def display_youtube_menu(url, transcript_text):
+def display_youtube_menu(url, segments, video_id=None):
     """Display interactive menu for working with YouTube transcripts"""
+    scorer = BackgroundScorer(segments, video_id)
+    transcript_text = TranscriptService.format_transcript(segments)
     while True:
         clear_screen()
         print_header()
-        print(f"📺 YouTube Video: {url}\n")
+        print(f"📺 YouTube Video: {url}")
+        print(f"{scorer.status()}\n")
         print("📋 Select an option:")
         print("1. View full transcript")
         print("2. Extract top positive quotes")
         print("3. Extract top negative quotes")
         print("4. Save transcript to file")
         print("5. Save quotes to file")
-        print("6. Enter a new URL")
-        print("7. Exit")
+        print("6. Show sentiment timeline")
+        print("7. Enter a new URL")
+        print("8. Exit")
         
-        choice = input("\n👉 Enter your choice (1-7): ")
+        choice = input("\n👉 Enter your choice (1-8): ")
         
         if choice == "1":
             clear_screen()
@@ -155,20 +155,22 @@ def display_youtube_menu(url, transcript_text):
             top_n = input("\n👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(transcript_text, top_n, 'positive')
+            quotes = scorer.quotes(top_n, 'positive')
             
             clear_screen()
-            print(format_quotes_output(quotes, 'positive'))
+            with OutputWriter() as out:
+                out.write_all(iter_quotes_output(quotes, 'positive'))
             input("\n👉 Press Enter to continue...")
             
         elif choice == "3":
             top_n = input("\n👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(transcript_text, top_n, 'negative')
+            quotes = scorer.quotes(top_n, 'negative')
             
             clear_screen()
-            print(format_quotes_output(quotes, 'negative'))
+            with OutputWriter() as out:
+                out.write_all(iter_quotes_output(quotes, 'negative'))
             input("\n👉 Press Enter to continue...")
             
         elif choice == "4":
@@ -190,8 +192,8 @@ def display_youtube_menu(url, transcript_text):
             top_n = input("👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(transcript_text, top_n, sentiment_type)
-            formatted_quotes = format_quotes_output(quotes, sentiment_type)
+            quotes = scorer.quotes(top_n, sentiment_type)
+            formatted_quotes = iter_quotes_output(quotes, sentiment_type)
             
             filename = input("👉 Enter filename to save quotes: ")
             if not filename:
@@ -204,9 +206,20 @@ def display_youtube_menu(url, transcript_text):
             input("\n👉 Press Enter to continue...")
             
         elif choice == "6":
-            return True  # Signal to get a new URL
+            window = input("\n👉 Window length in seconds? (default: 60): ")
+            window = float(window) if window.isdigit() and int(window) > 0 else 60.0
+            
+            timeline = scorer.timeline(window)
+            
+            clear_screen()
+            with OutputWriter() as out:
+                out.write_all(iter_timeline(timeline))
+            input("\n👉 Press Enter to continue...")
             
         elif choice == "7":
+            return True  # Signal to get a new URL
+            
+        elif choice == "8":
             print("\n👋 Thank you for using Content Extraction Tool. Goodbye!")
             return False  # Signal to exit
             
@@ -216,11 +229,13 @@ def display_youtube_menu(url, transcript_text):
 
 def display_webpage_menu(url, title, content):
     """Display interactive menu for working with web page content"""
+    scorer = BackgroundScorer(content)
     while True:
         clear_screen()
         print_header()
         print(f"🌐 Web Page: {url}")
-        print(f"📑 Title: {title}\n")
+        print(f"📑 Title: {title}")
+        print(f"{scorer.status()}\n")
         print("📋 Select an option:")
         print("1. View full content")
         print("2. Extract top positive quotes")
@@ -243,20 +258,22 @@ def display_webpage_menu(url, title, content):
             top_n = input("\n👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(content, top_n, 'positive')
+            quotes = scorer.quotes(top_n, 'positive')
             
             clear_screen()
-            print(format_quotes_output(quotes, 'positive'))
+            with OutputWriter() as out:
+                out.write_all(iter_quotes_output(quotes, 'positive'))
             input("\n👉 Press Enter to continue...")
             
         elif choice == "3":
             top_n = input("\n👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(content, top_n, 'negative')
+            quotes = scorer.quotes(top_n, 'negative')
             
             clear_screen()
-            print(format_quotes_output(quotes, 'negative'))
+            with OutputWriter() as out:
+                out.write_all(iter_quotes_output(quotes, 'negative'))
             input("\n👉 Press Enter to continue...")
             
         elif choice == "4":
@@ -279,8 +296,8 @@ def display_webpage_menu(url, title, content):
             top_n = input("👉 How many quotes to extract? (default: 5): ")
             top_n = int(top_n) if top_n.isdigit() else 5
             
-            quotes = extract_quotes(content, top_n, sentiment_type)
-            formatted_quotes = format_quotes_output(quotes, sentiment_type)
+            quotes = scorer.quotes(top_n, sentiment_type)
+            formatted_quotes = iter_quotes_output(quotes, sentiment_type)
             
             filename = input("👉 Enter filename to save quotes: ")
             if not filename:
@@ -303,7 +320,7 @@ def display_webpage_menu(url, title, content):
             print("\n❌ Invalid choice. Please try again.")
             input("\n👉 Press Enter to continue...")
 
-def main():
+def main(api_url="http://localhost:8000", local=False, cache=None, refresh=False):
     """Main function"""
     while True:
         clear_screen()
@@ -331,16 +348,17 @@ def main():
             language = None
             print("\n⏳ Fetching web page content... Please wait.")
         
-        # Extract content
-        result = extract_content(url, language=language)
+        # Extract content (raw segments for YouTube, so quotes keep their timestamps; web pages ignore format_text)
+        result = extract_content(url, language=language, format_text=False, api_url=api_url, local=local,
+                                 cache=cache, refresh=refresh)
         
         if isinstance(result, dict):
             if result.get("content_type") == "youtube":
-                transcript_text = result.get("text", "No transcript available")
+                segments = result.get("text")
                 
-                if transcript_text != "No transcript available":
+                if segments:
                     # Show menu for working with the YouTube transcript
-                    continue_program = display_youtube_menu(url, transcript_text)
+                    continue_program = display_youtube_menu(url, segments, result.get("video_id"))
                     if not continue_program:
                         break
                 else:
@@ -372,8 +390,14 @@ def main():
             input("\n👉 Press Enter to continue...")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interactive content extraction and analysis")
+    parser.add_argument("--api", default="http://localhost:8000", help="API server URL")
+    parser.add_argument("--local", action="store_true", help="Extract content in this process instead of calling the API server")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the local content cache")
+    parser.add_argument("--refresh", action="store_true", help="Fetch again even if the content is cached, and update the cache")
+    args = parser.parse_args()
     try:
-        main()
+        main(args.api, args.local, None if args.no_cache else get_content_cache(), args.refresh)
     except KeyboardInterrupt:
         print("\n\n👋 Program interrupted. Exiting...")
         sys.exit(0)